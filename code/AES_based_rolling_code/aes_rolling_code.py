@@ -1,17 +1,24 @@
+from collections import deque
+
 from Crypto.Cipher import AES
 
 class AESRollingCode:
-    def __init__(self, key: bytes, iterations: int = 5):
+    def __init__(self, key: bytes, iterations: int = 5, counter: int = 0):
         """
         Initialisation d'un émetteur/récepteur de code roulant
         :param key:        Clé secrète partagé
         :param iterations: Tolérance à la desynchronisation
+        :param counter:    Compteur de départ (par exemple rechargé depuis un stockage persistant)
         """
         self.key = key
         self.iterations = iterations
-        self.counter = 0
+        self.counter = counter
+        # Un seul objet de chiffrement par clé : l'expansion de clé AES n'est faite qu'une fois
+        self.__cipher = AES.new(self.key, AES.MODE_ECB)
         self.current_code = self.__generate_code()
-        self.future_codes = self.__generate_future_codes()
+        self.future_codes = deque()   # Codes des compteurs counter+1 .. counter+iterations
+        self.__code_counters = {}     # Index code -> compteur absolu de la fenêtre
+        self.__generate_future_codes()
 
     def __generate_code(self, counter: int = None):
         """
@@ -21,36 +28,72 @@ class AESRollingCode:
         """
         if counter is None:
             counter = self.counter
-        cipher = AES.new(self.key, AES.MODE_ECB)
-        code = cipher.encrypt(counter.to_bytes(16, byteorder='big'))
+        code = self.__cipher.encrypt(counter.to_bytes(16, byteorder='big'))
         return int.from_bytes(code, byteorder='big')
 
+    def generate_codes(self, first_counter: int, count: int):
+        """
+        Génère en un seul appel les codes d'une plage contiguë de compteurs.
+        Le flux de clé AES-CTR initialisé à first_counter est exactement la suite des chiffrés ECB
+        des blocs compteur first_counter, first_counter + 1, ... : un seul passage en C suffit.
+        :param first_counter: Compteur du premier code à générer
+        :param count:         Nombre de codes à générer
+        :return: Renvoie la liste des codes générés
+        """
+        keystream = AES.new(self.key, AES.MODE_CTR, nonce=b'', initial_value=first_counter).encrypt(bytes(16 * count))
+        view = memoryview(keystream)
+        return [int.from_bytes(view[i:i + 16], byteorder='big') for i in range(0, len(keystream), 16)]
+
     def __generate_future_codes(self):
         """
-        Génère les futures codes roulant pour la fenêtre de tolérance
-        :return: Renvoie la liste des futurs codes roulant
+        Régénère entièrement la fenêtre de tolérance à partir du compteur courant
         """
-        future_codes = []
-        for i in range(1, self.iterations + 1):
-            future_codes.append(self.__generate_code(self.counter + i))
-        return future_codes
+        self.future_codes.clear()
+        self.__code_counters.clear()
+        self.__push_future_codes(self.counter + 1, self.iterations)
+
+    def __push_future_codes(self, first_counter: int, count: int):
+        """
+        Ajoute en fin de fenêtre de tolérance les codes d'une plage contiguë de compteurs
+        :param first_counter: Compteur du premier code à ajouter
+        :param count:         Nombre de codes à ajouter
+        """
+        if count == 1:
+            codes = [self.__generate_code(first_counter)]
+        else:
+            codes = self.generate_codes(first_counter, count)
+        self.future_codes.extend(codes)
+        for counter, code in enumerate(codes, first_counter):
+            self.__code_counters[code] = counter
+
+    def __advance(self, steps: int):
+        """
+        Fait glisser la fenêtre de tolérance de steps positions.
+        Seuls les codes nouvellement exposés sont calculés ; au-delà d'une fenêtre complète, elle est régénérée.
+        :param steps: Nombre de positions dont avance le compteur
+        """
+        self.counter += steps
+        if steps > self.iterations:
+            self.current_code = self.__generate_code()
+            self.__generate_future_codes()
+            return
+        for _ in range(steps):
+            self.current_code = self.future_codes.popleft()
+            del self.__code_counters[self.current_code]
+        self.__push_future_codes(self.counter + self.iterations - steps + 1, steps)
 
     def __resynchronize(self, received_code: int):
         """
         Resynchronise les codes roulants avec le code roulant reçu
         :param received_code: Code sur le quel se resynchroniser
         """
-        self.current_code = received_code
-        self.counter += self.future_codes.index(received_code) + 1
-        self.future_codes = self.__generate_future_codes()
+        self.__advance(self.__code_counters[received_code] - self.counter)
 
     def increment_code(self):
         """
         Incrémente le compteur et met l'ensemble des code roulants de la classe à jour
         """
-        self.counter += 1
-        self.current_code = self.__generate_code()
-        self.future_codes = self.__generate_future_codes()
+        self.__advance(1)
 
     def get_current_code(self):
         """
@@ -67,7 +110,7 @@ class AESRollingCode:
         if received_code == self.current_code:
             self.increment_code()
             return True
-        elif received_code in self.future_codes:
+        elif received_code in self.__code_counters:
             self.__resynchronize(received_code)
             return True
         return False
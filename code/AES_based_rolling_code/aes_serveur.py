@@ -0,0 +1,167 @@
+import argparse
+import asyncio
+import os
+import struct
+import sys
+import time
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+from aes_rolling_code import AESRollingCode
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from counter_store import MemoryCounterStore, SQLiteCounterStore  # noqa: E402
+
+# Trame requête : identifiant de l'appareil (32 bits) + code roulant (128 bits), en big-endian
+REQUEST = struct.Struct('>I16s')
+ACCEPT = b'\x01'
+REJECT = b'\x00'
+
+
+def derive_device_key(master_key: bytes, device_id: int):
+    """
+    Dérive la clé d'un appareil à partir de la clé maître (diversification par l'identifiant).
+    :param master_key: Clé maître du parc
+    :param device_id:  Identifiant de l'appareil
+    :return: Clé AES de 128 bits propre à l'appareil
+    """
+    return AES.new(master_key, AES.MODE_ECB).encrypt(device_id.to_bytes(16, byteorder='big'))
+
+
+class RollingCodeServer:
+    def __init__(self, master_key: bytes, iterations: int = 5, store=None, devices=()):
+        """
+        Serveur de vérification de codes roulants pour un parc d'émetteurs.
+        L'état de chaque appareil est créé à sa première trame reçue et indexé par son identifiant. Seuls les
+        appareils provisionnés sont acceptés : la table d'états ne grossit pas avec des identifiants inventés.
+        :param master_key: Clé maître dont sont dérivées les clés des appareils
+        :param iterations: Tolérance à la desynchronisation de chaque appareil
+        :param store:      Stockage des compteurs (CounterStore), rechargé en une lecture au démarrage
+        :param devices:    Identifiants des appareils provisionnés, en plus de ceux dont le compteur est stocké
+        """
+        self.master_key = master_key
+        self.iterations = iterations
+        self.store = store if store is not None else MemoryCounterStore()
+        self.counters = self.store.load_all()
+        self.provisioned = set(devices) | set(self.counters)
+        self.devices = {}
+        self.verified = 0
+        self.accepted = 0
+        self.unknown = 0
+
+    def get_device(self, device_id: int):
+        """
+        :param device_id: Identifiant de l'appareil
+        :return: Renvoie l'état de code roulant de l'appareil, créé au besoin, ou None s'il n'est pas provisionné
+        """
+        device = self.devices.get(device_id)
+        if device is None:
+            if device_id not in self.provisioned:
+                return None
+            device = AESRollingCode(derive_device_key(self.master_key, device_id), self.iterations,
+                                    self.counters.pop(device_id, 0))
+            self.devices[device_id] = device
+        return device
+
+    def verify(self, device_id: int, code: int):
+        """
+        Vérifie le code reçu d'un appareil et met son état à jour.
+        :param device_id: Identifiant de l'appareil
+        :param code:      Code roulant reçu
+        :return: Renvoie si le code est accepté (True) ou non (False)
+        """
+        self.verified += 1
+        device = self.get_device(device_id)
+        if device is None:
+            self.unknown += 1
+            return False
+        if device.compare_code(code):
+            self.accepted += 1
+            self.store.set(device_id, device.counter)
+            return True
+        return False
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Traite toutes les trames d'une connexion. Les trames peuvent arriver regroupées ou découpées :
+        chaque lecture traite toutes les trames complètes et renvoie leurs verdicts en une seule écriture.
+        Les compteurs des codes acceptés sont rendus durables, en une transaction, avant l'envoi des verdicts.
+        """
+        buffer = bytearray()
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                buffer += data
+                complete = len(buffer) - len(buffer) % REQUEST.size
+                verdicts = bytearray()
+                for device_id, code in REQUEST.iter_unpack(memoryview(buffer)[:complete]):
+                    verdicts += ACCEPT if self.verify(device_id, int.from_bytes(code, byteorder='big')) else REJECT
+                del buffer[:complete]
+                if ACCEPT in verdicts:
+                    self.store.flush()
+                writer.write(verdicts)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def report(self, period: float = 1.0):
+        """
+        Affiche périodiquement le débit de vérification en codes par seconde.
+        :param period: Période d'affichage (s)
+        """
+        last_verified, last_time = self.verified, time.perf_counter()
+        while True:
+            await asyncio.sleep(period)
+            self.store.flush()
+            now = time.perf_counter()
+            rate = (self.verified - last_verified) / (now - last_time)
+            if rate:
+                print(f"{rate:.0f} codes/s vérifiés ({len(self.devices)} appareils, "
+                      f"{self.accepted}/{self.verified} acceptés, {self.unknown} trames d'appareils inconnus)")
+            last_verified, last_time = self.verified, now
+
+
+async def serve(server: RollingCodeServer, host: str, port: int):
+    """
+    Lance le serveur asyncio et l'affichage du débit.
+    """
+    tcp_server = await asyncio.start_server(server.handle_connection, host, port)
+    print(f"Serveur de codes roulants en écoute sur {host}:{port}...")
+    async with tcp_server:
+        report_task = asyncio.create_task(server.report())
+        try:
+            await tcp_server.serve_forever()
+        finally:
+            report_task.cancel()
+            server.store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur de vérification de codes roulants AES multi-appareils")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=12346)
+    parser.add_argument('--iterations', type=int, default=5, help="Tolérance à la desynchronisation")
+    parser.add_argument('--master-key', help="Clé maître en hexadécimal (générée si absente)")
+    parser.add_argument('--store', help="Fichier SQLite de persistance des compteurs (en mémoire si absent)")
+    parser.add_argument('--devices', type=int, default=0,
+                        help="Nombre d'appareils provisionnés, d'identifiants 0 à N-1 (en plus de ceux du stockage)")
+    args = parser.parse_args()
+
+    if args.master_key:
+        master_key = bytes.fromhex(args.master_key)
+    else:
+        master_key = get_random_bytes(16)
+        print(f"La clé maître générée est : {master_key.hex()}")
+    store = SQLiteCounterStore(args.store) if args.store else MemoryCounterStore()
+
+    try:
+        asyncio.run(serve(RollingCodeServer(master_key, args.iterations, store, range(args.devices)), args.host, args.port))
+    except KeyboardInterrupt:
+        print("Serveur arrêté.")
+
+
+if __name__ == "__main__":
+    main()
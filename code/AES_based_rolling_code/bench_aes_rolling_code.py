@@ -0,0 +1,48 @@
+import time
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+from aes_rolling_code import AESRollingCode
+
+
+def generate_codes_per_code(key: bytes, first_counter: int, count: int):
+    """
+    Génération code par code (un chiffrement ECB par compteur), comme avant la génération groupée.
+    :param key:           Clé secrète partagée
+    :param first_counter: Compteur du premier code à générer
+    :param count:         Nombre de codes à générer
+    :return: Renvoie la liste des codes générés
+    """
+    cipher = AES.new(key, AES.MODE_ECB)
+    return [int.from_bytes(cipher.encrypt(counter.to_bytes(16, byteorder='big')), byteorder='big')
+            for counter in range(first_counter, first_counter + count)]
+
+
+def measure(func, repetitions: int):
+    """
+    Mesure le temps moyen d'un appel.
+    :param func:        Fonction à mesurer (sans argument)
+    :param repetitions: Nombre d'appels
+    :return: Temps moyen par appel (s)
+    """
+    start_time = time.perf_counter()
+    for _ in range(repetitions):
+        func()
+    return (time.perf_counter() - start_time) / repetitions
+
+
+def main():
+    key = get_random_bytes(16)
+    rolling_code = AESRollingCode(key)
+    first_counter = 1000
+
+    print(f"{'Fenêtre':>8} | {'Code par code (µs)':>18} | {'Groupé (µs)':>12} | {'Gain':>6}")
+    for window in (5, 256, 4096):
+        assert generate_codes_per_code(key, first_counter, window) == rolling_code.generate_codes(first_counter, window)
+        repetitions = max(10, 200000 // window)
+        per_code = measure(lambda: generate_codes_per_code(key, first_counter, window), repetitions)
+        bulk = measure(lambda: rolling_code.generate_codes(first_counter, window), repetitions)
+        print(f"{window:>8} | {per_code * 1e6:>18.1f} | {bulk * 1e6:>12.1f} | {per_code / bulk:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
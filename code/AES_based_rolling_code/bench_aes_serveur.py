@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import random
+import time
+from Crypto.Random import get_random_bytes
+from aes_rolling_code import AESRollingCode
+from aes_serveur import REQUEST, ACCEPT, RollingCodeServer, derive_device_key
+
+
+async def run_connection(port: int, emitters: dict, presses: int, batch: int):
+    """
+    Simule une connexion de passerelle qui relaie les appuis d'un groupe d'émetteurs.
+    :param port:     Port du serveur
+    :param emitters: Emetteurs relayés, indexés par identifiant d'appareil
+    :param presses:  Nombre total d'appuis à envoyer
+    :param batch:    Nombre de trames envoyées avant d'attendre les verdicts
+    :return: Nombre de codes acceptés
+    """
+    reader, writer = await asyncio.open_connection('localhost', port)
+    device_ids = list(emitters)
+    accepted = 0
+    for start in range(0, presses, batch):
+        count = min(batch, presses - start)
+        frames = bytearray()
+        for _ in range(count):
+            device_id = random.choice(device_ids)
+            emitter = emitters[device_id]
+            frames += REQUEST.pack(device_id, emitter.get_current_code().to_bytes(16, byteorder='big'))
+            emitter.increment_code()
+        writer.write(frames)
+        verdicts = await reader.readexactly(count)
+        accepted += verdicts.count(ACCEPT)
+    writer.close()
+    await writer.wait_closed()
+    return accepted
+
+
+async def bench(devices: int, connections: int, presses: int, batch: int, iterations: int):
+    master_key = get_random_bytes(16)
+    server = RollingCodeServer(master_key, iterations, devices=range(devices))
+    tcp_server = await asyncio.start_server(server.handle_connection, 'localhost', 0)
+    port = tcp_server.sockets[0].getsockname()[1]
+
+    groups = [{} for _ in range(connections)]
+    for device_id in range(devices):
+        groups[device_id % connections][device_id] = AESRollingCode(derive_device_key(master_key, device_id), iterations)
+
+    start_time = time.perf_counter()
+    results = await asyncio.gather(*(run_connection(port, group, presses // connections, batch) for group in groups))
+    elapsed = time.perf_counter() - start_time
+
+    tcp_server.close()
+    await tcp_server.wait_closed()
+    print(f"{server.verified} codes vérifiés en {elapsed:.2f} s : {server.verified / elapsed:.0f} codes/s "
+          f"({sum(results)} acceptés, {len(server.devices)} appareils, {connections} connexions)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure du débit du serveur de codes roulants AES")
+    parser.add_argument('--devices', type=int, default=10000)
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--presses', type=int, default=100000)
+    parser.add_argument('--batch', type=int, default=64)
+    parser.add_argument('--iterations', type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(bench(args.devices, args.connections, args.presses, args.batch, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+import random
+import time
+import numpy as np
+from keeloq import Keeloq
+
+
+class KeeloqReference:
+    """
+    Implémentation tour par tour d'origine (528 tours de 32 pas de NLFSR), conservée comme référence.
+    """
+
+    def __init__(self, key: int):
+        self.key = key
+
+    @staticmethod
+    def nlfsr(state):
+        return ((state >> 0) ^ (state >> 2) ^ (state >> 3) ^ (state >> 5) ^ (state >> 7) ^ (state >> 10) ^
+                (state >> 11) ^ (state >> 13) ^ (state >> 14) ^ (state >> 15) ^ (state >> 17) ^ (state >> 19) ^
+                (state >> 22) ^ (state >> 24) ^ (state >> 26) ^ (state >> 28)) & 1
+
+    def feistel(self, data, round_key):
+        result = 0
+        for i in range(32):
+            lfsr_output = self.nlfsr(round_key)
+            bit = ((data >> i) & 1) ^ lfsr_output
+            result |= (bit << i)
+            round_key >>= 1
+            round_key |= (bit << 63)
+        return result
+
+    def encrypt(self, data: int, counter: int):
+        data = ((counter & 0xF) << 28) | (data & 0x0FFFFFFF)
+        for round in range(528):
+            round_key = (self.key >> (round % 64)) & 0xFFFFFFFF
+            data = self.feistel(data, round_key)
+        return data
+
+    def decrypt(self, data: int):
+        for round in range(528):
+            round_key = (self.key >> ((527 - round) % 64)) & 0xFFFFFFFF
+            data = self.feistel(data, round_key)
+        return data & 0x0FFFFFFF, (data >> 28) & 0xF
+
+
+def blocks_per_second(func, blocks: int):
+    """
+    :param func:   Fonction traitant les blocs (sans argument)
+    :param blocks: Nombre de blocs traités par un appel
+    :return: Débit en blocs par seconde
+    """
+    start_time = time.perf_counter()
+    func()
+    return blocks / (time.perf_counter() - start_time)
+
+
+def main():
+    key = random.getrandbits(64)
+    reference = KeeloqReference(key)
+    keeloq = Keeloq(key)
+
+    # Vérification bit à bit par rapport à l'implémentation d'origine
+    for _ in range(20):
+        data, counter = random.getrandbits(28), random.getrandbits(4)
+        ciphertext = reference.encrypt(data, counter)
+        assert keeloq.encrypt(data, counter) == ciphertext
+        assert keeloq.decrypt(ciphertext) == reference.decrypt(ciphertext) == (data, counter)
+        other_key = random.getrandbits(64)
+        assert Keeloq(other_key).encrypt(data, counter) == KeeloqReference(other_key).encrypt(data, counter)
+
+    data = np.random.randint(0, 1 << 28, size=1_000_000, dtype=np.uint32)
+    counters = np.random.randint(0, 16, size=data.size, dtype=np.uint32)
+    encrypted = keeloq.encrypt_array(data, counters)
+    assert all(int(encrypted[i]) == keeloq.encrypt(int(data[i]), int(counters[i])) for i in range(1000))
+    decrypted, decrypted_counters = keeloq.decrypt_array(encrypted)
+    assert np.array_equal(decrypted, data) and np.array_equal(decrypted_counters, counters)
+
+    samples = [(random.getrandbits(28), random.getrandbits(4)) for _ in range(100000)]
+    print(f"{'Référence tour par tour':<28}: {blocks_per_second(lambda: [reference.encrypt(d, c) for d, c in samples[:20]], 20):>14,.0f} blocs/s")
+    print(f"{'Masque précalculé':<28}: {blocks_per_second(lambda: [keeloq.encrypt(d, c) for d, c in samples], len(samples)):>14,.0f} blocs/s")
+    print(f"{'NumPy vectorisé':<28}: {blocks_per_second(lambda: keeloq.encrypt_array(data, counters), data.size):>14,.0f} blocs/s")
+    assert np.array_equal(keeloq.encrypt_many(data, counters, processes=2, chunk_size=1 << 18), encrypted)
+    assert np.array_equal(keeloq.encrypt_many(encrypted.tobytes(), 0), keeloq.encrypt_array(encrypted, 0))
+    decrypted, decrypted_counters = keeloq.decrypt_many(encrypted, processes=2, chunk_size=1 << 18)
+    assert np.array_equal(decrypted, data) and np.array_equal(decrypted_counters, counters)
+
+    large_data = np.random.randint(0, 1 << 28, size=50_000_000, dtype=np.uint32)
+    print(f"{'encrypt_many (1 processus)':<28}: "
+          f"{blocks_per_second(lambda: keeloq.encrypt_many(large_data, 0), large_data.size):>14,.0f} blocs/s")
+    processes = os.cpu_count()
+    print(f"{f'encrypt_many ({processes} processus)':<28}: "
+          f"{blocks_per_second(lambda: keeloq.encrypt_many(large_data, 0, processes=processes), large_data.size):>14,.0f} blocs/s")
+    keys = [random.getrandbits(64) for _ in range(100000)]
+    print(f"{'Initialisation de clé':<28}: {blocks_per_second(lambda: [Keeloq(k) for k in keys], len(keys)):>14,.0f} clés/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,100 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Prises du NLFSR : bits 0, 2, 3, 5, 7, 10, 11, 13, 14, 15, 17, 19, 22, 24, 26 et 28 de l'état
+_NLFSR_TAPS = sum(1 << tap for tap in (0, 2, 3, 5, 7, 10, 11, 13, 14, 15, 17, 19, 22, 24, 26, 28))
+
+
+def _round_mask(round_key: int):
+    """
+    Masque appliqué aux données par un tour de Feistel (modifié).
+    Les bits réinjectés en position 63 du registre n'atteignent jamais les prises (<= 28) en 32 décalages :
+    la sortie du NLFSR au pas i ne dépend donc que de la clé de ronde, et le tour se réduit à data ^ masque.
+    :param round_key: La clé de ronde (32 bits).
+    :return: Le masque de 32 bits du tour.
+    """
+    mask = 0
+    for i in range(32):
+        mask |= (((round_key >> i) & _NLFSR_TAPS).bit_count() & 1) << i
+    return mask
+
+
+def _key_pad_reference(key: int):
+    """
+    Masque global des 528 tours pour une clé. Les tours de même rang modulo 64 appliquent le même masque :
+    les rangs 16 à 63 apparaissent 8 fois et s'annulent, seuls les rangs 0 à 15 (9 fois) subsistent.
+    :param key: Clé de chiffrement.
+    :return: Le masque de 32 bits appliqué par encrypt et decrypt.
+    """
+    pad = 0
+    for round in range(16):
+        pad ^= _round_mask((key >> round) & 0xFFFFFFFF)
+    return pad
+
+
+def _build_pad_tables():
+    """
+    Le masque global est linéaire (sur GF(2)) en les bits 0 à 46 de la clé : il se calcule par 6 accès à des
+    tables indexées par les octets de la clé, construites à partir des contributions de chaque bit.
+    :return: Les 6 tables de 256 masques.
+    """
+    tables = []
+    for byte in range(6):
+        columns = [_key_pad_reference(1 << (8 * byte + bit)) for bit in range(8)]
+        table = [0] * 256
+        for value in range(1, 256):
+            lowest_bit = (value & -value).bit_length() - 1
+            table[value] = table[value & (value - 1)] ^ columns[lowest_bit]
+        tables.append(table)
+    return tables
+
+
+_PAD_TABLES = _build_pad_tables()
+
+
+def _as_words(data):
+    """
+    Convertit des données en tableau NumPy de mots de 32 bits.
+    :param data: Tableau NumPy, liste d'entiers ou tampon (bytes, bytearray, memoryview) de mots uint32 natifs.
+    :return: Le tableau uint32 correspondant.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return np.frombuffer(data, dtype=np.uint32)
+    return np.asarray(data, dtype=np.uint32)
+
+
+def _encrypt_chunk(key: int, counter_bits: int, data: np.ndarray, counters: np.ndarray):
+    """
+    Chiffre un lot dans un processus de la réserve (fonction de module pour pouvoir être sérialisée).
+    """
+    return Keeloq(key, counter_bits).encrypt_array(data, counters)
+
+
+def _decrypt_chunk(key: int, counter_bits: int, data: np.ndarray):
+    """
+    Déchiffre un lot dans un processus de la réserve (fonction de module pour pouvoir être sérialisée).
+    """
+    return Keeloq(key, counter_bits).decrypt_array(data)
+
+
 class Keeloq:
-    def __init__(self, key: int):
+    def __init__(self, key: int, counter_bits: int = 4):
         """
         Initialise une instance de la classe Keeloq avec une clé donnée.
+        Les 528 tours sont précalculés une fois pour toutes en un masque de 32 bits propre à la clé.
         :param key: Clé de chiffrement utilisée pour les opérations Keeloq.
+        :param counter_bits: Taille du compteur placé dans les bits de poids forts du bloc de 32 bits.
         """
+        if not 0 < counter_bits < 32:
+            raise ValueError("Le compteur doit occuper entre 1 et 31 bits du bloc")
         self.key = key
-
-    @staticmethod
-    def __nlfsr(state):
-        """
-        Effectue une opération de registre à décalage linéaire rétrograde non linéaire (NLFSR) sur un état donné.
-        :param state: L'état initial du NLFSR.
-        :return: Le bit résultant de l'opération NLFSR.
-        """
-        return ((state >> 0) ^ (state >> 2) ^ (state >> 3) ^ (state >> 5) ^ (state >> 7) ^ (state >> 10) ^
-                (state >> 11) ^ (state >> 13) ^ (state >> 14) ^ (state >> 15) ^ (state >> 17) ^ (state >> 19) ^
-                (state >> 22) ^ (state >> 24) ^ (state >> 26) ^ (state >> 28)) & 1
-
-    def __feistel(self, data, round_key):
-        """
-        Effectue une opération de 32 tour de Feistel (modifié) sur les données.
-        :param data: Les données à transformer.
-        :param round_key: La clé de ronde utilisée pour l'opération Feistel.
-        :return: Les données transformées après l'opération Feistel.
-        """
-        result = 0
-        for i in range(32):
-            lfsr_output = self.__nlfsr(round_key)
-            bit = ((data >> i) & 1) ^ lfsr_output
-            result |= (bit << i)
-            round_key >>= 1
-            round_key |= (bit << 63)
-        return result
+        self.counter_bits = counter_bits
+        self.counter_mask = (1 << counter_bits) - 1
+        self.data_bits = 32 - counter_bits
+        self.data_mask = (1 << self.data_bits) - 1
+        self.__pad = 0
+        for byte, table in enumerate(_PAD_TABLES):
+            self.__pad ^= table[(key >> (8 * byte)) & 0xFF]
 
     def encrypt(self, data: int, counter: int):
         """
@@ -40,11 +103,8 @@ class Keeloq:
         :param counter: Le compteur à inclure dans le chiffrement.
         :return: Les données chiffrées.
         """
-        data = ((counter & 0xF) << 28) | (data & 0x0FFFFFFF)  # Inclure le compteur de 4 bits dans les 4 bits de poids forts
-        for round in range(528):
-            round_key = (self.key >> (round % 64)) & 0xFFFFFFFF
-            data = self.__feistel(data, round_key)
-        return data
+        data = ((counter & self.counter_mask) << self.data_bits) | (data & self.data_mask)  # Inclure le compteur dans les bits de poids forts
+        return data ^ self.__pad
 
     def decrypt(self, data: int):
         """
@@ -52,9 +112,63 @@ class Keeloq:
         :param data: Les données à déchiffrer.
         :return: Les données déchiffrées et le compteur extrait.
         """
-        for round in range(528):
-            round_key = (self.key >> ((527 - round) % 64)) & 0xFFFFFFFF
-            data = self.__feistel(data, round_key)
-        counter = (data >> 28) & 0xF  # Extraire les 4 bits de poids forts comme le compteur
-        decrypted_data = data & 0x0FFFFFFF  # Extraire les 28 bits de poids faibles comme les données
+        data ^= self.__pad
+        counter = (data >> self.data_bits) & self.counter_mask  # Extraire les bits de poids forts comme le compteur
+        decrypted_data = data & self.data_mask  # Extraire les bits de poids faibles comme les données
         return decrypted_data, counter
+
+    def encrypt_array(self, data: np.ndarray, counters: np.ndarray):
+        """
+        Chiffre un tableau de blocs en une seule opération vectorisée NumPy.
+        :param data: Les données à chiffrer.
+        :param counters: Les compteurs associés (ou un compteur commun).
+        :return: Le tableau uint32 des données chiffrées.
+        """
+        data = np.asarray(data, dtype=np.uint32) & np.uint32(self.data_mask)
+        counters = np.asarray(counters, dtype=np.uint32) & np.uint32(self.counter_mask)
+        return (data | (counters << np.uint32(self.data_bits))) ^ np.uint32(self.__pad)
+
+    def decrypt_array(self, data: np.ndarray):
+        """
+        Déchiffre un tableau de blocs en une seule opération vectorisée NumPy.
+        :param data: Les données à déchiffrer (entiers de 32 bits).
+        :return: Les tableaux uint32 des données déchiffrées et des compteurs extraits.
+        """
+        data = np.asarray(data, dtype=np.uint32) ^ np.uint32(self.__pad)
+        return data & np.uint32(self.data_mask), data >> np.uint32(self.data_bits)
+
+    def encrypt_many(self, data, counters, processes: int = None, chunk_size: int = 1 << 22):
+        """
+        Chiffre un grand nombre de blocs.
+        :param data: Les données à chiffrer (tableau NumPy, liste ou tampon de mots de 32 bits).
+        :param counters: Les compteurs associés (même forme que data) ou un compteur commun.
+        :param processes: Nombre de processus pour répartir les lots ; None pour tout traiter dans le processus courant.
+        :param chunk_size: Nombre de blocs par lot envoyé à un processus.
+        :return: Le tableau uint32 des données chiffrées.
+        """
+        data = _as_words(data)
+        counters = np.broadcast_to(_as_words(counters), data.shape)
+        if not processes or data.size <= chunk_size:
+            return self.encrypt_array(data, counters)
+        bounds = range(0, data.size, chunk_size)
+        with ProcessPoolExecutor(processes) as pool:
+            chunks = pool.map(_encrypt_chunk, [self.key] * len(bounds), [self.counter_bits] * len(bounds),
+                              [data[i:i + chunk_size] for i in bounds], [counters[i:i + chunk_size] for i in bounds])
+            return np.concatenate(list(chunks))
+
+    def decrypt_many(self, data, processes: int = None, chunk_size: int = 1 << 22):
+        """
+        Déchiffre un grand nombre de blocs.
+        :param data: Les données à déchiffrer (tableau NumPy, liste ou tampon de mots de 32 bits).
+        :param processes: Nombre de processus pour répartir les lots ; None pour tout traiter dans le processus courant.
+        :param chunk_size: Nombre de blocs par lot envoyé à un processus.
+        :return: Les tableaux uint32 des données déchiffrées et des compteurs extraits.
+        """
+        data = _as_words(data)
+        if not processes or data.size <= chunk_size:
+            return self.decrypt_array(data)
+        bounds = range(0, data.size, chunk_size)
+        with ProcessPoolExecutor(processes) as pool:
+            chunks = list(pool.map(_decrypt_chunk, [self.key] * len(bounds), [self.counter_bits] * len(bounds),
+                                   [data[i:i + chunk_size] for i in bounds]))
+        return np.concatenate([chunk[0] for chunk in chunks]), np.concatenate([chunk[1] for chunk in chunks])
@@ -0,0 +1,234 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from keeloq import Keeloq
+
+KEY_BITS = 64
+
+# Paramètres de recherche partagés par les processus (fixés par _init_worker)
+_search = None
+_stop = None
+
+
+def key_bit_pad(bit: int):
+    """
+    Contribution d'un bit de clé au masque du chiffrement : Keeloq(k).encrypt(0, 0) est le masque de la clé k,
+    linéaire en k, de sorte que changer un bit de clé change le masque d'une quantité fixe.
+    :param bit: Position du bit de clé.
+    :return: Le masque de 32 bits associé au bit.
+    """
+    return Keeloq(1 << bit).encrypt(0, 0)
+
+
+def parse_pair(text: str):
+    """
+    :param text: Paire connue au format "clair:compteur:chiffré" (entiers en hexadécimal).
+    :return: Le tuple (clair, compteur, chiffré).
+    """
+    plaintext, counter, ciphertext = (int(value, 16) for value in text.split(':'))
+    return plaintext, counter, ciphertext
+
+
+def _init_worker(search: dict, stop):
+    global _search, _stop
+    _search = search
+    _stop = stop
+
+
+def _matches(key: int):
+    """
+    :return: True si la clé chiffre toutes les paires connues à l'identique.
+    """
+    keeloq = Keeloq(key, _search['counter_bits'])
+    return all(keeloq.encrypt(plaintext, counter) == ciphertext for plaintext, counter, ciphertext in _search['pairs'])
+
+
+def search_chunk(chunk: int):
+    """
+    Parcourt un lot de 2^chunk_bits clés : les bits inconnus de poids forts sont fixés par l'indice du lot,
+    ceux de poids faibles sont énumérés en code de Gray pour ne mettre à jour le masque que d'un bit par clé.
+    :param chunk: Indice du lot.
+    :return: Le tuple (lot, clé trouvée ou None, clés testées, durée en s, pid du processus).
+    """
+    start_time = time.perf_counter()
+    key = _search['known_key']
+    for bit, position in enumerate(_search['high_positions']):
+        if (chunk >> bit) & 1:
+            key |= 1 << position
+    pad = Keeloq(key).encrypt(0, 0)
+    target, low_keys, low_pads = _search['target'], _search['low_keys'], _search['low_pads']
+
+    tested = 1
+    found = key if pad == target and _matches(key) else None
+    if found is None:
+        for index in range(1, 1 << len(low_keys)):
+            bit = (index & -index).bit_length() - 1
+            key ^= low_keys[bit]
+            pad ^= low_pads[bit]
+            if pad == target and _matches(key):
+                found = key
+                break
+            if not index & 0xFFFF and _stop.is_set():
+                break
+        tested = index + 1 if low_keys else 1
+    if found is not None:
+        _stop.set()
+    return chunk, found, tested, time.perf_counter() - start_time, os.getpid()
+
+
+class CheckpointMismatch(ValueError):
+    """
+    Le fichier de reprise a été écrit par une recherche de paramètres différents.
+    """
+
+
+class Checkpoint:
+    def __init__(self, path: str, signature: dict):
+        """
+        Point de reprise : lots déjà parcourus et clé éventuellement trouvée, écrits de façon atomique.
+        :param path: Fichier de reprise (None pour ne rien enregistrer).
+        :param signature: Paramètres de la recherche ; une reprise n'est acceptée que pour les mêmes paramètres.
+        """
+        self.path = path
+        self.signature = signature
+        self.done = set()
+        self.key = None
+        if path and os.path.exists(path):
+            with open(path) as file:
+                state = json.load(file)
+            if state['parametres'] != signature:
+                raise CheckpointMismatch(f"le fichier de reprise {path} correspond à une autre recherche")
+            self.done = set(state['lots_termines'])
+            self.key = state['cle']
+
+    def save(self):
+        if not self.path:
+            return
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w') as file:
+            json.dump({'parametres': self.signature, 'lots_termines': sorted(self.done), 'cle': self.key}, file)
+        os.replace(temporary, self.path)
+
+
+def search(pairs: list, known_key: int, known_mask: int, counter_bits: int = 16, processes: int = None,
+           chunk_bits: int = 20, checkpoint_path: str = None):
+    """
+    Recherche exhaustive des bits de clé inconnus, répartie entre les processus d'une réserve.
+    :param pairs: Paires connues (clair, compteur, chiffré).
+    :param known_key: Valeur des bits de clé connus.
+    :param known_mask: Masque des bits de clé connus (1 = connu).
+    :param counter_bits: Taille du compteur utilisé par l'émetteur.
+    :param processes: Nombre de processus (par défaut, un par coeur).
+    :param chunk_bits: Nombre de bits inconnus énumérés par lot.
+    :param checkpoint_path: Fichier de reprise.
+    :return: La clé trouvée ou None.
+    """
+    unknown = [bit for bit in range(KEY_BITS) if not (known_mask >> bit) & 1]
+    chunk_bits = min(chunk_bits, len(unknown))
+    low, high = unknown[:chunk_bits], unknown[chunk_bits:]
+    reference = Keeloq(0, counter_bits)  # Clé nulle : masque nul, encrypt ne fait que la mise en forme du bloc
+    targets = {ciphertext ^ reference.encrypt(plaintext, counter) for plaintext, counter, ciphertext in pairs}
+    if len(targets) != 1:
+        print("Les paires connues sont incohérentes : aucune clé ne peut les satisfaire toutes.")
+        return None
+
+    inert = [bit for bit in unknown if key_bit_pad(bit) == 0]
+    print(f"{len(unknown)} bits inconnus, {len(inert)} sans effet sur le chiffrement "
+          f"(espace effectif : 2^{len(unknown) - len(inert)} clés), {1 << len(high)} lots de 2^{chunk_bits} clés")
+
+    signature = {'paires': [list(pair) for pair in pairs], 'cle_connue': known_key & known_mask,
+                 'masque': known_mask, 'bits_compteur': counter_bits, 'bits_lot': chunk_bits}
+    checkpoint = Checkpoint(checkpoint_path, signature)
+    if checkpoint.key is not None:
+        print(f"Clé déjà trouvée dans le fichier de reprise : {checkpoint.key:016x}")
+        return checkpoint.key
+    remaining = [chunk for chunk in range(1 << len(high)) if chunk not in checkpoint.done]
+    if checkpoint.done:
+        print(f"Reprise : {len(checkpoint.done)} lots déjà parcourus, {len(remaining)} restants")
+
+    search_parameters = {'pairs': pairs, 'counter_bits': counter_bits, 'known_key': known_key & known_mask,
+                         'high_positions': high, 'target': targets.pop(),
+                         'low_keys': [1 << bit for bit in low], 'low_pads': [key_bit_pad(bit) for bit in low]}
+    statistics = {}
+    start_time = time.perf_counter()
+    processes = processes or os.cpu_count()
+    with multiprocessing.Manager() as manager:
+        stop = manager.Event()
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(search_parameters, stop)) as pool:
+            chunks = iter(remaining)
+            pending = {pool.submit(search_chunk, chunk) for chunk in _take(chunks, 2 * processes)}
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    chunk, found, tested, elapsed, pid = future.result()
+                    worker = statistics.setdefault(pid, [0, 0.0])
+                    worker[0] += tested
+                    worker[1] += elapsed
+                    if found is not None:
+                        checkpoint.key = found
+                    elif not stop.is_set():
+                        checkpoint.done.add(chunk)
+                checkpoint.save()
+                if checkpoint.key is not None:
+                    for future in pending:
+                        future.cancel()
+                    break
+                pending |= {pool.submit(search_chunk, chunk) for chunk in _take(chunks, len(finished))}
+
+    elapsed = time.perf_counter() - start_time
+    for pid, (tested, busy) in sorted(statistics.items()):
+        print(f"Processus {pid} : {tested} clés en {busy:.2f} s, {tested / max(busy, 1e-9):,.0f} clés/s")
+    total = sum(tested for tested, _ in statistics.values())
+    print(f"Total : {total} clés en {elapsed:.2f} s, {total / elapsed:,.0f} clés/s")
+    return checkpoint.key
+
+
+def _take(iterator, count: int):
+    """
+    :return: Les count prochains éléments de l'itérateur (moins s'il est épuisé).
+    """
+    return [item for _, item in zip(range(count), iterator)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recherche de clé Keeloq à partir de paires clair/chiffré connues")
+    parser.add_argument('--paire', action='append', default=[], help="Paire connue clair:compteur:chiffré (hexadécimal)")
+    parser.add_argument('--cle-connue', default='0', help="Valeur des bits de clé connus (hexadécimal)")
+    parser.add_argument('--masque', default='0', help="Masque des bits de clé connus, 1 = connu (hexadécimal)")
+    parser.add_argument('--bits-compteur', type=int, default=16)
+    parser.add_argument('--processus', type=int, default=None)
+    parser.add_argument('--bits-lot', type=int, default=20, help="Nombre de bits inconnus énumérés par lot")
+    parser.add_argument('--reprise', help="Fichier de point de reprise")
+    parser.add_argument('--demo', type=int, metavar='BITS',
+                        help="Génère une clé et deux paires, avec BITS bits de clé inconnus tirés au hasard")
+    args = parser.parse_args()
+
+    if args.demo:
+        key = random.getrandbits(KEY_BITS)
+        keeloq = Keeloq(key, args.bits_compteur)
+        pairs = [(data, counter, keeloq.encrypt(data, counter)) for data, counter in ((0x4567, 1), (0x4567, 2))]
+        known_mask = ((1 << KEY_BITS) - 1) & ~sum(1 << bit for bit in random.sample(range(KEY_BITS), args.demo))
+        known_key = key & known_mask
+        print(f"Clé réelle : {key:016x}")
+    else:
+        pairs = [parse_pair(pair) for pair in args.paire]
+        known_key, known_mask = int(args.cle_connue, 16), int(args.masque, 16)
+        if not pairs:
+            parser.error("au moins une paire connue est nécessaire")
+
+    try:
+        key = search(pairs, known_key, known_mask, args.bits_compteur, args.processus, args.bits_lot, args.reprise)
+    except CheckpointMismatch as error:
+        parser.error(str(error))
+    if key is None:
+        print("Aucune clé trouvée")
+    else:
+        print(f"Clé trouvée (reproduit toutes les paires connues) : {key:016x}")
+
+
+if __name__ == "__main__":
+    main()
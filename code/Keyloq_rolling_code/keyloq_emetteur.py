@@ -4,12 +4,14 @@ from keeloq import Keeloq
 
 
 class Emetteur:
-    def __init__(self, key: int):
+    def __init__(self, key: int, counter_bits: int = 16):
         """
         Initialise une instance de la classe Emetteur avec une clé donnée.
         :param key: Clé de chiffrement utilisée pour initialiser l'instance Keeloq.
+        :param counter_bits: Taille du compteur de synchronisation (16 bits, comme le compteur KeeLoq).
         """
-        self.keeloq = Keeloq(key)
+        self.keeloq = Keeloq(key, counter_bits)
+        self.counter_mask = self.keeloq.counter_mask
         self.counter = 0  # Compteur initial
 
     def send(self, data: int):
@@ -18,7 +20,7 @@ class Emetteur:
         :param data: Les données à envoyer.
         :return: Les données chiffrées et le compteur utilisé.
         """
-        self.counter = (self.counter + 1) & 0xF  # Incrémenter le compteur sur 4 bits pour chaque envoi
+        self.counter = (self.counter + 1) & self.counter_mask  # Incrémenter le compteur (modulo sa taille) pour chaque envoi
         encrypted_data = self.keeloq.encrypt(data, self.counter)
         return encrypted_data, self.counter
 
@@ -28,7 +30,7 @@ def main():
     key = random.getrandbits(64)
     print(key)
     emetteur = Emetteur(key)
-    data_to_send = 0x1234567
+    data_to_send = 0x4567  # Données sur les 16 bits laissés libres par le compteur
 
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.bind(('localhost', 12345))
@@ -47,7 +49,7 @@ def main():
             print("Désynchronisation tolérable :")
             iteration = 3
             print(f"Incrementation de l'émetteur sans reception x{iteration}")
-            emetteur.counter = (emetteur.counter + iteration) & 0xF
+            emetteur.counter = (emetteur.counter + iteration) & emetteur.counter_mask
             encrypted_data, sent_counter = emetteur.send(data_to_send)
             conn.sendall(encrypted_data.to_bytes(8, 'big'))
 
@@ -55,7 +57,7 @@ def main():
             print("Désynchronisation non-tolérable :")
             iteration = 6
             print(f"Incrementation de l'émetteur sans reception x{iteration}")
-            emetteur.counter = (emetteur.counter + iteration) & 0xF
+            emetteur.counter = (emetteur.counter + iteration) & emetteur.counter_mask
             encrypted_data, sent_counter = emetteur.send(data_to_send)
             conn.sendall(encrypted_data.to_bytes(8, 'big'))
 
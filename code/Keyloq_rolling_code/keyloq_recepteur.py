@@ -3,71 +3,95 @@ from keeloq import Keeloq
 
 
 class Recepteur:
-    def __init__(self, key: int):
+    def __init__(self, key: int, window: int = 5, counter_bits: int = 16, store=None, device_id: int = 0):
         """
         Initialise une instance de la classe Recepteur avec une clé donnée.
         :param key: Clé de chiffrement utilisée pour initialiser l'instance Keeloq.
+        :param window: Nombre de codes d'avance acceptés (tolérance à la désynchronisation).
+        :param counter_bits: Taille du compteur de synchronisation (doit être celle de l'émetteur).
+        :param store: Stockage persistant des compteurs (CounterStore) ; le dernier compteur connu y est rechargé.
+        :param device_id: Identifiant de l'émetteur dans le stockage.
         """
-        self.keeloq = Keeloq(key)
-        self.last_counter = 0  # Dernier compteur connu
+        self.keeloq = Keeloq(key, counter_bits)
+        if not 0 < window < self.keeloq.counter_mask:
+            raise ValueError("La fenêtre doit être plus petite que l'espace des compteurs")
+        self.window = window
+        self.store = store
+        self.device_id = device_id
+        self.last_counter = store.load_all().get(device_id, 0) if store is not None else 0  # Dernier compteur connu
 
     def receive(self, encrypted_data: int):
         """
         Déchiffre les données chiffrées reçues et vérifie le compteur.
+        La trame n'est déchiffrée qu'une fois ; le compteur est accepté s'il est en avance de 1 à window pas
+        sur le dernier compteur connu, modulo la taille du compteur (un code rejoué, d'avance nulle, est refusé).
         :param encrypted_data: Les données chiffrées reçues.
         :return: Les données déchiffrées et un booléen indiquant si le compteur est valide.
         """
-        for i in range(6):  # Vérifier les 5 prochains codes possibles
-            test_counter = (self.last_counter + i) & 0xF
-            test_data, counter = self.keeloq.decrypt(encrypted_data)
-            if counter == test_counter:
-                self.last_counter = test_counter
-                return test_data, True
+        data, counter = self.keeloq.decrypt(encrypted_data)
+        if 0 < ((counter - self.last_counter) & self.keeloq.counter_mask) <= self.window:
+            self.last_counter = counter
+            if self.store is not None:
+                # Compteur rendu durable avant d'accepter le code : il ne peut pas être rejoué après un redémarrage
+                self.store.set(self.device_id, self.last_counter)
+                self.store.flush()
+            return data, True
         return None, False
 
+    def close(self):
+        """
+        Ferme le stockage des compteurs, s'il y en a un.
+        """
+        if self.store is not None:
+            self.store.close()
+
 
 def main():
     key = int(input("Veuillez entrer la clé (en entier): "))
     recepteur = Recepteur(key)
 
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.connect(('localhost', 12345))
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.connect(('localhost', 12345))
 
-        # Ex1: Initialisation à temps 0
-        print("Initialisation :")
-        encrypted_data = s.recv(8)
-        encrypted_data = int.from_bytes(encrypted_data, 'big')
-        received_data, is_valid = recepteur.receive(encrypted_data)
-        print(" == RECEPTEUR == ")
-        if received_data is not None:
-            print(f"•Code déchiffré reçu : {received_data}")
-            print(f"•Etat                : {is_valid}")
-        else:
-            print("Réception échouée, données invalides")
+            # Ex1: Initialisation à temps 0
+            print("Initialisation :")
+            encrypted_data = s.recv(8)
+            encrypted_data = int.from_bytes(encrypted_data, 'big')
+            received_data, is_valid = recepteur.receive(encrypted_data)
+            print(" == RECEPTEUR == ")
+            if received_data is not None:
+                print(f"•Code déchiffré reçu : {received_data}")
+                print(f"•Etat                : {is_valid}")
+            else:
+                print("Réception échouée, données invalides")
 
-        # Ex2: Resynchronisation, après une désynchronisation tolérable
-        print("Désynchronisation tolérable :")
-        encrypted_data = s.recv(8)
-        encrypted_data = int.from_bytes(encrypted_data, 'big')
-        received_data, is_valid = recepteur.receive(encrypted_data)
-        print(" == RECEPTEUR == ")
-        if received_data is not None:
-            print(f"•Code déchiffré reçu : {received_data}")
-            print(f"•Etat                : {is_valid}")
-        else:
-            print("Réception échouée, données invalides")
+            # Ex2: Resynchronisation, après une désynchronisation tolérable
+            print("Désynchronisation tolérable :")
+            encrypted_data = s.recv(8)
+            encrypted_data = int.from_bytes(encrypted_data, 'big')
+            received_data, is_valid = recepteur.receive(encrypted_data)
+            print(" == RECEPTEUR == ")
+            if received_data is not None:
+                print(f"•Code déchiffré reçu : {received_data}")
+                print(f"•Etat                : {is_valid}")
+            else:
+                print("Réception échouée, données invalides")
 
-        # Ex3: Resynchronisation, après une désynchronisation non-tolérable
-        print("Désynchronisation non-tolérable :")
-        encrypted_data = s.recv(8)
-        encrypted_data = int.from_bytes(encrypted_data, 'big')
-        received_data, is_valid = recepteur.receive(encrypted_data)
-        print(" == RECEPTEUR == ")
-        if received_data is not None:
-            print(f"•Code déchiffré reçu : {received_data}")
-            print(f"•Etat                : {is_valid}")
-        else:
-            print("Réception échouée, données invalides")
+            # Ex3: Resynchronisation, après une désynchronisation non-tolérable
+            print("Désynchronisation non-tolérable :")
+            encrypted_data = s.recv(8)
+            encrypted_data = int.from_bytes(encrypted_data, 'big')
+            received_data, is_valid = recepteur.receive(encrypted_data)
+            print(" == RECEPTEUR == ")
+            if received_data is not None:
+                print(f"•Code déchiffré reçu : {received_data}")
+                print(f"•Etat                : {is_valid}")
+            else:
+                print("Réception échouée, données invalides")
+    finally:
+        # Fermeture du stockage des compteurs, même si la connexion a échoué
+        recepteur.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+import argparse
+import contextlib
+import functools
+import io
+import socket
+import statistics
+import threading
+import time
+import client
+import server
+from ecdhe_keys import ENCODINGS
+from ephemeral_pool import EphemeralPool
+from framing import FrameReader
+
+
+class DelayedSocket:
+    def __init__(self, sock, delay: float):
+        """
+        Socket dont chaque envoi subit le délai de propagation d'une liaison lente. Les deux protocoles étant
+        strictement alternés, retarder l'envoi équivaut à retarder la réception.
+        :param sock: Socket connectée
+        :param delay: Délai aller simple (s)
+        """
+        self.sock = sock
+        self.delay = delay
+
+    def sendall(self, data):
+        time.sleep(self.delay)
+        self.sock.sendall(data)
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+
+def handshake(mode: str, delay: float, store, key_pools, options):
+    """
+    Poignée de main complète entre deux threads reliés par une paire de sockets retardées.
+    :return: Durée vue par le client (s)
+    """
+    client_sock, server_sock = socket.socketpair()
+    server_conn = DelayedSocket(server_sock, delay)
+    thread = threading.Thread(target=server.serve_connection, args=(server_conn, store, key_pools, options))
+    thread.start()
+    client_conn = DelayedSocket(client_sock, delay)
+    start_time = time.perf_counter()
+    client.HANDSHAKES[mode](client_conn, FrameReader(client_conn), 'testuser', 'testpassword', ['x25519'], options)
+    elapsed = time.perf_counter() - start_time
+    thread.join()
+    client_sock.close()
+    server_sock.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latence de la poignée de main SRP + ECDHE sur une liaison lente")
+    parser.add_argument('--delais', type=float, nargs='+', default=[0.0, 0.01, 0.05, 0.2],
+                        help="Délais aller simple simulés (s)")
+    parser.add_argument('--repetitions', type=int, default=5)
+    args = parser.parse_args()
+
+    options = {}
+    # Table en mémoire : la base SQLite n'est utilisable que depuis le thread qui l'a ouverte
+    store = server.open_verifier_store(None)
+    key_pools = {encoding: EphemeralPool(functools.partial(server.generate_key_pair, encoding))
+                 for encoding in ENCODINGS}
+    print(f"{'Délai':>8} | {'Classique':>10} | {'Pipeline':>10} | {'Gain':>5}")
+    for delay in args.delais:
+        medians = {}
+        for mode in ('classique', 'pipeline'):
+            with contextlib.redirect_stdout(io.StringIO()):
+                durations = [handshake(mode, delay, store, key_pools, options) for _ in range(args.repetitions)]
+            medians[mode] = statistics.median(durations)
+        print(f"{delay * 1000:5.0f} ms | {medians['classique'] * 1000:7.1f} ms | {medians['pipeline'] * 1000:7.1f} ms | "
+              f"{medians['classique'] / medians['pipeline']:4.1f}x")
+    for pool in key_pools.values():
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
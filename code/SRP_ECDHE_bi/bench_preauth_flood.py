@@ -0,0 +1,146 @@
+import argparse
+import contextlib
+import functools
+import io
+import os
+import socket
+import statistics
+import threading
+import time
+import client
+import server
+from ecdhe_keys import ENCODINGS
+from ephemeral_pool import EphemeralPool
+from framing import FrameReader, send_message
+from preauth import CookieIssuer, TokenBucket, with_cookie
+
+LEGITIMATE_SOURCE = '127.0.0.1'
+
+
+def flood(address, source: str, stop: threading.Event, counter: list, replay: bool = False):
+    """
+    Attaquant : ouvre des connexions en boucle et envoie un premier message pipeliné avec un A et une clé publique
+    aléatoires, qui déclenchent l'exponentiation SRP et l'échange ECDHE. Un cookie reçu est renvoyé tel quel, sans
+    résoudre le puzzle ; en mode rejeu, le premier cookie est résolu une fois et ce message est rejoué ensuite.
+    :param source: Adresse locale (127.0.0.x) de l'attaquant
+    :param counter: Liste à un élément, incrémentée à chaque connexion
+    :param replay: Résoudre un puzzle puis rejouer le message résolu à chaque connexion
+    """
+    solved = None
+    while not stop.is_set():
+        try:
+            with socket.create_connection(address, source_address=(source, 0)) as conn:
+                message = solved or {'username': 'testuser', 'A': os.urandom(256), 'key_encoding': 'x25519',
+                                     'client_public_key': os.urandom(32)}
+                send_message(conn, message)
+                reply = FrameReader(conn).receive_message()
+                if 'cookie' in reply:
+                    if replay:
+                        solved = with_cookie(message, reply['cookie'])
+                        send_message(conn, solved)
+                    else:
+                        send_message(conn, dict(message, cookie=bytes(reply['cookie'])))
+                    FrameReader(conn).receive_message()
+        except OSError:
+            pass
+        counter[0] += 1
+
+
+def legitimate_handshakes(address, count: int, interval: float):
+    """
+    Client légitime : poignées de main pipelinées espacées de interval secondes.
+    :return: (latences des poignées de main réussies (s), nombre d'échecs)
+    """
+    latencies = []
+    failures = 0
+    for _ in range(count):
+        start_time = time.perf_counter()
+        try:
+            with socket.create_connection(address, source_address=(LEGITIMATE_SOURCE, 0)) as conn:
+                client.pipelined_handshake(conn, FrameReader(conn), 'testuser', 'testpassword', ['x25519'], {})
+            latencies.append(time.perf_counter() - start_time)
+        except (client.AuthenticationFailed, ConnectionError, OSError):
+            failures += 1
+        time.sleep(max(0.0, interval - (time.perf_counter() - start_time)))
+    return latencies, failures
+
+
+def scenario(attackers: int, cookies, limiter, args, replay: bool = False):
+    """
+    Un serveur SRP_ECDHE_bi (server.serve) sur un port local, attaqué par des sources 127.0.0.2, 127.0.0.3, ...
+    pendant qu'un client légitime s'authentifie depuis 127.0.0.1.
+    :return: (latences légitimes, échecs légitimes, connexions d'attaque, poignées de main calculées pour l'attaque)
+    """
+    store = server.open_verifier_store(None)
+    key_pools = {encoding: EphemeralPool(functools.partial(server.generate_key_pair, encoding))
+                 for encoding in ENCODINGS}
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(128)
+    address = listener.getsockname()
+
+    def run_server():
+        try:
+            server.serve(listener, store, key_pools, {}, None, list(server.CIPHERS), 0, cookies, limiter, timeout=2.0)
+        except OSError:
+            pass  # Socket d'écoute fermée : fin du scénario
+
+    server_thread = threading.Thread(target=run_server, daemon=True)
+    server_thread.start()
+    stop = threading.Event()
+    counter = [0]  # Incrémenté sans verrou : ordre de grandeur seulement
+    attacker_threads = [threading.Thread(target=flood, args=(address, f'127.0.0.{2 + index}', stop, counter, replay))
+                        for index in range(attackers)]
+    for thread in attacker_threads:
+        thread.start()
+    latencies, failures = legitimate_handshakes(address, args.poignees, args.intervalle)
+    stop.set()
+    for thread in attacker_threads:
+        thread.join()
+    listener.shutdown(socket.SHUT_RDWR)  # Réveille accept() dans le thread du serveur
+    listener.close()
+    server_thread.join()
+    # Chaque poignée de main poussée jusqu'à l'échange ECDHE consomme une paire de clés de la réserve
+    computed = 0
+    for pool in key_pools.values():
+        metrics = pool.metrics()
+        computed += metrics['hits'] + metrics['exhaustions']
+        pool.close()
+    return latencies, failures, counter[0], computed - len(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latence des poignées de main légitimes sous une inondation de A")
+    parser.add_argument('--attaquants', type=int, default=8, help="Nombre de sources attaquantes")
+    parser.add_argument('--poignees', type=int, default=20, help="Poignées de main légitimes par scénario")
+    parser.add_argument('--intervalle', type=float, default=0.25, help="Intervalle entre deux poignées légitimes (s)")
+    parser.add_argument('--difficulte', type=int, default=12, help="Difficulté du puzzle")
+    args = parser.parse_args()
+
+    scenarios = [
+        ("Sans attaque", 0, lambda: (None, None), False),
+        ("Attaque, sans protection", args.attaquants, lambda: (None, None), False),
+        ("Attaque, limiteur 5/s par source", args.attaquants, lambda: (None, TokenBucket(5.0, 10.0)), False),
+        (f"Attaque, cookie + puzzle {args.difficulte} bits", args.attaquants,
+         lambda: (CookieIssuer(difficulty=args.difficulte), None), False),
+        ("Rejeu d'un puzzle résolu", args.attaquants,
+         lambda: (CookieIssuer(difficulty=args.difficulte), None), True),
+        ("Attaque, cookie + puzzle + limiteur", args.attaquants,
+         lambda: (CookieIssuer(difficulty=args.difficulte), TokenBucket(5.0, 10.0)), False),
+    ]
+    print(f"{'Scénario':<38} | {'p50 (ms)':>9} | {'p95 (ms)':>9} | {'échecs':>6} | {'connexions':>10} | "
+          f"{'calculées':>9}  (attaque)")
+    for name, attackers, make_preauth, replay in scenarios:
+        cookies, limiter = make_preauth()
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies, failures, attacks, computed = scenario(attackers, cookies, limiter, args, replay)
+        if len(latencies) >= 2:
+            quantiles = statistics.quantiles(latencies, n=20)
+            p50, p95 = f"{quantiles[9] * 1000:9.1f}", f"{quantiles[18] * 1000:9.1f}"
+        else:
+            p50 = p95 = f"{'-':>9}"
+        print(f"{name:<38} | {p50} | {p95} | {failures:>6} | {attacks:>10} | {computed:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import contextlib
+import functools
+import io
+import os
+import socket
+import statistics
+import threading
+import time
+import client
+import server
+from bench_handshake_latency import DelayedSocket
+from ecdhe_keys import ENCODINGS
+from ephemeral_pool import EphemeralPool
+from framing import FrameReader
+from session_cache import SessionCache, derive_ticket
+
+
+def connect(session, delay: float, store, key_pools, sessions):
+    """
+    Une connexion : reprise si session contient un ticket, poignée de main pipelinée complète sinon.
+    :return: (durée vue par le client en s, clé de la session établie)
+    """
+    client_sock, server_sock = socket.socketpair()
+    thread = threading.Thread(target=server.serve_connection,
+                              args=(DelayedSocket(server_sock, delay), store, key_pools, {}, sessions))
+    thread.start()
+    conn = DelayedSocket(client_sock, delay)
+    reader = FrameReader(conn)
+    start_time = time.perf_counter()
+    session_key = client.resume_session(conn, reader, *derive_ticket(session)) if session else None
+    if session_key is None:
+        session_key = client.pipelined_handshake(conn, reader, 'testuser', 'testpassword', ['x25519'], {})
+    elapsed = time.perf_counter() - start_time
+    thread.join()
+    client_sock.close()
+    server_sock.close()
+    return elapsed, session_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coût d'une reprise de session comparé à une poignée de main complète")
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--reconnexions', type=int, default=4, help="Reconnexions par client")
+    parser.add_argument('--delai', type=float, default=0.005, help="Délai aller simple simulé (s)")
+    parser.add_argument('--inconnus', type=float, default=0.1, help="Part des reconnexions avec un ticket inconnu")
+    args = parser.parse_args()
+
+    store = server.open_verifier_store(None)
+    key_pools = {encoding: EphemeralPool(functools.partial(server.generate_key_pair, encoding))
+                 for encoding in ENCODINGS}
+    sessions = SessionCache()
+    full, resumed = [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        keys = []
+        for _ in range(args.clients):
+            elapsed, session_key = connect(None, args.delai, store, key_pools, sessions)
+            full.append(elapsed)
+            keys.append(session_key)
+        for _ in range(args.reconnexions):
+            for index, session_key in enumerate(keys):
+                # Une part des clients présente un ticket que le serveur ne connaît pas (redémarrage, éviction)
+                unknown = index < args.inconnus * len(keys)
+                elapsed, keys[index] = connect(os.urandom(32) if unknown else session_key, args.delai,
+                                               store, key_pools, sessions)
+                (full if unknown else resumed).append(elapsed)
+    for pool in key_pools.values():
+        pool.close()
+
+    metrics = sessions.metrics()
+    print(f"Poignée de main complète : médiane {statistics.median(full) * 1000:.1f} ms ({len(full)} connexions)")
+    print(f"Reprise de session       : médiane {statistics.median(resumed) * 1000:.1f} ms ({len(resumed)} connexions)")
+    print(f"Cache : {metrics['hit_rate']:.0%} de succès ({metrics['hits']} reprises, {metrics['misses']} tickets refusés), "
+          f"{metrics['cpu_saved'] * 1000:.0f} ms de CPU serveur économisés, "
+          f"{metrics['cpu_saved'] / max(metrics['hits'], 1) * 1000:.2f} ms par reprise")
+
+
+if __name__ == "__main__":
+    main()
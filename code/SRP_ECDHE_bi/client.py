@@ -1,21 +1,32 @@
+import argparse
+import hmac
+import json
+import os
 import srp
 import socket
-import json
-import base64
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import serialization, hashes
+import sys
+from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+import ecdhe_keys  # noqa: E402
+from ecdhe_keys import DEFAULT_ENCODING, ENCODINGS  # noqa: E402
+from framing import FrameReader, send_message  # noqa: E402
+from preauth import with_cookie  # noqa: E402
+from record_channel import CIPHERS, DEFAULT_CIPHER, open_channel  # noqa: E402
+from session_cache import NONCE_SIZE, derive_ticket, resumed_session_key, resumption_client_proof  # noqa: E402
+from srp_groups import add_group_arguments, library_options  # noqa: E402
+
 class AuthenticationFailed(Exception):
     """Exception levée en cas d'échec de l'authentification."""
     pass
 
 # Utilitaires pour ECDHE
-def generate_key_pair():
+def generate_key_pair(encoding=DEFAULT_ENCODING):
     """
     Génère une paire de clés (privée et publique) ECDHE.
 
-    Courbe elliptique utilisée : SECP256R1 (alias P-256)
+    Courbe elliptique utilisée : SECP256R1 (alias P-256), ou Curve25519 avec l'encodage x25519
     - Cette courbe est définie par l'équation : y^2 = x^3 + ax + b mod p
     - Paramètres de la courbe SECP256R1 :
       - p (le module) : un grand nombre premier
@@ -26,29 +37,26 @@ def generate_key_pair():
     La clé privée est un entier aléatoire d (0 < d < n). La clé publique est un point Q = d * G,
     où la multiplication est la multiplication scalaire sur la courbe elliptique.
     """
-    private_key = ec.generate_private_key(ec.SECP256R1())  # d (clé privée)
-    public_key = private_key.public_key()  # Q = d * G (clé publique)
-    return private_key, public_key
+    return ecdhe_keys.generate_key_pair(encoding)  # (d, Q = d * G)
 
-def serialize_public_key(public_key):
+def serialize_public_key(public_key, encoding=DEFAULT_ENCODING):
     """
-    Sérialise une clé publique en format PEM.
+    Sérialise une clé publique dans l'encodage négocié.
 
     La clé publique est un point sur la courbe elliptique, souvent représenté en coordonnées (x, y).
-    La sérialisation convertit ce point en un format standardisé pour échange.
+    - pem : SubjectPublicKeyInfo (178 octets), format historique
+    - compressed : point compressé X9.62, x et la parité de y (33 octets), y se déduit de l'équation de la courbe
+    - x25519 : coordonnée u brute sur Curve25519 (32 octets)
     """
-    return public_key.public_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo
-    )
+    return ecdhe_keys.serialize_public_key(public_key, encoding)
 
-def deserialize_public_key(pem_data):
+def deserialize_public_key(data, encoding=DEFAULT_ENCODING):
     """
-    Désérialise une clé publique à partir du format PEM.
+    Désérialise une clé publique encodée selon l'encodage négocié.
 
-    La désérialisation convertit les données PEM en un point (x, y) sur la courbe elliptique.
+    La désérialisation convertit les données en un point (x, y) sur la courbe elliptique.
     """
-    return serialization.load_pem_public_key(pem_data)
+    return ecdhe_keys.deserialize_public_key(data, encoding)
 
 def derive_shared_key(private_key, peer_public_key):
     """
@@ -59,7 +67,7 @@ def derive_shared_key(private_key, peer_public_key):
     est S = d_C * Q_S = d_S * Q_C, qui est un point sur la courbe elliptique. Le KDF (HKDF ici) est utilisé pour 
     dériver une clé symétrique à partir de ce point partagé.
     """
-    shared_key = private_key.exchange(ec.ECDH(), peer_public_key)
+    shared_key = ecdhe_keys.exchange(private_key, peer_public_key)
     return HKDF(
         algorithm=hashes.SHA256(),
         length=32,
@@ -67,107 +75,256 @@ def derive_shared_key(private_key, peer_public_key):
         info=b'handshake data'
     ).derive(shared_key)
 
-def start_user_authentication(username, password):
-    usr = srp.User(username, password)
+def start_user_authentication(username, password, **options):
+    usr = srp.User(username, password, **options)
     uname, A = usr.start_authentication()
-    A_encoded = base64.b64encode(A).decode('utf-8')
-    return usr, uname, A_encoded
+    return usr, uname, A
 
-def process_server_challenge(usr, s_encoded, B_encoded):
-    s = base64.b64decode(s_encoded)
-    B = base64.b64decode(B_encoded)
-    M = usr.process_challenge(s, B)
-    M_encoded = base64.b64encode(M).decode('utf-8')
-    return M_encoded
+def process_server_challenge(usr, s, B):
+    return usr.process_challenge(bytes(s), bytes(B))
 
-def verify_session_on_client(usr, hamk_encoded):
-    hamk = base64.b64decode(hamk_encoded)
-    usr.verify_session(hamk)
+def verify_session_on_client(usr, hamk):
+    usr.verify_session(bytes(hamk))
 
 def send_to_server(conn, data):
-    conn.sendall(json.dumps(data).encode('utf-8'))
+    send_message(conn, data)
 
-def receive_from_server(conn):
-    data = conn.recv(4096)
-    return json.loads(data.decode('utf-8'))
+def receive_from_server(reader):
+    return reader.receive_message()
 
-def main():
-    username = 'testuser'
-    password = 'testpassword'
+def exchange_with_cookie(conn, reader, message):
+    """
+    Envoie un message et reçoit la réponse ; si le serveur exige un cookie de pré-authentification, le message est
+    renvoyé avec ce cookie et la solution de son puzzle.
+    :return: La réponse du serveur
+    """
+    send_to_server(conn, message)
+    server_data = receive_from_server(reader)
+    if 'cookie' in server_data:
+        print("Server requested a pre-authentication cookie, sending the message again...")
+        send_to_server(conn, with_cookie(message, server_data['cookie']))
+        server_data = receive_from_server(reader)
+    return server_data
+
+def exchange_first_message(conn, reader, first_message, encodings):
+    """
+    Envoie le premier message, accompagné d'une clé publique ECDHE dans l'encodage préféré, et reçoit la réponse.
+    Si le serveur retient un autre encodage proposé, le message est renvoyé avec une nouvelle clé dans cet encodage.
+    :param first_message: Champs du premier message, hors clé publique
+    :param encodings: Encodages proposés, par ordre de préférence
+    :return: (encodage, clé privée, clé publique sérialisée, réponse du serveur)
+    """
+    encoding = encodings[0]
+    message = dict(first_message, key_encoding=','.join(encodings))
+    while True:
+        print(f"Generating client key pair ({encoding})...")
+        client_private_key, client_public_key = generate_key_pair(encoding)
+        serialized_client_public_key = serialize_public_key(client_public_key, encoding)
+        server_data = exchange_with_cookie(conn, reader, dict(message, client_public_key=serialized_client_public_key))
+        if server_data.get('server_public_key') is not None:
+            return encoding, client_private_key, serialized_client_public_key, server_data
+        # Le serveur a retenu un autre encodage proposé (une seule fois)
+        chosen = server_data.get('key_encoding')
+        if chosen not in encodings or chosen == encoding:
+            raise AuthenticationFailed()
+        print(f"Server chose {chosen}, sending a new client public key...")
+        encoding = chosen
 
-    conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    conn.connect(('169.254.36.137', 8080))
+def classic_handshake(conn, reader, username, password, encodings, options):
+    """
+    Poignée de main historique : ECDHE, comparaison des clés partagées, puis les trois messages SRP.
+    Les clés partagées circulent en clair pour être comparées : la clé renvoyée les lie à la clé SRP K, que seuls
+    le client et le serveur connaissent.
+    :return: La clé de session liant SRP et ECDHE
+    """
+    # Phase ECDHE
+    print("Sending client public key and supported encodings to server...")
+    encoding, client_private_key, client_public_key, server_data = exchange_first_message(conn, reader, {}, encodings)
+    server_public_key = bytes(server_data['server_public_key'])
+    peer_server_public_key = deserialize_public_key(server_public_key, encoding)
+    print(f"Server public key received ({encoding}, {len(server_data['server_public_key'])} bytes).")
 
-    try:
-        # Phase ECDHE
-        print("Generating client key pair...")
-        client_private_key, client_public_key = generate_key_pair()
-        serialized_client_public_key = serialize_public_key(client_public_key)
+    print("Deriving shared key on client...")
+    shared_key_client = derive_shared_key(client_private_key, peer_server_public_key)
 
-        print("Sending client public key to server...")
-        send_to_server(conn, {'client_public_key': serialized_client_public_key.decode('utf-8')})
+    print("Sending client shared key to server for verification...")
+    send_to_server(conn, {'shared_key_client': shared_key_client})
 
-        print("Receiving server public key...")
-        server_data = receive_from_server(conn)
-        server_public_key_pem = server_data['server_public_key']
-        peer_server_public_key = deserialize_public_key(server_public_key_pem.encode('utf-8'))
+    print("Receiving server shared key for verification...")
+    server_data = receive_from_server(reader)
+    shared_key_server = server_data.get('shared_key_server')
 
-        print("Deriving shared key on client...")
-        shared_key_client = derive_shared_key(client_private_key, peer_server_public_key)
-        serialized_shared_key_client = base64.b64encode(shared_key_client).decode('utf-8')
+    if shared_key_server is None or not hmac.compare_digest(shared_key_client, shared_key_server):
+        print("Shared keys do not match!")
+        raise AuthenticationFailed()
+    print("Shared keys match. ECDHE verification completed.")
 
-        print("Sending client shared key to server for verification...")
-        send_to_server(conn, {'shared_key_client': serialized_shared_key_client})
+    # Phase SRP
+    print("Starting user authentication...")
+    usr, uname, A = start_user_authentication(username, password, **options)
+    print(f"User authentication started. Username: {uname}, A: {A.hex()}")
 
-        print("Receiving server shared key for verification...")
-        server_data = receive_from_server(conn)
-        serialized_shared_key_server = server_data['shared_key_server']
+    print("Sending username and A to server...")
+    send_to_server(conn, {'username': uname, 'A': A})
 
-        assert serialized_shared_key_client == serialized_shared_key_server, "Shared keys do not match!"
-        print("Shared keys match. ECDHE verification completed.")
+    print("Receiving challenge from server...")
+    server_data = receive_from_server(reader)
+    s = server_data.get('s')
+    B = server_data.get('B')
 
-        # Phase SRP
-        print("Starting user authentication...")
-        usr, uname, A_encoded = start_user_authentication(username, password)
-        print(f"User authentication started. Username: {uname}, A: {A_encoded}")
+    if s is None or B is None:
+        raise AuthenticationFailed()
+    s, B = bytes(s), bytes(B)
 
-        print("Sending username and A to server...")
-        send_to_server(conn, {'username': uname, 'A': A_encoded})
+    print("Processing server challenge...")
+    M = process_server_challenge(usr, s, B)
 
-        print("Receiving challenge from server...")
-        server_data = receive_from_server(conn)
-        s_encoded = server_data['s']
-        B_encoded = server_data['B']
+    if M is None:
+        raise AuthenticationFailed()
+    print(f"Challenge processed. M: {M.hex()}")
 
-        if s_encoded is None or B_encoded is None:
-            raise AuthenticationFailed()
+    print("Sending M to server...")
+    send_to_server(conn, {'M': M})
 
-        print("Processing server challenge...")
-        M_encoded = process_server_challenge(usr, s_encoded, B_encoded)
-        print(f"Challenge processed. M: {M_encoded}")
+    print("Receiving HAMK from server...")
+    server_data = receive_from_server(reader)
+    HAMK = server_data.get('HAMK')
 
-        if M_encoded is None:
-            raise AuthenticationFailed()
+    if HAMK is None:
+        raise AuthenticationFailed()
 
-        print("Sending M to server...")
-        send_to_server(conn, {'M': M_encoded})
+    print("Verifying session on client...")
+    verify_session_on_client(usr, HAMK)
+    print("Session verified on client.")
 
-        print("Receiving HAMK from server...")
-        server_data = receive_from_server(conn)
-        HAMK_encoded = server_data['HAMK']
+    if not usr.authenticated():
+        raise AuthenticationFailed()
+    transcript = ecdhe_keys.transcript_hash(uname, A, s, B, encoding, client_public_key, server_public_key)
+    return ecdhe_keys.bind_session_key(usr.get_session_key(), shared_key_client, transcript)
 
-        if HAMK_encoded is None:
-            raise AuthenticationFailed()
+def pipelined_handshake(conn, reader, username, password, encodings, options):
+    """
+    Poignée de main en deux allers-retours : la clé publique ECDHE accompagne A, et le secret ECDHE est lié à la
+    clé de session SRP ; les preuves échangées avec M et HAMK remplacent la comparaison des clés partagées.
+    :return: La clé de session liant SRP et ECDHE
+    """
+    usr, uname, A = start_user_authentication(username, password, **options)
+    print("Sending username, A and client public key to server...")
+    encoding, client_private_key, client_public_key, server_data = exchange_first_message(
+        conn, reader, {'username': uname, 'A': A}, encodings)
+    s = server_data.get('s')
+    B = server_data.get('B')
+    if s is None or B is None:
+        raise AuthenticationFailed()
+    s, B, server_public_key = bytes(s), bytes(B), bytes(server_data['server_public_key'])
+    print(f"Challenge and server public key received ({encoding}, {len(server_public_key)} bytes).")
+
+    M = process_server_challenge(usr, s, B)
+    if M is None:
+        raise AuthenticationFailed()
+    transcript = ecdhe_keys.transcript_hash(uname, A, s, B, encoding, client_public_key, server_public_key)
+    ecdhe_key = derive_shared_key(client_private_key, deserialize_public_key(server_public_key, encoding))
+    # K est calculé par process_challenge ; get_session_key() ne le renvoie qu'après vérification de HAMK
+    session_key = ecdhe_keys.bind_session_key(usr.K, ecdhe_key, transcript)
+    print("Sending M and client proof to server...")
+    send_to_server(conn, {'M': M, 'client_proof': ecdhe_keys.handshake_proof(session_key, 'client')})
+
+    server_data = receive_from_server(reader)
+    HAMK = server_data.get('HAMK')
+    server_proof = server_data.get('server_proof')
+    if HAMK is None or server_proof is None:
+        raise AuthenticationFailed()
+    verify_session_on_client(usr, HAMK)
+    if not usr.authenticated():
+        raise AuthenticationFailed()
+    if not hmac.compare_digest(server_proof, ecdhe_keys.handshake_proof(session_key, 'server')):
+        raise AuthenticationFailed()
+    print("Session and ECDHE key confirmed.")
+    return session_key
+
+def resume_session(conn, reader, ticket, secret):
+    """
+    Reprise de session en un aller-retour, sans ECDHE ni SRP.
+    :param ticket: Ticket obtenu lors de la session précédente
+    :param secret: Secret de reprise associé
+    :return: La clé de la session reprise, ou None si le serveur refuse le ticket (poignée de main complète à suivre)
+    """
+    client_nonce = os.urandom(NONCE_SIZE)
+    print("Sending session ticket to server...")
+    server_data = exchange_with_cookie(conn, reader, {'ticket': ticket, 'client_nonce': client_nonce,
+                                                     'client_proof': resumption_client_proof(secret, ticket,
+                                                                                             client_nonce)})
+    server_nonce = server_data.get('server_nonce')
+    server_proof = server_data.get('server_proof')
+    if server_nonce is None or server_proof is None:
+        print("Ticket refused, falling back to a full handshake.")
+        return None
+    session_key = resumed_session_key(secret, client_nonce, bytes(server_nonce))
+    if not hmac.compare_digest(server_proof, ecdhe_keys.handshake_proof(session_key, 'server')):
+        raise AuthenticationFailed()
+    print("Session resumed.")
+    return session_key
+
+def load_ticket(path):
+    """
+    :return: (ticket, secret de reprise) enregistrés, ou None
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        state = json.load(file)
+    return bytes.fromhex(state['ticket']), bytes.fromhex(state['secret'])
 
-        print("Verifying session on client...")
-        verify_session_on_client(usr, HAMK_encoded)
-        print("Session verified on client.")
+def save_ticket(path, session_key):
+    """
+    Enregistre le ticket de la session établie (le serveur en dérive le même de son côté).
+    """
+    ticket, secret = derive_ticket(session_key)
+    with open(path, 'w') as file:
+        json.dump({'ticket': ticket.hex(), 'secret': secret.hex()}, file)
+
+HANDSHAKES = {'pipeline': pipelined_handshake, 'classique': classic_handshake}
+
+def main():
+    parser = argparse.ArgumentParser(description="Client SRP + ECDHE")
+    parser.add_argument('--encodages', nargs='+', choices=ENCODINGS, default=list(ENCODINGS),
+                        help="Encodages de clé publique ECDHE proposés, par ordre de préférence")
+    parser.add_argument('--mode', choices=HANDSHAKES, default='pipeline',
+                        help="pipeline : 2 allers-retours ; classique : protocole historique")
+    parser.add_argument('--ticket', help="Fichier du ticket de reprise de session (lu puis renouvelé)")
+    parser.add_argument('--chiffrement', choices=CIPHERS, default=DEFAULT_CIPHER,
+                        help="Algorithme AEAD du canal de données ouvert après l'authentification")
+    parser.add_argument('--message', default="Hello, server!", help="Message envoyé sur le canal chiffré")
+    add_group_arguments(parser)
+    args = parser.parse_args()
+    options = library_options(args.groupe, args.hachage)
 
+    username = 'testuser'
+    password = 'testpassword'
+
+    conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    conn.connect(('169.254.36.137', 8080))
+    reader = FrameReader(conn)
+
+    try:
+        saved = load_ticket(args.ticket) if args.ticket else None
+        session_key = resume_session(conn, reader, *saved) if saved else None
+        resumable = True
+        if session_key is None:
+            session_key = HANDSHAKES[args.mode](conn, reader, username, password, args.encodages, options)
+            # Le serveur n'émet pas de ticket après la poignée de main historique
+            resumable = args.mode == 'pipeline'
+        if args.ticket and resumable:
+            save_ticket(args.ticket, session_key)
+        elif saved:
+            os.remove(args.ticket)  # Ticket consommé ou refusé, sans successeur
         print("Authentication process completed.")
-        if usr.authenticated():
-            print("Client is authenticated.")
-        else:
-            raise AuthenticationFailed()
+        print("Client is authenticated.")
+
+        channel = open_channel(conn, reader, session_key, args.chiffrement)
+        print(f"Sending message over the {args.chiffrement} data channel...")
+        channel.send(args.message.encode('utf-8'))
+        print(f"Server echoed: {channel.receive_record().decode('utf-8')}")
     finally:
         conn.close()
 
@@ -1,21 +1,38 @@
+import argparse
+import functools
+import hmac
+import os
 import srp
 import socket
-import json
-import base64
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import serialization, hashes
+import sys
+import time
+from cryptography.exceptions import UnsupportedAlgorithm
+from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+import ecdhe_keys  # noqa: E402
+from ecdhe_keys import DEFAULT_ENCODING, ENCODINGS  # noqa: E402
+from ephemeral_pool import EphemeralPool  # noqa: E402
+from framing import FrameReader, FramingError, send_message  # noqa: E402
+from preauth import add_preauth_arguments, message_digest, preauth_from_arguments  # noqa: E402
+from record_channel import CIPHERS, accept_channel  # noqa: E402
+from session_cache import NONCE_SIZE, SessionCache, resumed_session_key  # noqa: E402
+from srp_groups import add_group_arguments, library_options  # noqa: E402
+from verifier_store import VerifierStore  # noqa: E402
+
+CONNECTION_TIMEOUT = 10.0  # Délai maximal (s) d'attente d'un message du client
+
 class AuthenticationFailed(Exception):
     """Exception levée en cas d'échec de l'authentification."""
     pass
 
 # Utilitaires pour ECDHE
-def generate_key_pair():
+def generate_key_pair(encoding=DEFAULT_ENCODING):
     """
     Génère une paire de clés (privée et publique) ECDHE.
 
-    Courbe elliptique utilisée : SECP256R1 (alias P-256)
+    Courbe elliptique utilisée : SECP256R1 (alias P-256), ou Curve25519 avec l'encodage x25519
     - Cette courbe est définie par l'équation : y^2 = x^3 + ax + b mod p
     - Paramètres de la courbe SECP256R1 :
       - p (le module) : un grand nombre premier
@@ -26,29 +43,30 @@ def generate_key_pair():
     La clé privée est un entier aléatoire d (0 < d < n). La clé publique est un point Q = d * G,
     où la multiplication est la multiplication scalaire sur la courbe elliptique.
     """
-    private_key = ec.generate_private_key(ec.SECP256R1())  # d (clé privée)
-    public_key = private_key.public_key()  # Q = d * G (clé publique)
-    return private_key, public_key
+    return ecdhe_keys.generate_key_pair(encoding)  # (d, Q = d * G)
 
-def serialize_public_key(public_key):
+def serialize_public_key(public_key, encoding=DEFAULT_ENCODING):
     """
-    Sérialise une clé publique en format PEM.
+    Sérialise une clé publique dans l'encodage négocié.
 
     La clé publique est un point sur la courbe elliptique, souvent représenté en coordonnées (x, y).
-    La sérialisation convertit ce point en un format standardisé pour échange.
+    - pem : SubjectPublicKeyInfo (178 octets), format historique
+    - compressed : point compressé X9.62, x et la parité de y (33 octets), y se déduit de l'équation de la courbe
+    - x25519 : coordonnée u brute sur Curve25519 (32 octets)
     """
-    return public_key.public_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo
-    )
+    return ecdhe_keys.serialize_public_key(public_key, encoding)
 
-def deserialize_public_key(pem_data):
+def deserialize_public_key(data, encoding=DEFAULT_ENCODING):
     """
-    Désérialise une clé publique à partir du format PEM.
+    Désérialise une clé publique encodée selon l'encodage négocié.
 
-    La désérialisation convertit les données PEM en un point (x, y) sur la courbe elliptique.
+    La désérialisation convertit les données en un point (x, y) sur la courbe elliptique.
+    Une clé malformée, hors de la courbe ou d'un autre algorithme fait échouer l'authentification.
     """
-    return serialization.load_pem_public_key(pem_data)
+    try:
+        return ecdhe_keys.deserialize_public_key(data, encoding)
+    except (ValueError, UnsupportedAlgorithm):
+        raise AuthenticationFailed() from None
 
 def derive_shared_key(private_key, peer_public_key):
     """
@@ -59,7 +77,7 @@ def derive_shared_key(private_key, peer_public_key):
     est S = d_C * Q_S = d_S * Q_C, qui est un point sur la courbe elliptique. Le KDF (HKDF ici) est utilisé pour 
     dériver une clé symétrique à partir de ce point partagé.
     """
-    shared_key = private_key.exchange(ec.ECDH(), peer_public_key)
+    shared_key = ecdhe_keys.exchange(private_key, peer_public_key)
     return HKDF(
         algorithm=hashes.SHA256(),
         length=32,
@@ -67,112 +85,336 @@ def derive_shared_key(private_key, peer_public_key):
         info=b'handshake data'
     ).derive(shared_key)
 
-def create_salted_verification_key(username, password):
-    salt, vkey = srp.create_salted_verification_key(username, password)
-    salt_encoded = base64.b64encode(salt).decode('utf-8')
-    return salt_encoded, vkey
+def create_salted_verification_key(username, password, **options):
+    salt, vkey = srp.create_salted_verification_key(username, password, **options)
+    return salt, vkey
 
-def create_server_verifier(username, salt_encoded, vkey, A_encoded):
-    salt = base64.b64decode(salt_encoded)
-    A = base64.b64decode(A_encoded)
-    svr = srp.Verifier(username, salt, vkey, A)
+def create_server_verifier(username, salt, vkey, A, **options):
+    svr = srp.Verifier(username, salt, vkey, bytes(A), **options)
     s, B = svr.get_challenge()
-    s_encoded = base64.b64encode(s).decode('utf-8')
-    B_encoded = base64.b64encode(B).decode('utf-8')
-    return svr, s_encoded, B_encoded
+    return svr, s, B
 
-def verify_session_on_server(svr, M_encoded):
-    M = base64.b64decode(M_encoded)
-    HAMK = svr.verify_session(M)
-    HAMK_encoded = base64.b64encode(HAMK).decode('utf-8')
-    return HAMK_encoded
+def verify_session_on_server(svr, M):
+    return svr.verify_session(bytes(M))
 
 def send_to_client(conn, data):
-    conn.sendall(json.dumps(data).encode('utf-8'))
+    send_message(conn, data)
 
-def receive_from_client(conn):
-    data = conn.recv(4096)
-    return json.loads(data.decode('utf-8'))
+def receive_from_client(reader):
+    return reader.receive_message()
 
-def main():
-    username = 'testuser'
-    password = 'testpassword'
+def open_verifier_store(path, **options):
+    """
+    Ouvre la base des vérificateurs ; sans fichier, une base temporaire ne contient que l'utilisateur d'exemple.
+    """
+    store = VerifierStore(path or ':memory:')
+    if path is None:
+        username = 'testuser'
+        password = 'testpassword'
 
-    #print("Creating salted verification key...")
-    salt_encoded, vkey = create_salted_verification_key(username, password)
-    #print("Salt and verification key created.")
+        #print("Creating salted verification key...")
+        store.add(username, *create_salted_verification_key(username, password, **options))
+        #print("Salt and verification key created.")
+    return store
 
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.bind(('0.0.0.0', 8080))
-        s.listen()
-        #print("Server is listening on port 8080...")
-        conn, addr = s.accept()
+def negotiate_encoding(conn, reader, client_data, accepted):
+    """
+    Négociation de l'encodage : le premier encodage annoncé par le client et accepté par le serveur.
+    La clé du client est jointe dans son encodage préféré ; s'il n'est pas retenu, le client renvoie son message.
+    :return: L'encodage retenu et le message du client contenant une clé dans cet encodage
+    """
+    offer = ecdhe_keys.parse_offer(client_data.get('key_encoding'))
+    encoding = ecdhe_keys.choose_encoding(offer, accepted)
+    if encoding is None:
+        send_to_client(conn, {})
+        raise AuthenticationFailed()
+    if encoding != offer[0]:
+        send_to_client(conn, {'key_encoding': encoding})
+        client_data = receive_from_client(reader)
+    return encoding, client_data
+
+def classic_handshake(conn, reader, client_data, store, key_pools, options):
+    """
+    Poignée de main historique : ECDHE, comparaison des clés partagées, puis les trois messages SRP.
+    Les clés partagées circulent en clair pour être comparées : la clé renvoyée les lie à la clé SRP K, que seuls
+    le client et le serveur connaissent.
+    :return: La clé de session liant SRP et ECDHE
+    """
+    # Phase ECDHE
+    encoding, client_data = negotiate_encoding(conn, reader, client_data, key_pools)
+    client_public_key = client_data.get('client_public_key')
+    if client_public_key is None:
+        send_to_client(conn, {})
+        raise AuthenticationFailed()
+    client_public_key = bytes(client_public_key)
+    peer_client_public_key = deserialize_public_key(client_public_key, encoding)
+
+    #print("Taking server key pair from the pool...")
+    server_private_key, server_public_key = key_pools[encoding].take()
+    serialized_server_public_key = serialize_public_key(server_public_key, encoding)
+
+    #print("Deriving shared key on server...")
+    shared_key_server = derive_shared_key(server_private_key, peer_client_public_key)
+
+    #print("Sending server public key to client...")
+    send_to_client(conn, {'server_public_key': serialized_server_public_key, 'key_encoding': encoding})
+
+    #print("Receiving client shared key for verification...")
+    client_data = receive_from_client(reader)
+    shared_key_client = client_data.get('shared_key_client')
+
+    #print("Sending server shared key to client for verification...")
+    send_to_client(conn, {'shared_key_server': shared_key_server})
+
+    if shared_key_client is None or not hmac.compare_digest(shared_key_client, shared_key_server):
+        raise AuthenticationFailed()
+    #print("Shared keys match. ECDHE verification completed.")
+
+    # Phase SRP
+    #print("Receiving data from client...")
+    client_data = receive_from_client(reader)
+    uname = client_data.get('username')
+    A = client_data.get('A')
+    if uname is None or A is None:
+        send_to_client(conn, {})
+        raise AuthenticationFailed()
+    A = bytes(A)
+
+    # Un utilisateur inconnu reçoit un challenge leurre et échoue à la vérification de M
+    salt, vkey, known = store.lookup(uname)
+
+    #print("Creating server verifier...")
+    svr, s, B = create_server_verifier(uname, salt, vkey, A, **options)
+    #print(f"Server verifier created. Salt: {s.hex()}, B: {B.hex()}")
+
+    if s is None or B is None:
+        raise AuthenticationFailed()
+
+    #print("Sending challenge to client...")
+    send_to_client(conn, {'s': s, 'B': B})
+
+    #print("Receiving M from client...")
+    client_data = receive_from_client(reader)
+    M = client_data.get('M')
+
+    if M is None:
+        raise AuthenticationFailed()
+
+    #print("Verifying session on server...")
+    HAMK = verify_session_on_server(svr, M)
+    #print(f"Session verified on server. HAMK: {HAMK.hex()}")
+
+    #print("Sending HAMK to client...")
+    send_to_client(conn, {'HAMK': HAMK})
+
+    #print("Authentication process completed.")
+    if not known or not svr.authenticated():
+        raise AuthenticationFailed()
+    transcript = ecdhe_keys.transcript_hash(uname, A, s, B, encoding, client_public_key, serialized_server_public_key)
+    return ecdhe_keys.bind_session_key(svr.get_session_key(), shared_key_server, transcript)
+
+def pipelined_handshake(conn, reader, client_data, store, key_pools, options):
+    """
+    Poignée de main en deux allers-retours : les clés publiques ECDHE accompagnent A et B, et le secret ECDHE est
+    lié à la clé de session SRP au lieu d'être échangé en clair.
+    1. client -> username, A, clé publique ECDHE ; serveur -> s, B, clé publique ECDHE
+    2. client -> M, preuve client ; serveur -> HAMK, preuve serveur
+    :return: La clé de session liant SRP et ECDHE
+    """
+    encoding, client_data = negotiate_encoding(conn, reader, client_data, key_pools)
+    uname = client_data.get('username')
+    A = client_data.get('A')
+    client_public_key = client_data.get('client_public_key')
+    if uname is None or A is None or client_public_key is None:
+        send_to_client(conn, {})
+        raise AuthenticationFailed()
+    # Un utilisateur inconnu reçoit un challenge leurre et échoue à la vérification de M
+    salt, vkey, known = store.lookup(uname)
+    A, client_public_key = bytes(A), bytes(client_public_key)
+    peer_client_public_key = deserialize_public_key(client_public_key, encoding)
+
+    server_private_key, server_public_key = key_pools[encoding].take()
+    serialized_server_public_key = serialize_public_key(server_public_key, encoding)
+    svr, s, B = create_server_verifier(uname, salt, vkey, A, **options)
+    if s is None or B is None:
+        send_to_client(conn, {})
+        raise AuthenticationFailed()
+    send_to_client(conn, {'s': s, 'B': B, 'server_public_key': serialized_server_public_key, 'key_encoding': encoding})
+
+    client_data = receive_from_client(reader)
+    M = client_data.get('M')
+    client_proof = client_data.get('client_proof')
+    HAMK = verify_session_on_server(svr, M) if M is not None else None
+    if not known or HAMK is None or client_proof is None:
+        send_to_client(conn, {})
+        raise AuthenticationFailed()
+
+    # Le client ne prouve la possession de la clé de session que s'il partage à la fois K et le secret ECDHE
+    transcript = ecdhe_keys.transcript_hash(uname, A, s, B, encoding, client_public_key, serialized_server_public_key)
+    ecdhe_key = derive_shared_key(server_private_key, peer_client_public_key)
+    session_key = ecdhe_keys.bind_session_key(svr.get_session_key(), ecdhe_key, transcript)
+    if not hmac.compare_digest(client_proof, ecdhe_keys.handshake_proof(session_key, 'client')):
+        send_to_client(conn, {})
+        raise AuthenticationFailed()
+    send_to_client(conn, {'HAMK': HAMK, 'server_proof': ecdhe_keys.handshake_proof(session_key, 'server')})
+    return session_key
+
+def resume_session(conn, client_data, sessions):
+    """
+    Reprise de session en un aller-retour symétrique : le client présente son ticket, un nonce et la preuve qu'il
+    détient le secret de reprise ; le serveur répond par son nonce et sa preuve sur la nouvelle clé de session.
+    :return: (clé de la session reprise, coût de la poignée de main complète), ou None si le ticket est refusé
+    """
+    ticket = client_data.get('ticket')
+    client_nonce = client_data.get('client_nonce')
+    client_proof = client_data.get('client_proof')
+    entry = None
+    if sessions is not None and client_nonce is not None and client_proof is not None:
+        entry = sessions.take(bytes(ticket), bytes(client_nonce), bytes(client_proof))
+    if entry is not None:
+        secret, handshake_cost = entry
+        server_nonce = os.urandom(NONCE_SIZE)
+        session_key = resumed_session_key(secret, bytes(client_nonce), server_nonce)
+        send_to_client(conn, {'server_nonce': server_nonce,
+                              'server_proof': ecdhe_keys.handshake_proof(session_key, 'server')})
+        return session_key, handshake_cost
+    send_to_client(conn, {})
+    return None
+
+def require_cookie(conn, reader, client_data, source, cookies):
+    """
+    Pré-authentification sans état : un premier message sans cookie reçoit un cookie en réponse et doit être renvoyé
+    avec lui (et la solution du puzzle). Rien de coûteux n'est calculé ni conservé avant cette vérification.
+    :param source: Adresse du client
+    :param cookies: CookieIssuer
+    :return: Le premier message, accompagné d'un cookie valide
+    """
+    if 'cookie' not in client_data:
+        send_to_client(conn, {'cookie': cookies.issue(source)})
+        client_data = receive_from_client(reader)
+    if not cookies.check(source, client_data.get('cookie'), client_data.get('puzzle_solution'),
+                         message_digest(client_data)):
+        raise AuthenticationFailed()
+    return client_data
+
+def serve_connection(conn, store, key_pools, options, sessions=None, reader=None, source='', cookies=None):
+    """
+    Authentifie un client ; le mode de poignée de main se déduit de son premier message (ticket présent : reprise,
+    A présent : pipeliné). Les sessions reprises ou établies en mode pipeliné sont enregistrées dans le cache de
+    reprise ; pas celles du mode historique, dont la clé ECDHE circule en clair et donnerait le ticket à un écouteur.
+    :param reader: FrameReader de la connexion, à fournir pour poursuivre ensuite sur la même socket
+    :param source: Adresse du client, à laquelle les cookies sont liés
+    :param cookies: CookieIssuer exigeant un cookie avant la poignée de main, ou None
+    :return: La clé établie avec le client
+    """
+    reader = reader or FrameReader(conn)
+    #print("Receiving first client message...")
+    client_data = receive_from_client(reader)
+    if cookies is not None:
+        client_data = require_cookie(conn, reader, client_data, source, cookies)
+    start_time = time.thread_time()
+    if 'ticket' in client_data:
+        resumed = resume_session(conn, client_data, sessions)
+        if resumed is not None:
+            session_key, handshake_cost = resumed
+            sessions.credit(handshake_cost - (time.thread_time() - start_time))
+            sessions.store(session_key, handshake_cost)
+            return session_key
+        # Ticket refusé : le client enchaîne sur une poignée de main complète
+        client_data = receive_from_client(reader)
+        start_time = time.thread_time()
+    if 'A' not in client_data:
+        return classic_handshake(conn, reader, client_data, store, key_pools, options)
+    session_key = pipelined_handshake(conn, reader, client_data, store, key_pools, options)
+    if sessions is not None:
+        sessions.store(session_key, time.thread_time() - start_time)
+    return session_key
+
+def echo_records(channel):
+    """
+    Service de démonstration du canal chiffré : renvoie chaque enregistrement reçu jusqu'à la fermeture par le client.
+    :return: Nombre d'octets renvoyés
+    """
+    echoed = 0
+    while (data := channel.receive_record()) is not None:
+        channel.send_record(data)
+        echoed += len(data)
+    return echoed
+
+def serve(listener, store, key_pools, options, sessions, ciphers, connections=0, cookies=None, limiter=None,
+          timeout=CONNECTION_TIMEOUT):
+    """
+    Sert les connexions une à une. Une source qui dépasse son débit est déconnectée dès l'acceptation, sans lecture.
+    :param listener: Socket d'écoute
+    :param ciphers: Algorithmes AEAD acceptés pour le canal de données
+    :param connections: Nombre de connexions à servir, hors connexions refusées par le limiteur (0 : sans limite)
+    :param limiter: TokenBucket par adresse source, ou None
+    :param timeout: Délai maximal (s) d'attente d'un message du client
+    """
+    served = 0
+    while not connections or served < connections:
+        conn, addr = listener.accept()
         with conn:
+            if limiter is not None and not limiter.allow(addr[0]):
+                continue
+            served += 1
+            conn.settimeout(timeout)
             #print(f"Connected by {addr}")
+            reader = FrameReader(conn)
+            try:
+                session_key = serve_connection(conn, store, key_pools, options, sessions, reader, addr[0], cookies)
+                #print("Server is authenticated.")
+            except (AuthenticationFailed, ConnectionError, FramingError, TimeoutError) as error:
+                print(f"Authentication failed for {addr}: {type(error).__name__}")
+                continue
+            try:
+                echo_records(accept_channel(conn, reader, session_key, ciphers))
+            except (ConnectionError, FramingError, TimeoutError) as error:
+                print(f"Data channel closed for {addr}: {type(error).__name__}")
 
-            # Phase ECDHE
-            #print("Receiving client public key...")
-            client_data = receive_from_client(conn)
-            client_public_key_pem = client_data['client_public_key']
-            peer_client_public_key = deserialize_public_key(client_public_key_pem.encode('utf-8'))
-
-            #print("Generating server key pair...")
-            server_private_key, server_public_key = generate_key_pair()
-            serialized_server_public_key = serialize_public_key(server_public_key)
-
-            #print("Deriving shared key on server...")
-            shared_key_server = derive_shared_key(server_private_key, peer_client_public_key)
-            serialized_shared_key_server = base64.b64encode(shared_key_server).decode('utf-8')
-
-            #print("Sending server public key to client...")
-            send_to_client(conn, {'server_public_key': serialized_server_public_key.decode('utf-8')})
-
-            #print("Receiving client shared key for verification...")
-            client_data = receive_from_client(conn)
-            serialized_shared_key_client = client_data['shared_key_client']
-
-            #print("Sending server shared key to client for verification...")
-            send_to_client(conn, {'shared_key_server': serialized_shared_key_server})
-
-            assert serialized_shared_key_client == serialized_shared_key_server, "Shared keys do not match!"
-            #print("Shared keys match. ECDHE verification completed.")
-
-            # Phase SRP
-            #print("Receiving data from client...")
-            client_data = receive_from_client(conn)
-            uname = client_data['username']
-            A_encoded = client_data['A']
-
-            #print("Creating server verifier...")
-            svr, s_encoded, B_encoded = create_server_verifier(uname, salt_encoded, vkey, A_encoded)
-            #print(f"Server verifier created. Salt: {s_encoded}, B: {B_encoded}")
-
-            if s_encoded is None or B_encoded is None:
-                raise AuthenticationFailed()
-
-            #print("Sending challenge to client...")
-            send_to_client(conn, {'s': s_encoded, 'B': B_encoded})
-
-            #print("Receiving M from client...")
-            client_data = receive_from_client(conn)
-            M_encoded = client_data['M']
-
-            if M_encoded is None:
-                raise AuthenticationFailed()
-
-            #print("Verifying session on server...")
-            HAMK_encoded = verify_session_on_server(svr, M_encoded)
-            #print(f"Session verified on server. HAMK: {HAMK_encoded}")
-
-            #print("Sending HAMK to client...")
-            send_to_client(conn, {'HAMK': HAMK_encoded})
+def main():
+    parser = argparse.ArgumentParser(description="Serveur SRP + ECDHE")
+    parser.add_argument('--base', help="Base SQLite des vérificateurs (par défaut, l'utilisateur d'exemple seul)")
+    parser.add_argument('--reserve', type=int, default=16, help="Nombre de paires de clés ECDHE précalculées")
+    parser.add_argument('--encodages', nargs='+', choices=ENCODINGS, default=list(ENCODINGS),
+                        help="Encodages de clé publique ECDHE acceptés")
+    parser.add_argument('--connexions', type=int, default=1, help="Nombre de connexions à servir (0 : sans limite)")
+    parser.add_argument('--sessions', type=int, default=10000, help="Nombre maximal de sessions reprenables")
+    parser.add_argument('--ttl', type=float, default=3600.0, help="Durée de validité (s) d'un ticket de reprise")
+    parser.add_argument('--chiffrements', nargs='+', choices=CIPHERS, default=list(CIPHERS),
+                        help="Algorithmes AEAD acceptés pour le canal de données")
+    add_group_arguments(parser)
+    add_preauth_arguments(parser)
+    args = parser.parse_args()
+    options = library_options(args.groupe, args.hachage)
+    store = open_verifier_store(args.base, **options)
+
+    # Les paires de clés ECDHE, indépendantes du client, sont précalculées en attendant les connexions
+    key_pools = {encoding: EphemeralPool(functools.partial(generate_key_pair, encoding), args.reserve)
+                 for encoding in args.encodages}
+
+    sessions = SessionCache(args.sessions, args.ttl)
+    cookies, limiter = preauth_from_arguments(args)
 
-            #print("Authentication process completed.")
-            if svr.authenticated():
-                #print("Server is authenticated.")
-                pass
-            else:
-                raise AuthenticationFailed()
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('0.0.0.0', 8080))
+        s.listen()
+        #print("Server is listening on port 8080...")
+        try:
+            serve(s, store, key_pools, options, sessions, args.chiffrements, args.connexions, cookies, limiter)
+        except KeyboardInterrupt:
+            pass
+        metrics = sessions.metrics()
+        print(f"Resumptions: {metrics['hits']} hits, {metrics['misses']} misses ({metrics['hit_rate']:.0%}), "
+              f"{metrics['cpu_saved'] * 1000:.1f} ms handshake CPU saved")
+        if cookies is not None:
+            metrics = cookies.metrics()
+            print(f"Cookies: {metrics['issued']} issued, {metrics['accepted']} accepted, {metrics['rejected']} rejected "
+                  f"({metrics['replayed']} replayed)")
+        if limiter is not None:
+            metrics = limiter.metrics()
+            print(f"Rate limiter: {metrics['allowed']} allowed, {metrics['refused']} refused "
+                  f"({metrics['sources']} sources)")
 
 if __name__ == '__main__':
     main()
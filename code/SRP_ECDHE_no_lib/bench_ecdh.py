@@ -0,0 +1,52 @@
+import argparse
+import time
+import ecdh
+from ecdsa import ECDH, SECP256k1, SigningKey
+
+
+def measure(function, repetitions: int):
+    """
+    :return: Durée moyenne d'un appel (s)
+    """
+    start_time = time.perf_counter()
+    for _ in range(repetitions):
+        function()
+    return (time.perf_counter() - start_time) / repetitions
+
+
+def ecdsa_exchange(private_key, peer_public_bytes):
+    exchange = ECDH(curve=SECP256k1, private_key=private_key)
+    exchange.load_received_public_key_bytes(peer_public_bytes)
+    return exchange.generate_sharedsecret_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ECDH secp256k1 en Python pur comparé à ecdsa")
+    parser.add_argument('--repetitions', type=int, default=500)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    ecdh.generator_comb()
+    print(f"Tables du peigne (2 x {1 << ecdh.COMB_TEETH} points) : {(time.perf_counter() - start_time) * 1000:.1f} ms")
+
+    private_key, public_key = ecdh.generate_key_pair()
+    peer_private_key, peer_public_key = ecdh.generate_key_pair()
+    signing_key = SigningKey.from_secret_exponent(private_key, curve=SECP256k1)
+    peer_public_bytes = ecdh.encode_public_key(peer_public_key)
+    assert ecdh.shared_secret(private_key, peer_public_key) == ecdsa_exchange(signing_key, peer_public_bytes)
+
+    rows = [
+        ("Génération de clé : ecdsa", lambda: SigningKey.generate(curve=SECP256k1).get_verifying_key()),
+        ("Génération de clé : wNAF", lambda: ecdh.to_affine(ecdh.multiply(private_key, ecdh.G))),
+        ("Génération de clé : peigne", ecdh.generate_key_pair),
+        ("Échange : ecdsa", lambda: ecdsa_exchange(signing_key, peer_public_bytes)),
+        ("Échange : wNAF (décodage compris)",
+         lambda: ecdh.shared_secret(private_key, ecdh.decode_public_key(peer_public_bytes))),
+    ]
+    for name, function in rows:
+        measure(function, 10)
+        print(f"{name:<36} {measure(function, args.repetitions) * 1e6:10.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
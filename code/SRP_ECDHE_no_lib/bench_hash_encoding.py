@@ -0,0 +1,72 @@
+import argparse
+import hashlib
+import os
+import sys
+import time
+from secrets import randbelow, randbits
+from srp_session import SALT_SIZE, identity_hash, srp_group
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from srp_groups import GROUPS  # noqa: E402
+
+
+def decimal_hashes(N: int, g: int, salt: int, A: int, B: int, S: int):
+    """
+    Hachages d'une poignée de main avec l'ancien encodage : rendus décimaux des entiers.
+    """
+    u = int(hashlib.sha256(f"{A}{B}".encode()).hexdigest(), 16)
+    K = hashlib.sha256(str(S).encode()).digest()
+    N_hash = hashlib.sha256(str(N).encode()).hexdigest()
+    g_hash = hashlib.sha256(str(g).encode()).hexdigest()
+    I_hash = hashlib.sha256('coco'.encode()).hexdigest()
+    M = hashlib.sha256(f"{N_hash}^{g_hash}|{I_hash}|{salt}|{A}|{B}|{K.hex()}".encode()).hexdigest()
+    HAMK = hashlib.sha256(f"{A}|{M}|{K.hex()}".encode()).hexdigest()
+    # Messages du fil : A et B en décimal, relus par int()
+    int(str(A))
+    int(str(B))
+    return u, HAMK
+
+
+def padded_hashes(group, salt: int, A: int, B: int, S: int):
+    """
+    Mêmes hachages avec l'encodage big-endian de taille fixe de srp_session.
+    """
+    u = group.scrambler(A, B)
+    K = group.session_key(S)
+    M = group.client_proof('coco', salt, A, B, K)
+    HAMK = group.server_proof(A, M, K)
+    # Messages du fil : A et B en hexadécimal de taille fixe
+    int(group.pad(A).hex(), 16)
+    int(group.pad(B).hex(), 16)
+    return u, HAMK
+
+
+def measure(function, arguments, repetitions: int):
+    """
+    :return: Durée moyenne d'un appel (s)
+    """
+    start_time = time.perf_counter()
+    for _ in range(repetitions):
+        function(*arguments)
+    return (time.perf_counter() - start_time) / repetitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coût des hachages SRP selon l'encodage des entiers")
+    parser.add_argument('--groupes', type=int, nargs='+', default=[2048, 4096], choices=sorted(GROUPS))
+    parser.add_argument('--repetitions', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'Groupe':>7} | {'Décimal (µs)':>12} | {'Binaire (µs)':>12} | {'Gain':>6}  (u, K, M, HAMK, A et B sur le fil)")
+    for bits in args.groupes:
+        group = srp_group(bits)
+        identity_hash('coco')
+        salt = randbits(8 * SALT_SIZE)
+        A, B, S = (randbelow(group.N - 1) + 1 for _ in range(3))
+        decimal = measure(decimal_hashes, (group.N, group.g, salt, A, B, S), args.repetitions)
+        padded = measure(padded_hashes, (group, salt, A, B, S), args.repetitions)
+        print(f"{bits:>7} | {decimal * 1e6:>12.1f} | {padded * 1e6:>12.1f} | {decimal / padded:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import os
+import sys
+import time
+from secrets import randbelow, randbits
+from modexp import METHODS
+from srp_session import EXPONENT_BITS, srp_group
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from srp_groups import GROUPS  # noqa: E402
+
+
+def measure(function, arguments, repetitions: int):
+    """
+    :return: Durée moyenne d'un appel (s)
+    """
+    start_time = time.perf_counter()
+    for _ in range(repetitions):
+        function(*arguments)
+    return (time.perf_counter() - start_time) / repetitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calcul du secret SRP : pow natif, Straus/Shamir et Montgomery")
+    parser.add_argument('--groupes', type=int, nargs='+', default=sorted(GROUPS), choices=sorted(GROUPS))
+    parser.add_argument('--repetitions', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'Groupe':>7} | {'Forme':<22} | " + " | ".join(f"{method:>10}" for method in METHODS) + "  (ms)")
+    for bits in args.groupes:
+        groups = [srp_group(bits, method) for method in METHODS]
+        N = groups[0].N
+        A, v, B = (randbelow(N - 1) + 1 for _ in range(3))
+        a, b, x, u = (randbits(EXPONENT_BITS) for _ in range(4))
+        assert len({group.server_secret(A, v, u, b) for group in groups}) == 1
+        assert len({group.client_secret(B, x, a, u) for group in groups}) == 1
+        for shape, function_name, arguments in (("serveur (A * v^u)^b", 'server_secret', (A, v, u, b)),
+                                                ("client (B - kv)^(a+ux)", 'client_secret', (B, x, a, u))):
+            durations = [measure(getattr(group, function_name), arguments, args.repetitions) for group in groups]
+            print(f"{bits:>7} | {shape:<22} | " + " | ".join(f"{duration * 1000:>10.2f}" for duration in durations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import hashlib
+import os
+import sys
+import time
+from secrets import randbits
+from srp_session import SRPClientSession, SRPServerSession, srp_group
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from srp_groups import GROUPS  # noqa: E402
+
+USERNAME = 'coco'
+PASSWORD = 'gateau145'
+
+
+def legacy_handshake(N: int, g: int):
+    """
+    Poignée de main telle que la faisaient les scripts : constantes du groupe et vérificateur recalculés à chaque
+    connexion à partir du mot de passe, exponentiations sans table.
+    """
+    salt = randbits(256)
+    x = int(hashlib.sha256(f"{salt}{PASSWORD}".encode()).hexdigest(), 16)
+    a = randbits(256)
+    A = pow(g, a, N)
+    v = pow(g, int(hashlib.sha256(f"{salt}{PASSWORD}".encode()).hexdigest(), 16), N)
+    b = randbits(256)
+    B = (3 * v + pow(g, b, N)) % N
+    u = int(hashlib.sha256(f"{A}{B}".encode()).hexdigest(), 16)
+    K_user = hashlib.sha256(str(pow(B - 3 * pow(g, x, N), a + u * x, N)).encode()).digest()
+    K_server = hashlib.sha256(str(pow(A * pow(v, u, N), b, N)).encode()).digest()
+    proofs = []
+    for K in (K_user, K_server):
+        N_hash = hashlib.sha256(str(N).encode()).hexdigest()
+        g_hash = hashlib.sha256(str(g).encode()).hexdigest()
+        I_hash = hashlib.sha256(USERNAME.encode()).hexdigest()
+        proofs.append(hashlib.sha256(f"{N_hash}^{g_hash}|{I_hash}|{salt}|{A}|{B}|{K.hex()}".encode()).hexdigest())
+    assert proofs[0] == proofs[1]
+
+
+def session_steps(group, salt: int, verifier: int):
+    """
+    Poignée de main avec les classes de session, chronométrée étape par étape.
+    :return: Durées (s) de chaque étape
+    """
+    times = [time.perf_counter()]
+    client = SRPClientSession(group, USERNAME, PASSWORD)
+    times.append(time.perf_counter())
+    server = SRPServerSession(group, USERNAME, salt, verifier, client.A)
+    times.append(time.perf_counter())
+    M = client.process_challenge(salt, server.B)
+    times.append(time.perf_counter())
+    server_proof = server.verify_session(M)
+    times.append(time.perf_counter())
+    assert client.verify_session(server_proof)
+    times.append(time.perf_counter())
+    return [end - start for start, end in zip(times, times[1:])]
+
+
+STEPS = ('client : a, A', 'serveur : b, B', 'client : x, u, S, K, M', 'serveur : u, S, K, vérif. M', 'client : vérif.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark des étapes d'une session SRP sans bibliothèque")
+    parser.add_argument('--groupes', type=int, nargs='+', default=[0, 2048],
+                        help="Groupes mesurés (0 : module historique de 768 bits)")
+    parser.add_argument('--sessions', type=int, default=1000, help="Nombre de sessions par groupe")
+    args = parser.parse_args()
+
+    for bits in args.groupes:
+        if bits and bits not in GROUPS:
+            parser.error(f"Groupe {bits} inconnu")
+        start_time = time.perf_counter()
+        group = srp_group(bits or None)
+        setup = time.perf_counter() - start_time
+        salt, verifier = group.create_verifier(PASSWORD)
+
+        totals = [0.0] * len(STEPS)
+        start_time = time.perf_counter()
+        for _ in range(args.sessions):
+            for index, duration in enumerate(session_steps(group, salt, verifier)):
+                totals[index] += duration
+        session_rate = args.sessions / (time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        for _ in range(args.sessions):
+            legacy_handshake(group.N, group.g)
+        legacy_rate = args.sessions / (time.perf_counter() - start_time)
+
+        print(f"Groupe {bits or 768} bits (constantes du groupe : {setup * 1000:.1f} ms, une fois par processus)")
+        for name, total in zip(STEPS, totals):
+            print(f"  {name:<30} {total / args.sessions * 1e6:10.1f} µs")
+        print(f"  {'Sessions/s':<30} {session_rate:10.0f}   (scripts historiques : {legacy_rate:.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
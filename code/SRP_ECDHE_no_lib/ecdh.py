@@ -0,0 +1,241 @@
+from functools import lru_cache
+from secrets import randbelow
+
+# Courbe secp256k1 : y^2 = x^3 + 7 sur le corps premier P, générateur G d'ordre premier ORDER (cofacteur 1)
+P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+CURVE_B = 7
+ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+G = (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+     0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+COORDINATE_SIZE = 32
+WNAF_WIDTH = 5
+COMB_TEETH = 8
+COMB_SPACING = 32  # 256 bits / COMB_TEETH : 4 octets du scalaire par dent
+
+# Les points intermédiaires sont en coordonnées jacobiennes (X, Y, Z), pour (X / Z^2, Y / Z^3) en affine :
+# additions et doublements se font sans inversion modulaire. Le point à l'infini a Z = 0.
+INFINITY = (1, 1, 0)
+
+
+def to_affine(point):
+    """
+    :return: (x, y) affine, ou None pour le point à l'infini (une seule inversion modulaire)
+    """
+    X, Y, Z = point
+    if not Z:
+        return None
+    z_inverse = pow(Z, -1, P)
+    z_inverse_2 = z_inverse * z_inverse % P
+    return X * z_inverse_2 % P, Y * z_inverse_2 * z_inverse % P
+
+
+def to_affine_batch(points):
+    """
+    Conversion en affine de plusieurs points jacobiens (hors infini) avec une seule inversion modulaire
+    (astuce de Montgomery : inversion du produit des Z, puis trois multiplications par point).
+    :return: Liste de points (x, y) affines
+    """
+    prefixes = [1]
+    for _, _, Z in points:
+        prefixes.append(prefixes[-1] * Z % P)
+    inverse = pow(prefixes[-1], -1, P)
+    affines = [None] * len(points)
+    for index in range(len(points) - 1, -1, -1):
+        X, Y, Z = points[index]
+        z_inverse = inverse * prefixes[index] % P
+        inverse = inverse * Z % P
+        z_inverse_2 = z_inverse * z_inverse % P
+        affines[index] = X * z_inverse_2 % P, Y * z_inverse_2 * z_inverse % P
+    return affines
+
+
+def double(point):
+    """
+    Doublement jacobien pour a = 0 (formules dbl-2009-l).
+    """
+    X1, Y1, Z1 = point
+    if not Z1 or not Y1:
+        return INFINITY
+    A = X1 * X1 % P
+    B = Y1 * Y1 % P
+    C = B * B % P
+    T = X1 + B
+    D = 2 * (T * T - A - C) % P
+    E = 3 * A
+    X3 = (E * E - 2 * D) % P
+    return X3, (E * (D - X3) - 8 * C) % P, 2 * Y1 * Z1 % P
+
+
+def add_affine(point, affine):
+    """
+    Addition mixte d'un point jacobien et d'un point affine (formules madd-2007-bl).
+    :param affine: (x, y) affine, différent du point à l'infini
+    """
+    X1, Y1, Z1 = point
+    x2, y2 = affine
+    if not Z1:
+        return x2, y2, 1
+    Z1Z1 = Z1 * Z1 % P
+    H = (x2 * Z1Z1 - X1) % P
+    r = 2 * (y2 * Z1 * Z1Z1 - Y1) % P
+    if not H:
+        return double((x2, y2, 1)) if not r else INFINITY
+    HH = H * H % P
+    I = 4 * HH
+    J = H * I % P
+    V = X1 * I % P
+    X3 = (r * r - J - 2 * V) % P
+    return X3, (r * (V - X3) - 2 * Y1 * J) % P, 2 * Z1 * H % P
+
+
+def wnaf(scalar: int, width: int = WNAF_WIDTH):
+    """
+    Forme non adjacente à fenêtre : chiffres impairs dans ]-2^(width-1), 2^(width-1)[ séparés d'au moins width - 1
+    zéros, soit environ une addition pour width + 1 doublements.
+    :return: Chiffres, du poids faible au poids fort
+    """
+    digits = []
+    modulus = 1 << width
+    while scalar:
+        if scalar & 1:
+            digit = scalar & (modulus - 1)
+            if digit >= modulus >> 1:
+                digit -= modulus
+            scalar -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        scalar >>= 1
+    return digits
+
+
+def multiply(scalar: int, affine, width: int = WNAF_WIDTH):
+    """
+    Multiplication scalaire d'un point quelconque (clé publique du pair) par wNAF.
+    :param affine: Point (x, y) affine
+    :return: scalar * point, en coordonnées jacobiennes
+    """
+    # Multiples impairs P, 3P, ..., (2^(width-1) - 1)P, ramenés en affine pour les additions mixtes
+    twice = to_affine(double((*affine, 1)))
+    point = (*affine, 1)
+    jacobian_multiples = []
+    for _ in range((1 << (width - 2)) - 1):
+        point = add_affine(point, twice)
+        jacobian_multiples.append(point)
+    odd_multiples = [affine] + to_affine_batch(jacobian_multiples)
+    negated = [(x, P - y) for x, y in odd_multiples]
+
+    result = INFINITY
+    for digit in reversed(wnaf(scalar % ORDER, width)):
+        result = double(result)
+        if digit > 0:
+            result = add_affine(result, odd_multiples[digit >> 1])
+        elif digit < 0:
+            result = add_affine(result, negated[-digit >> 1])
+    return result
+
+
+def _comb_table(teeth_points):
+    """
+    :return: Table dont l'entrée j est la somme des teeth_points[i] pour les bits i de j (points affines)
+    """
+    table = [None]
+    for index in range(1, 1 << len(teeth_points)):
+        top = index.bit_length() - 1
+        rest = index ^ (1 << top)
+        table.append(teeth_points[top] if not rest else to_affine(add_affine((*table[rest], 1), teeth_points[top])))
+    return table
+
+
+@lru_cache(maxsize=None)
+def generator_comb():
+    """
+    Tables du peigne de Lim-Lee pour le générateur, calculées une fois par processus. Le scalaire de 256 bits est
+    découpé en COMB_TEETH dents de COMB_SPACING bits ; l'entrée j de la première table est la somme des
+    2^(i * COMB_SPACING) * G pour les bits i de j, la seconde table est la première multipliée par 2^(COMB_SPACING / 2).
+    :return: (première table, seconde table)
+    """
+    teeth_points = []
+    point = (*G, 1)
+    for _ in range(COMB_TEETH):
+        teeth_points.append(to_affine(point))
+        for _ in range(COMB_SPACING):
+            point = double(point)
+    half_points = []
+    for affine in teeth_points:
+        point = (*affine, 1)
+        for _ in range(COMB_SPACING // 2):
+            point = double(point)
+        half_points.append(to_affine(point))
+    return _comb_table(teeth_points), _comb_table(half_points)
+
+
+# SPREAD[b] : les 8 bits de b écartés de COMB_TEETH positions, pour entrelacer les dents octet par octet
+SPREAD = [sum(((byte >> bit) & 1) << (COMB_TEETH * bit) for bit in range(8)) for byte in range(256)]
+
+
+def multiply_generator(scalar: int):
+    """
+    Multiplication scalaire du générateur par peigne à deux tables : COMB_SPACING / 2 doublements et au plus
+    COMB_SPACING additions mixtes (16 et 32), contre 256 doublements pour une multiplication quelconque.
+    :return: scalar * G, en coordonnées jacobiennes
+    """
+    low_table, high_table = generator_comb()
+    # Entrelacement des dents : le bit c de la dent t passe en position COMB_TEETH * c + t, si bien que l'octet c
+    # du résultat est l'indice de la colonne c dans la table
+    interleaved = 0
+    for position, byte in enumerate((scalar % ORDER).to_bytes(32, 'little')):
+        interleaved |= SPREAD[byte] << (64 * (position & 3) + (position >> 2))
+    columns = interleaved.to_bytes(32, 'little')
+    half = COMB_SPACING // 2
+    result = INFINITY
+    for column in range(half - 1, -1, -1):
+        result = double(result)
+        if columns[column]:
+            result = add_affine(result, low_table[columns[column]])
+        if columns[column + half]:
+            result = add_affine(result, high_table[columns[column + half]])
+    return result
+
+
+def generate_key_pair():
+    """
+    :return: (clé privée d, clé publique d * G affine)
+    """
+    private_key = randbelow(ORDER - 1) + 1
+    return private_key, to_affine(multiply_generator(private_key))
+
+
+def encode_public_key(public_key):
+    """
+    :return: x || y sur COORDINATE_SIZE octets chacun (même format que VerifyingKey.to_string() d'ecdsa)
+    """
+    x, y = public_key
+    return x.to_bytes(COORDINATE_SIZE, 'big') + y.to_bytes(COORDINATE_SIZE, 'big')
+
+
+def decode_public_key(data: bytes):
+    """
+    Décode et valide une clé publique reçue : coordonnées dans le corps et point sur la courbe
+    (le cofacteur valant 1, tout point de la courbe hors de l'infini est d'ordre ORDER).
+    :return: Point (x, y) affine
+    """
+    if len(data) != 2 * COORDINATE_SIZE:
+        raise ValueError(f"Clé publique de {len(data)} octets")
+    x = int.from_bytes(data[:COORDINATE_SIZE], 'big')
+    y = int.from_bytes(data[COORDINATE_SIZE:], 'big')
+    if x >= P or y >= P or (y * y - x * x * x - CURVE_B) % P:
+        raise ValueError("Clé publique hors de la courbe")
+    return x, y
+
+
+def shared_secret(private_key: int, peer_public_key):
+    """
+    Secret ECDH : abscisse de d * Q.
+    :param peer_public_key: Point affine validé par decode_public_key
+    :return: COORDINATE_SIZE octets
+    """
+    point = to_affine(multiply(private_key, peer_public_key))
+    if point is None:
+        raise ValueError("Secret ECDH nul")
+    return point[0].to_bytes(COORDINATE_SIZE, 'big')
@@ -0,0 +1,87 @@
+METHODS = ('pow', 'straus', 'montgomery')
+DEFAULT_WINDOW = 5
+
+
+def _window_table(base: int, modulus: int, window: int):
+    """
+    :return: [base^0, base^1, ..., base^(2^window - 1)] mod modulus
+    """
+    table = [1, base % modulus]
+    for _ in range(2, 1 << window):
+        table.append(table[-1] * table[1] % modulus)
+    return table
+
+
+def straus(pairs, modulus: int, window: int = 4):
+    """
+    Multi-exponentiation simultanée de Straus (généralisation de l'astuce de Shamir) :
+    prod(base^exposant) mod modulus avec une seule suite d'élévations au carré, partagée par tous les termes
+    (max des tailles d'exposant, au lieu de leur somme), et une multiplication par terme et par fenêtre.
+    :param pairs: Couples (base, exposant positif)
+    :param modulus: Module
+    :param window: Largeur des fenêtres (bits)
+    :return: Le produit des puissances mod modulus
+    """
+    tables = [(_window_table(base, modulus, window), exponent) for base, exponent in pairs]
+    bits = max(exponent.bit_length() for _, exponent in pairs)
+    mask = (1 << window) - 1
+    result = 1
+    for shift in range(-(-bits // window) * window - window, -1, -window):
+        for _ in range(window):
+            result = result * result % modulus
+        for table, exponent in tables:
+            digit = (exponent >> shift) & mask
+            if digit:
+                result = result * table[digit] % modulus
+    return result
+
+
+class MontgomeryContext:
+    def __init__(self, modulus: int):
+        """
+        Arithmétique en forme de Montgomery pour un module impair : x est représenté par x * R mod N avec
+        R = 2^k > N, et la réduction d'un produit (REDC) remplace la division par N par des masques, des décalages
+        et deux multiplications.
+        :param modulus: Module impair N
+        """
+        if not modulus & 1:
+            raise ValueError("Le module doit être impair")
+        self.modulus = modulus
+        self.bits = modulus.bit_length()
+        self.mask = (1 << self.bits) - 1
+        self.inverse = -pow(modulus, -1, 1 << self.bits) & self.mask  # -N^-1 mod R
+        self.r_squared = (1 << (2 * self.bits)) % modulus
+        self.one = (1 << self.bits) % modulus
+
+    def reduce(self, value: int):
+        """
+        REDC : value * R^-1 mod N, pour 0 <= value < N * R.
+        """
+        m = (value & self.mask) * self.inverse & self.mask
+        result = (value + m * self.modulus) >> self.bits
+        return result - self.modulus if result >= self.modulus else result
+
+    def to_montgomery(self, value: int):
+        return self.reduce(value % self.modulus * self.r_squared)
+
+    def from_montgomery(self, value: int):
+        return self.reduce(value)
+
+    def pow(self, base: int, exponent: int, window: int = DEFAULT_WINDOW):
+        """
+        Exponentiation à fenêtres fixes en forme de Montgomery.
+        :return: base^exponent mod N
+        """
+        reduce = self.reduce
+        table = [self.one, self.to_montgomery(base)]
+        for _ in range(2, 1 << window):
+            table.append(reduce(table[-1] * table[1]))
+        mask = (1 << window) - 1
+        result = self.one
+        for shift in range(-(-exponent.bit_length() // window) * window - window, -1, -window):
+            for _ in range(window):
+                result = reduce(result * result)
+            digit = (exponent >> shift) & mask
+            if digit:
+                result = reduce(result * table[digit])
+        return self.from_montgomery(result)
@@ -1,31 +1,34 @@
-import hashlib
-from secrets import randbelow
-from ecdsa import SECP256k1, SigningKey, VerifyingKey
+import argparse
+import os
+import sys
 import socket
+import ecdh
+from modexp import METHODS
+from srp_session import SRPClientSession, srp_group
 
-# Paramètres SRP
-N = int("E0A67598EAF6F9D3B0542A6BCF209B91E9D0A9AE8567C40941BA19C40CF7434F"
-        "A9A91FD95F5A1FBB5B1A3945135B1F8E1A7A3EBF00A4D4B2F11A6157E1B18F15"
-        "1D8E21D0E56FA1D64BFDF3E1D7BC7A25A204F0E8A3E2B6D32530FF2EFD86D6F6", 16)
-g = 2
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from preauth import solve_puzzle  # noqa: E402
+from srp_groups import GROUPS  # noqa: E402
+
+parser = argparse.ArgumentParser(description="Client SRP + ECDHE sans bibliothèque SRP")
+parser.add_argument('--groupe', type=int, choices=sorted(GROUPS),
+                    help="Groupe SRP de la RFC 5054 (par défaut, le module historique de 768 bits)")
+parser.add_argument('--exponentiation', choices=METHODS, default='pow',
+                    help="Calcul du secret SRP : pow natif, Straus/Shamir ou fenêtres en forme de Montgomery")
+args = parser.parse_args()
+
+# Paramètres SRP, précalculés une fois par groupe
+group = srp_group(args.groupe, args.exponentiation)
 
 # Paramètres utilisateur
 username = 'coco'
 password = 'gateau145'
 
-# Génération de sel et calcul du vérificateur
-salt = randbelow(1 << 256)
-xH = hashlib.sha256(f"{salt}{password}".encode()).hexdigest()
-x = int(xH, 16)
-v = pow(g, x, N)
-
 # Génération de la clé privée et publique éphémère
-a = randbelow(N)
-A = pow(g, a, N)
+session = SRPClientSession(group, username, password)
 
 # Génération de la paire de clés ECDHE
-ecdhe_private_key = SigningKey.generate(curve=SECP256k1)
-ecdhe_public_key = ecdhe_private_key.get_verifying_key()
+ecdhe_private_key, ecdhe_public_key = ecdh.generate_key_pair()
 
 # Envoi des paramètres au serveur
 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -33,33 +36,34 @@ server_address = ('localhost', 65435)
 sock.connect(server_address)
 
 try:
-    message = f"{A},{ecdhe_public_key.to_string().hex()},{salt}"
+    message = f"{username},{group.pad(session.A).hex()},{ecdh.encode_public_key(ecdhe_public_key).hex()}"
     sock.sendall(message.encode())
 
-    # Réception des paramètres du serveur
-    data = sock.recv(1024)
-    B, ecdhe_public_key_server_hex = data.decode().split(',')
-    B = int(B)
-    ecdhe_public_key_server = VerifyingKey.from_string(bytes.fromhex(ecdhe_public_key_server_hex), curve=SECP256k1)
+    # Réception du sel et des paramètres du serveur
+    data = sock.recv(16384)
+
+    # Le serveur peut exiger un cookie de pré-authentification : le message est alors renvoyé avec lui
+    if data.startswith(b'cookie,'):
+        cookie = bytes.fromhex(data.decode().split(',')[1])
+        solution = solve_puzzle(cookie, message.encode())
+        sock.sendall(f"{message},{cookie.hex()},{solution.hex()}".encode())
+        data = sock.recv(16384)
+    salt, B, ecdhe_public_key_server_hex = data.decode().split(',')
+    salt = int(salt, 16)
+    B = int(B, 16)
+    ecdhe_public_key_server = ecdh.decode_public_key(bytes.fromhex(ecdhe_public_key_server_hex))
 
-    # Calcul des paramètres de l'authentification
-    uH = hashlib.sha256(f"{A}{B}".encode()).hexdigest()
-    u = int(uH, 16)
-    S_user = pow(B - 3 * v, a + u * x, N)
-    K_user = hashlib.sha256(str(S_user).encode()).digest()
+    # Secret ECDHE, mêlé à la clé de session : les preuves SRP authentifient aussi l'échange ECDHE
+    ecdhe_secret = ecdh.shared_secret(ecdhe_private_key, ecdhe_public_key_server)
 
-    # Preuve de l'authentification
-    N_hash = hashlib.sha256(str(N).encode()).hexdigest()
-    g_hash = hashlib.sha256(str(g).encode()).hexdigest()
-    I_hash = hashlib.sha256(username.encode()).hexdigest()
-    M_user = hashlib.sha256(f"{N_hash}^{g_hash}|{I_hash}|{salt}|{A}|{B}|{K_user.hex()}".encode()).hexdigest()
-    sock.sendall(M_user.encode())
+    # Calcul de la clé de session et preuve de l'authentification
+    M_user = session.process_challenge(salt, B, ecdhe_secret)
+    sock.sendall(M_user.hex().encode())
 
     # Réception de la preuve du serveur
-    M_server = sock.recv(1024).decode()
-    M_check = hashlib.sha256(f"{A}|{M_user}|{K_user.hex()}".encode()).hexdigest()
+    M_server = bytes.fromhex(sock.recv(16384).decode())
 
-    if M_server == M_check:
+    if session.verify_session(M_server):
         print("Authentification réussie")
     else:
         print("Échec de l'authentification")
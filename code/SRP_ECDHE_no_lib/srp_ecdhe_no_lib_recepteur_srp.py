@@ -1,72 +1,151 @@
-import hashlib
-from secrets import randbelow
-from ecdsa import SECP256k1, SigningKey, VerifyingKey
+import argparse
+import os
+import sys
 import socket
+import ecdh
+from modexp import METHODS
+from srp_session import SALT_SIZE, AuthenticationFailed, SRPServerSession, srp_group
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from ephemeral_pool import EphemeralPool  # noqa: E402
+from preauth import add_preauth_arguments, preauth_from_arguments  # noqa: E402
+from srp_groups import GROUPS  # noqa: E402
+
+parser = argparse.ArgumentParser(description="Serveur SRP + ECDHE sans bibliothèque SRP")
+parser.add_argument('--groupe', type=int, choices=sorted(GROUPS),
+                    help="Groupe SRP de la RFC 5054 (par défaut, le module historique de 768 bits)")
+parser.add_argument('--exponentiation', choices=METHODS, default='pow',
+                    help="Calcul du secret SRP : pow natif, Straus/Shamir ou fenêtres en forme de Montgomery")
+parser.add_argument('--reserve', type=int, default=8, help="Nombre de valeurs éphémères précalculées")
+parser.add_argument('--connexions', type=int, default=1, help="Nombre de connexions à servir (0 : sans limite)")
+add_preauth_arguments(parser)
+args = parser.parse_args()
+CONNECTION_TIMEOUT = 10.0  # Délai maximal (s) d'attente d'un message du client
+
+# Paramètres SRP, précalculés une fois par groupe
+group = srp_group(args.groupe, args.exponentiation)
+
+# Vérificateurs enregistrés {utilisateur: (sel, vérificateur)}
+# Pour cette démonstration, l'enregistrement a lieu au démarrage ; le mot de passe n'est plus utilisé ensuite
+verifiers = {'coco': group.create_verifier('gateau145')}
+
+
+# Les valeurs éphémères sont précalculées en attendant les connexions
+srp_pool = EphemeralPool(group.ephemeral, args.reserve)
+ecdhe_pool = EphemeralPool(ecdh.generate_key_pair, args.reserve)
+
+# Pré-authentification : cookie sans état et limiteur de débit par source
+cookies, limiter = preauth_from_arguments(args)
+
+
+def require_cookie(connection, message, source):
+    """
+    Pré-authentification sans état : un premier message sans cookie reçoit « cookie,<cookie> » et doit être renvoyé
+    suivi de « ,<cookie>,<solution du puzzle> ». Rien de coûteux n'est calculé ni conservé avant cette vérification.
+    :param message: Premier message reçu
+    :param source: Adresse du client
+    :return: Le premier message sans le cookie, ou None si le cookie est invalide
+    """
+    fields = message.split(',')
+    if len(fields) == 3:
+        connection.sendall(f"cookie,{cookies.issue(source).hex()}".encode())
+        fields = connection.recv(16384).decode().split(',')
+    if len(fields) != 5:
+        return None
+    message = ','.join(fields[:3])
+    if not cookies.check(source, bytes.fromhex(fields[3]), bytes.fromhex(fields[4]), message.encode()):
+        return None
+    return message
+
+
+def serve(connection, source):
+    """
+    Authentifie le client d'une connexion.
+    :param source: Adresse du client
+    :return: True si l'authentification a réussi
+    """
+    data = connection.recv(16384)
+    if not data:
+        return False
+    message = data.decode()
+
+    # Vérification du cookie avant tout calcul coûteux
+    if cookies is not None:
+        message = require_cookie(connection, message, source)
+        if message is None:
+            return False
+    username, A, ecdhe_public_key_hex = message.split(',')
+    A = int(A, 16)
+    ecdhe_public_key = ecdh.decode_public_key(bytes.fromhex(ecdhe_public_key_hex))
+
+    # Récupération du vérificateur enregistré
+    if username not in verifiers:
+        return False
+    salt, v = verifiers[username]
+
+    # Clé privée et publique éphémère, prise dans la réserve
+    session = SRPServerSession(group, username, salt, v, A, srp_pool.take())
+
+    # Paire de clés ECDHE, prise dans la réserve
+    ecdhe_private_key, ecdhe_public_key_server = ecdhe_pool.take()
+    ecdhe_secret = ecdh.shared_secret(ecdhe_private_key, ecdhe_public_key)
+
+    # Envoi du sel et des paramètres à l'utilisateur
+    # Entiers en hexadécimal de taille fixe : conversion linéaire, contrairement au décimal
+    message = (f"{salt.to_bytes(SALT_SIZE, 'big').hex()},{group.pad(session.B).hex()},"
+               f"{ecdh.encode_public_key(ecdhe_public_key_server).hex()}")
+    connection.sendall(message.encode())
+
+    # Réception et vérification de la preuve de l'utilisateur
+    M_user = bytes.fromhex(connection.recv(16384).decode())
+    M_server = session.verify_session(M_user, ecdhe_secret)
+    if M_server is None:
+        return False
+    connection.sendall(M_server.hex().encode())
+    return True
 
-# Paramètres SRP
-N = int("E0A67598EAF6F9D3B0542A6BCF209B91E9D0A9AE8567C40941BA19C40CF7434F"
-        "A9A91FD95F5A1FBB5B1A3945135B1F8E1A7A3EBF00A4D4B2F11A6157E1B18F15"
-        "1D8E21D0E56FA1D64BFDF3E1D7BC7A25A204F0E8A3E2B6D32530FF2EFD86D6F6", 16)
-g = 2
-k = 3  # Constante SRP
 
 # Configuration du serveur
 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 server_address = ('localhost', 65435)
 sock.bind(server_address)
-sock.listen(1)
+sock.listen()
 
 print("Serveur en attente de connexion...")
 
-connection, client_address = sock.accept()
-
+served = 0
 try:
-    data = connection.recv(1024)
-    if data:
-        A, ecdhe_public_key_hex, salt = data.decode().split(',')
-        A = int(A)
-        salt = int(salt)
-        ecdhe_public_key = VerifyingKey.from_string(bytes.fromhex(ecdhe_public_key_hex), curve=SECP256k1)
-
-        # Récupération du vérificateur depuis la base de données
-        # Pour cette démonstration, nous le recalculons ici
-        password = 'gateau145'
-        xH = hashlib.sha256(f"{salt}{password}".encode()).hexdigest()
-        x = int(xH, 16)
-        v = pow(g, x, N)
-
-        # Génération de la clé privée et publique éphémère
-        b = randbelow(N)
-        B = (k * v + pow(g, b, N)) % N
-
-        # Génération de la paire de clés ECDHE
-        ecdhe_private_key = SigningKey.generate(curve=SECP256k1)
-        ecdhe_public_key_server = ecdhe_private_key.get_verifying_key()
-
-        # Envoi des paramètres à l'utilisateur
-        message = f"{B},{ecdhe_public_key_server.to_string().hex()}"
-        connection.sendall(message.encode())
-
-        # Réception de la preuve de l'utilisateur
-        M_user = connection.recv(1024).decode()
-
-        # Calcul des paramètres de l'authentification
-        uH = hashlib.sha256(f"{A}{B}".encode()).hexdigest()
-        u = int(uH, 16)
-        S_server = pow(A * pow(v, u, N), b, N)
-        K_server = hashlib.sha256(str(S_server).encode()).digest()
-
-        # Preuve de l'authentification
-        N_hash = hashlib.sha256(str(N).encode()).hexdigest()
-        g_hash = hashlib.sha256(str(g).encode()).hexdigest()
-        I_hash = hashlib.sha256('coco'.encode()).hexdigest()
-        M_check = hashlib.sha256(f"{N_hash}^{g_hash}|{I_hash}|{salt}|{A}|{B}|{K_server.hex()}".encode()).hexdigest()
-
-        if M_user == M_check:
-            M_server = hashlib.sha256(f"{A}|{M_user}|{K_server.hex()}".encode()).hexdigest()
-            connection.sendall(M_server.encode())
-            print("Authentification réussie")
-        else:
+    while not args.connexions or served < args.connexions:
+        connection, client_address = sock.accept()
+        try:
+            # Une source qui dépasse son débit est déconnectée sans qu'aucun message ne soit lu
+            if limiter is not None and not limiter.allow(client_address[0]):
+                print("Débit dépassé")
+                continue
+            served += 1
+            connection.settimeout(CONNECTION_TIMEOUT)
+            if serve(connection, client_address[0]):
+                print("Authentification réussie")
+            else:
+                print("Échec de l'authentification")
+        except (AuthenticationFailed, ConnectionError, TimeoutError, ValueError):
             print("Échec de l'authentification")
+        finally:
+            connection.close()
+except KeyboardInterrupt:
+    pass
 finally:
-    connection.close()
+    sock.close()
+    for name, pool in (('SRP', srp_pool), ('ECDHE', ecdhe_pool)):
+        metrics = pool.metrics()
+        print(f"Réserve {name} : {metrics['hits']} valeurs précalculées servies, {metrics['exhaustions']} épuisements, "
+              f"remplissage {metrics['refill_rate']:.0f} valeurs/s")
+        pool.close()
+    if cookies is not None:
+        metrics = cookies.metrics()
+        print(f"Cookies : {metrics['issued']} émis, {metrics['accepted']} acceptés, {metrics['rejected']} refusés "
+              f"(dont {metrics['replayed']} rejoués)")
+    if limiter is not None:
+        metrics = limiter.metrics()
+        print(f"Limiteur : {metrics['allowed']} connexions acceptées, {metrics['refused']} refusées "
+              f"({metrics['sources']} sources)")
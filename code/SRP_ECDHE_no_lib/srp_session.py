@@ -0,0 +1,231 @@
+import hashlib
+import hmac
+import os
+import sys
+from functools import lru_cache
+from secrets import randbits
+import modexp
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from fixed_base import fixed_base_table  # noqa: E402
+from srp_groups import GROUPS  # noqa: E402
+
+# Module historique de 768 bits des scripts sans bibliothèque
+LEGACY_N = int("E0A67598EAF6F9D3B0542A6BCF209B91E9D0A9AE8567C40941BA19C40CF7434F"
+               "A9A91FD95F5A1FBB5B1A3945135B1F8E1A7A3EBF00A4D4B2F11A6157E1B18F15"
+               "1D8E21D0E56FA1D64BFDF3E1D7BC7A25A204F0E8A3E2B6D32530FF2EFD86D6F6", 16)
+LEGACY_G = 2
+EXPONENT_BITS = 256  # Taille des exposants secrets a, b et x
+SALT_SIZE = 32
+
+
+class AuthenticationFailed(Exception):
+    """Exception levée lorsqu'une valeur publique reçue est hors de ]0, N[."""
+    pass
+
+
+class SRPGroup:
+    def __init__(self, N: int, g: int, exponent_bits: int = EXPONENT_BITS, exponentiation: str = 'pow'):
+        """
+        Constantes d'un groupe SRP, calculées une fois pour toutes les sessions : table de puissances de g,
+        multiplicateur k et état SHA-256 du préfixe H(N) xor H(g) de la preuve M.
+        Tout entier haché est encodé en big-endian sur la longueur du module (PAD de la RFC 5054) : l'encodage est
+        sans ambiguïté, de taille fixe, et linéaire là où la conversion en décimal est quadratique.
+        :param N: Module premier sûr
+        :param g: Générateur
+        :param exponent_bits: Taille des exposants secrets
+        :param exponentiation: Calcul du secret S, parmi modexp.METHODS
+        """
+        self.N = N
+        self.g = g
+        self.k = 3  # Constante SRP-6
+        self.exponent_bits = exponent_bits
+        if exponentiation not in modexp.METHODS:
+            raise ValueError(f"Méthode d'exponentiation {exponentiation} inconnue")
+        self.exponentiation = exponentiation
+        self.montgomery = modexp.MontgomeryContext(N) if exponentiation == 'montgomery' else None
+        self.g_table = fixed_base_table(g, N, exponent_bits)  # Puissances de g précalculées
+        self.length = (N.bit_length() + 7) // 8
+        N_hash = hashlib.sha256(self.pad(N)).digest()
+        g_hash = hashlib.sha256(self.pad(g)).digest()
+        self.proof_prefix = hashlib.sha256(bytes(n ^ h for n, h in zip(N_hash, g_hash)))
+
+    def pad(self, value: int):
+        """
+        :return: value en big-endian sur la longueur du module
+        """
+        return value.to_bytes(self.length, 'big')
+
+    def ephemeral(self):
+        """
+        Clé privée éphémère et sa puissance de g, indépendantes du pair (peuvent être précalculées).
+        :return: (exposant secret, g^exposant mod N)
+        """
+        exponent = randbits(self.exponent_bits)
+        return exponent, self.g_table.pow(exponent)
+
+    def private_key(self, salt: int, password: str):
+        """
+        :return: Clé privée x dérivée du sel et du mot de passe
+        """
+        return int.from_bytes(hashlib.sha256(salt.to_bytes(SALT_SIZE, 'big') + password.encode()).digest(), 'big')
+
+    def create_verifier(self, password: str):
+        """
+        Enregistrement d'un utilisateur : seul le couple (sel, vérificateur) est conservé par le serveur.
+        :return: (sel, vérificateur v = g^x mod N)
+        """
+        salt = randbits(8 * SALT_SIZE)
+        return salt, self.g_table.pow(self.private_key(salt, password))
+
+    def scrambler(self, A: int, B: int):
+        """
+        :return: Paramètre de brouillage u = H(A, B)
+        """
+        return int.from_bytes(hashlib.sha256(self.pad(A) + self.pad(B)).digest(), 'big')
+
+    def client_secret(self, B: int, x: int, a: int, u: int):
+        """
+        :return: Secret du client S = (B - k * g^x)^(a + u * x) mod N
+        """
+        base = (B - self.k * self.g_table.pow(x)) % self.N
+        exponent = a + u * x
+        if self.exponentiation == 'straus':
+            # Une seule base : la méthode se réduit à une exponentiation à fenêtres
+            return modexp.straus([(base, exponent)], self.N)
+        if self.exponentiation == 'montgomery':
+            return self.montgomery.pow(base, exponent)
+        return pow(base, exponent, self.N)
+
+    def server_secret(self, A: int, v: int, u: int, b: int):
+        """
+        :return: Secret du serveur S = (A * v^u)^b = A^b * v^(u * b) mod N
+        """
+        N = self.N
+        if self.exponentiation == 'straus':
+            return modexp.straus([(A, b), (v, u * b)], N)
+        if self.exponentiation == 'montgomery':
+            return self.montgomery.pow(A * self.montgomery.pow(v, u) % N, b)
+        return pow(A * pow(v, u, N), b, N)
+
+    def session_key(self, S: int, ecdh_secret: bytes = b''):
+        """
+        :param ecdh_secret: Secret ECDHE de la connexion, lié à K (et donc aux preuves M et HAMK)
+        :return: Clé de session K = H(S, secret ECDHE)
+        """
+        return hashlib.sha256(self.pad(S) + ecdh_secret).digest()
+
+    def client_proof(self, username: str, salt: int, A: int, B: int, K: bytes):
+        """
+        :return: Preuve M = H(H(N) xor H(g), H(I), s, A, B, K), champs de taille fixe concaténés
+        """
+        proof = self.proof_prefix.copy()
+        proof.update(identity_hash(username))
+        proof.update(salt.to_bytes(SALT_SIZE, 'big'))
+        proof.update(self.pad(A))
+        proof.update(self.pad(B))
+        proof.update(K)
+        return proof.digest()
+
+    def server_proof(self, A: int, M: bytes, K: bytes):
+        """
+        :return: Preuve du serveur H(A, M, K)
+        """
+        return hashlib.sha256(self.pad(A) + M + K).digest()
+
+
+@lru_cache(maxsize=1024)
+def identity_hash(username: str):
+    """
+    :return: H(I), mis en cache : un même utilisateur se reconnecte souvent
+    """
+    return hashlib.sha256(username.encode()).digest()
+
+
+@lru_cache(maxsize=None)
+def srp_group(bits: int = None, exponentiation: str = 'pow'):
+    """
+    Groupe SRP partagé par toutes les sessions du processus.
+    :param bits: Taille d'un groupe de la RFC 5054 (clé de GROUPS), ou None pour le module historique de 768 bits
+    :param exponentiation: Calcul du secret S, parmi modexp.METHODS
+    :return: SRPGroup
+    """
+    N, g = GROUPS[bits] if bits else (LEGACY_N, LEGACY_G)
+    return SRPGroup(N, g, exponentiation=exponentiation)
+
+
+class SRPClientSession:
+    def __init__(self, group: SRPGroup, username: str, password: str, ephemeral=None):
+        """
+        Côté client d'une authentification SRP.
+        :param group: Groupe SRP partagé
+        :param ephemeral: (a, g^a) précalculé, ou None pour le tirer ici
+        """
+        self.group = group
+        self.username = username
+        self.password = password
+        self.a, self.A = ephemeral or group.ephemeral()
+        self.key = None
+        self.expected_proof = None
+
+    def process_challenge(self, salt: int, B: int, ecdh_secret: bytes = b''):
+        """
+        Calcule la clé de session et la preuve du client.
+        :param salt: Sel de l'utilisateur envoyé par le serveur
+        :param B: Valeur publique du serveur
+        :param ecdh_secret: Secret ECDHE partagé avec le serveur, mêlé à la clé de session
+        :return: Preuve M à envoyer au serveur
+        """
+        group = self.group
+        if not 0 < B < group.N:
+            raise AuthenticationFailed()
+        x = group.private_key(salt, self.password)
+        u = group.scrambler(self.A, B)
+        S = group.client_secret(B, x, self.a, u)
+        self.key = group.session_key(S, ecdh_secret)
+        M = group.client_proof(self.username, salt, self.A, B, self.key)
+        self.expected_proof = group.server_proof(self.A, M, self.key)
+        return M
+
+    def verify_session(self, server_proof: bytes):
+        """
+        :return: True si le serveur a prouvé connaître la même clé de session
+        """
+        return hmac.compare_digest(server_proof, self.expected_proof)
+
+
+class SRPServerSession:
+    def __init__(self, group: SRPGroup, username: str, salt: int, verifier: int, A: int, ephemeral=None):
+        """
+        Côté serveur d'une authentification SRP, à partir du vérificateur enregistré (jamais du mot de passe).
+        :param group: Groupe SRP partagé
+        :param salt: Sel enregistré de l'utilisateur
+        :param verifier: Vérificateur enregistré v
+        :param A: Valeur publique du client
+        :param ephemeral: (b, g^b) pris dans une réserve, ou None pour le tirer ici
+        """
+        if not 0 < A < group.N:
+            raise AuthenticationFailed()
+        self.group = group
+        self.username = username
+        self.salt = salt
+        self.verifier = verifier
+        self.A = A
+        self.b, g_b = ephemeral or group.ephemeral()
+        self.B = (group.k * verifier + g_b) % group.N
+        self.key = None
+
+    def verify_session(self, M: bytes, ecdh_secret: bytes = b''):
+        """
+        Calcule la clé de session et vérifie la preuve du client.
+        :param M: Preuve reçue du client
+        :param ecdh_secret: Secret ECDHE partagé avec le client, mêlé à la clé de session
+        :return: Preuve du serveur à renvoyer, ou None si la preuve du client est fausse
+        """
+        group = self.group
+        u = group.scrambler(self.A, self.B)
+        S = group.server_secret(self.A, self.verifier, u, self.b)
+        self.key = group.session_key(S, ecdh_secret)
+        if not hmac.compare_digest(M, group.client_proof(self.username, self.salt, self.A, self.B, self.key)):
+            return None
+        return group.server_proof(self.A, M, self.key)
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import srp
+from server_async import AsyncSRPServer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from framing import read_message, write_message  # noqa: E402
+from verifier_store import VerifierStore  # noqa: E402
+
+
+async def client_handshake(port: int, client_pool, username: str, password: str):
+    """
+    Poignée de main cliente ; les calculs SRP du client passent par un pool de threads (srp appelle OpenSSL via
+    ctypes, qui relâche le GIL) pour ne pas bloquer la boucle partagée avec le serveur.
+    :return: Durée de la poignée de main (s)
+    """
+    loop = asyncio.get_running_loop()
+    start_time = time.perf_counter()
+    reader, writer = await asyncio.open_connection('localhost', port)
+    try:
+        usr = srp.User(username, password)
+        uname, A = await loop.run_in_executor(client_pool, usr.start_authentication)
+        write_message(writer, {'username': uname, 'A': A})
+        server_data = await read_message(reader)
+        M = await loop.run_in_executor(client_pool, usr.process_challenge, bytes(server_data['s']), bytes(server_data['B']))
+        write_message(writer, {'M': M})
+        usr.verify_session(bytes((await read_message(reader))['HAMK']))
+        assert usr.authenticated()
+    finally:
+        writer.close()
+    return time.perf_counter() - start_time
+
+
+async def bench(handshakes: int, concurrency: int, workers: int):
+    username, password = 'testuser', 'testpassword'
+    verifiers = VerifierStore()
+    verifiers.add(username, *srp.create_salted_verification_key(username, password))
+    server = AsyncSRPServer(verifiers, workers)
+    tcp_server = await asyncio.start_server(server.handle_connection, 'localhost', 0, backlog=1024)
+    port = tcp_server.sockets[0].getsockname()[1]
+    report_task = asyncio.create_task(server.report())
+
+    semaphore = asyncio.Semaphore(concurrency)
+    with ThreadPoolExecutor(concurrency) as client_pool:
+        async def limited():
+            async with semaphore:
+                return await client_handshake(port, client_pool, username, password)
+
+        start_time = time.perf_counter()
+        durations = await asyncio.gather(*(limited() for _ in range(handshakes)))
+        elapsed = time.perf_counter() - start_time
+
+    report_task.cancel()
+    tcp_server.close()
+    server.pool.shutdown()
+    print(f"{handshakes} poignées de main en {elapsed:.2f} s : {handshakes / elapsed:.1f}/s, "
+          f"latence médiane {statistics.median(durations) * 1000:.1f} ms, max {max(durations) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Charge de poignées de main simultanées sur le serveur SRP asyncio")
+    parser.add_argument('--handshakes', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(bench(args.handshakes, args.concurrency, args.workers))
+
+
+if __name__ == '__main__':
+    main()
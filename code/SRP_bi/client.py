@@ -1,92 +1,103 @@
+import argparse
+import os
 import srp
 import socket
-import json
-import base64
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from framing import FrameReader, send_message  # noqa: E402
+from preauth import with_cookie  # noqa: E402
+from srp_groups import add_group_arguments, library_options  # noqa: E402
 
 class AuthenticationFailed(Exception):
     """Exception levée en cas d'échec de l'authentification."""
     pass
 
-def start_user_authentication(username, password):
-    """Démarre le processus d'authentification pour l'utilisateur."""
+def start_user_authentication(username, password, **options):
+    """Démarre le processus d'authentification pour l'utilisateur (options : hash_alg et ng_type de srp)."""
     print("Starting user authentication...")
-    usr = srp.User(username, password)
+    usr = srp.User(username, password, **options)
     uname, A = usr.start_authentication()
-    A_encoded = base64.b64encode(A).decode('utf-8')
-    print(f"User authentication started. Username: {uname}, A: {A_encoded}\n")
-    return usr, uname, A_encoded
+    print(f"User authentication started. Username: {uname}, A: {A.hex()}\n")
+    return usr, uname, A
 
-def process_server_challenge(usr, s_encoded, B_encoded):
+def process_server_challenge(usr, s, B):
     """Traite le défi envoyé par le serveur."""
-    s = base64.b64decode(s_encoded)
-    B = base64.b64decode(B_encoded)
     print("Processing server challenge...")
-    M = usr.process_challenge(s, B)
-    M_encoded = base64.b64encode(M).decode('utf-8')
-    print(f"Challenge processed. M: {M_encoded}\n")
-    return M_encoded
+    M = usr.process_challenge(bytes(s), bytes(B))
+    print(f"Challenge processed. M: {M.hex() if M is not None else None}\n")
+    return M
 
-def verify_session_on_client(usr, hamk_encoded):
+def verify_session_on_client(usr, hamk):
     """Vérifie la session sur le client."""
-    hamk = base64.b64decode(hamk_encoded)
     print("Verifying session on client...")
-    usr.verify_session(hamk)
+    usr.verify_session(bytes(hamk))
     print("Session verified on client.\n")
 
 def send_to_server(conn, data):
     """Envoie les données au serveur."""
-    conn.sendall(json.dumps(data).encode('utf-8'))
+    send_message(conn, data)
 
-def receive_from_server(conn):
+def receive_from_server(reader):
     """Reçoit les données du serveur."""
-    data = conn.recv(1024)
-    return json.loads(data.decode('utf-8'))
+    return reader.receive_message()
 
 def main():
+    parser = argparse.ArgumentParser(description="Client SRP")
+    add_group_arguments(parser)
+    args = parser.parse_args()
+
     # Informations utilisateur pour l'exemple
     username = 'testuser'
     password = 'testpassword'
 
     # Début de l'authentification utilisateur
-    usr, uname, A_encoded = start_user_authentication(username, password)
+    usr, uname, A = start_user_authentication(username, password, **library_options(args.groupe, args.hachage))
 
     # Initialisation de la connexion au serveur
     conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     conn.connect(('localhost', 8080))
+    reader = FrameReader(conn)
 
     try:
         # Envoi du nom d'utilisateur et de A au serveur
-        send_to_server(conn, {'username': uname, 'A': A_encoded})
+        send_to_server(conn, {'username': uname, 'A': A})
 
         # Réception du défi du serveur
-        server_data = receive_from_server(conn)
-        s_encoded = server_data['s']
-        B_encoded = server_data['B']
+        server_data = receive_from_server(reader)
+
+        # Le serveur peut exiger un cookie de pré-authentification : le premier message est alors renvoyé avec lui
+        if 'cookie' in server_data:
+            print("Server requested a pre-authentication cookie, sending username and A again...")
+            send_to_server(conn, with_cookie({'username': uname, 'A': A}, server_data['cookie']))
+            server_data = receive_from_server(reader)
+        s = server_data.get('s')
+        B = server_data.get('B')
 
         # Si le serveur échoue à créer le challenge, l'authentification échoue
-        if s_encoded is None or B_encoded is None:
+        if s is None or B is None:
             raise AuthenticationFailed()
 
         # Le client traite le challenge du serveur
-        M_encoded = process_server_challenge(usr, s_encoded, B_encoded)
+        M = process_server_challenge(usr, s, B)
 
         # Si le client échoue à traiter le challenge, l'authentification échoue
-        if M_encoded is None:
+        if M is None:
             raise AuthenticationFailed()
 
         # Envoi de M au serveur pour vérification de la session
-        send_to_server(conn, {'M': M_encoded})
+        send_to_server(conn, {'M': M})
 
         # Réception de la vérification finale du serveur
-        server_data = receive_from_server(conn)
-        HAMK_encoded = server_data['HAMK']
+        server_data = receive_from_server(reader)
+        HAMK = server_data.get('HAMK')
 
         # Si le serveur échoue à vérifier la session, l'authentification échoue
-        if HAMK_encoded is None:
+        if HAMK is None:
             raise AuthenticationFailed()
 
         # Vérification finale de la session sur le client
-        verify_session_on_client(usr, HAMK_encoded)
+        verify_session_on_client(usr, HAMK)
 
         # Vérification que le client est authentifié
         print("Authentication process completed.")
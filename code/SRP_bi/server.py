@@ -1,103 +1,178 @@
+import argparse
+import os
 import srp
 import socket
-import json
-import base64
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from framing import FrameReader, FramingError, send_message  # noqa: E402
+from preauth import add_preauth_arguments, message_digest, preauth_from_arguments  # noqa: E402
+from srp_groups import add_group_arguments, library_options  # noqa: E402
+from verifier_store import VerifierStore  # noqa: E402
+
+CONNECTION_TIMEOUT = 10.0  # Délai maximal (s) d'attente d'un message du client
 
 class AuthenticationFailed(Exception):
     """Exception levée en cas d'échec de l'authentification."""
     pass
 
-def create_salted_verification_key(username, password):
-    """Crée une clé de vérification salée pour un utilisateur donné."""
+def create_salted_verification_key(username, password, **options):
+    """Crée une clé de vérification salée pour un utilisateur donné (options : hash_alg et ng_type de srp)."""
     print("Creating salted verification key...")
-    salt, vkey = srp.create_salted_verification_key(username, password)
-    salt_encoded = base64.b64encode(salt).decode('utf-8')
+    salt, vkey = srp.create_salted_verification_key(username, password, **options)
     print("Salt and verification key created.\n")
-    return salt_encoded, vkey
+    return salt, vkey
 
-def create_server_verifier(username, salt_encoded, vkey, A_encoded):
+def create_server_verifier(username, salt, vkey, A, **options):
     """Crée un vérificateur de serveur pour l'utilisateur."""
-    salt = base64.b64decode(salt_encoded)
-    A = base64.b64decode(A_encoded)
     print("Creating server verifier...")
-    svr = srp.Verifier(username, salt, vkey, A)
+    svr = srp.Verifier(username, salt, vkey, bytes(A), **options)
     s, B = svr.get_challenge()
-    s_encoded = base64.b64encode(s).decode('utf-8')
-    B_encoded = base64.b64encode(B).decode('utf-8')
-    print(f"Server verifier created. Salt: {s_encoded}, B: {B_encoded}\n")
-    return svr, s_encoded, B_encoded
+    print(f"Server verifier created. Salt: {s.hex() if s is not None else None}, B: {B.hex() if B is not None else None}\n")
+    return svr, s, B
 
-def verify_session_on_server(svr, M_encoded):
+def verify_session_on_server(svr, M):
     """Vérifie la session sur le serveur."""
-    M = base64.b64decode(M_encoded)
     print("Verifying session on server...")
-    HAMK = svr.verify_session(M)
-    HAMK_encoded = base64.b64encode(HAMK).decode('utf-8')
-    print(f"Session verified on server. HAMK: {HAMK_encoded}\n")
-    return HAMK_encoded
+    HAMK = svr.verify_session(bytes(M))
+    print(f"Session verified on server. HAMK: {HAMK.hex() if HAMK is not None else None}\n")
+    return HAMK
 
 def send_to_client(data, conn):
     """Envoie les données au client."""
-    conn.sendall(json.dumps(data).encode('utf-8'))
+    send_message(conn, data)
 
-def receive_from_client(conn):
+def receive_from_client(reader):
     """Reçoit les données du client."""
-    data = conn.recv(1024)
-    return json.loads(data.decode('utf-8'))
+    return reader.receive_message()
+
+def open_verifier_store(path, **options):
+    """
+    Ouvre la base des vérificateurs ; sans fichier, une base temporaire ne contient que l'utilisateur d'exemple.
+    Les vérificateurs d'une base doivent avoir été calculés avec le groupe et le hachage du serveur.
+    """
+    store = VerifierStore(path or ':memory:')
+    if path is None:
+        # Informations utilisateur pour l'exemple
+        username = 'testuser'
+        password = 'testpassword'
+
+        # Création de la clé de vérification avec salage (simulée ici)
+        store.add(username, *create_salted_verification_key(username, password, **options))
+    return store
+
+def require_cookie(conn, reader, client_data, source, cookies):
+    """
+    Pré-authentification sans état : un premier message sans cookie reçoit un cookie en réponse et doit être renvoyé
+    avec lui (et la solution du puzzle). Rien de coûteux n'est calculé ni conservé avant cette vérification.
+    :param source: Adresse du client
+    :param cookies: CookieIssuer
+    :return: Le premier message, accompagné d'un cookie valide
+    """
+    if 'cookie' not in client_data:
+        send_to_client({'cookie': cookies.issue(source)}, conn)
+        client_data = receive_from_client(reader)
+    if not cookies.check(source, client_data.get('cookie'), client_data.get('puzzle_solution'),
+                         message_digest(client_data)):
+        raise AuthenticationFailed()
+    return client_data
+
+def serve_connection(conn, source, store, options, cookies=None):
+    """
+    Authentifie le client d'une connexion.
+    :param source: Adresse du client, à laquelle les cookies sont liés
+    :param cookies: CookieIssuer exigeant un cookie avant la création du vérificateur, ou None
+    """
+    reader = FrameReader(conn)
+
+    # Réception des données de l'utilisateur
+    client_data = receive_from_client(reader)
+
+    # Pré-authentification : aucun calcul coûteux avant la vérification du cookie
+    if cookies is not None:
+        client_data = require_cookie(conn, reader, client_data, source, cookies)
+    uname = client_data.get('username')
+    A = client_data.get('A')
+    if uname is None or A is None:
+        raise AuthenticationFailed()
+
+    # Recherche du vérificateur de l'utilisateur ; un utilisateur inconnu reçoit un challenge leurre
+    salt, vkey, known = store.lookup(uname)
+
+    # Création du vérificateur du serveur
+    svr, s, B = create_server_verifier(uname, salt, vkey, A, **options)
+
+    # Si le serveur échoue à créer le challenge, l'authentification échoue
+    if s is None or B is None:
+        raise AuthenticationFailed()
+
+    print("ENVOI DE S ET B")
+    # Envoi du défi au client
+    send_to_client({'s': s, 'B': B}, conn)
+
+    # Réception de M du client pour vérification de la session
+    client_data = receive_from_client(reader)
+    M = client_data.get('M')
+
+    # Si le serveur échoue à vérifier la session, l'authentification échoue
+    if M is None:
+        raise AuthenticationFailed()
+
+    # Vérification de la session sur le serveur
+    HAMK = verify_session_on_server(svr, M)
+
+    # Envoi de la vérification finale au client
+    send_to_client({'HAMK': HAMK}, conn)
+
+    # Vérification que le serveur est authentifié
+    print("Authentication process completed.")
+    if known and svr.authenticated():
+        print("Server is authenticated.")
+    else:
+        raise AuthenticationFailed()
 
 def main():
-    # Informations utilisateur pour l'exemple (côté serveur, ces infos devraient être dans une base de données)
-    username = 'testuser'
-    password = 'testpassword'
-
-    # Création de la clé de vérification avec salage (simulée ici)
-    salt_encoded, vkey = create_salted_verification_key(username, password)
+    parser = argparse.ArgumentParser(description="Serveur SRP")
+    parser.add_argument('--base', help="Base SQLite des vérificateurs (par défaut, l'utilisateur d'exemple seul)")
+    parser.add_argument('--connexions', type=int, default=1, help="Nombre de connexions à servir (0 : sans limite)")
+    add_group_arguments(parser)
+    add_preauth_arguments(parser)
+    args = parser.parse_args()
+    options = library_options(args.groupe, args.hachage)
+    store = open_verifier_store(args.base, **options)
+    cookies, limiter = preauth_from_arguments(args)
 
     # Création du socket serveur
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.bind(('0.0.0.0', 8080))
         s.listen()
         print("Server is listening on port 8080...")
-        conn, addr = s.accept()
-        with conn:
-            print(f"Connected by {addr}")
-
-            # Réception des données de l'utilisateur
-            client_data = receive_from_client(conn)
-            uname = client_data['username']
-            A_encoded = client_data['A']
-
-            # Création du vérificateur du serveur
-            svr, s_encoded, B_encoded = create_server_verifier(uname, salt_encoded, vkey, A_encoded)
-
-            # Si le serveur échoue à créer le challenge, l'authentification échoue
-            if s_encoded is None or B_encoded is None:
-                raise AuthenticationFailed()
-
-            print("ENVOI DE S ET B")
-            # Envoi du défi au client
-            send_to_client({'s': s_encoded, 'B': B_encoded}, conn)
-
-            # Réception de M du client pour vérification de la session
-            client_data = receive_from_client(conn)
-            M_encoded = client_data['M']
-
-            # Si le serveur échoue à vérifier la session, l'authentification échoue
-            if M_encoded is None:
-                raise AuthenticationFailed()
-
-            # Vérification de la session sur le serveur
-            HAMK_encoded = verify_session_on_server(svr, M_encoded)
-
-            # Envoi de la vérification finale au client
-            send_to_client({'HAMK': HAMK_encoded}, conn)
-
-            # Vérification que le serveur est authentifié
-            print("Authentication process completed.")
-            if svr.authenticated():
-                print("Server is authenticated.")
-            else:
-                raise AuthenticationFailed()
+        served = 0
+        try:
+            while not args.connexions or served < args.connexions:
+                conn, addr = s.accept()
+                with conn:
+                    # Une source qui dépasse son débit est déconnectée sans qu'aucun message ne soit lu
+                    if limiter is not None and not limiter.allow(addr[0]):
+                        print(f"Rate limit exceeded for {addr}")
+                        continue
+                    served += 1
+                    conn.settimeout(CONNECTION_TIMEOUT)
+                    print(f"Connected by {addr}")
+                    try:
+                        serve_connection(conn, addr[0], store, options, cookies)
+                    except (AuthenticationFailed, ConnectionError, FramingError, TimeoutError) as error:
+                        print(f"Authentication failed for {addr}: {type(error).__name__}")
+        except KeyboardInterrupt:
+            pass
+        if cookies is not None:
+            metrics = cookies.metrics()
+            print(f"Cookies: {metrics['issued']} issued, {metrics['accepted']} accepted, {metrics['rejected']} rejected "
+                  f"({metrics['replayed']} replayed)")
+        if limiter is not None:
+            metrics = limiter.metrics()
+            print(f"Rate limiter: {metrics['allowed']} allowed, {metrics['refused']} refused "
+                  f"({metrics['sources']} sources)")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import srp
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from framing import FramingError, read_message, write_message  # noqa: E402
+from server import open_verifier_store  # noqa: E402
+from srp_groups import add_group_arguments, library_options  # noqa: E402
+
+EPHEMERAL_SECRET_SIZE = 32  # Taille de b attendue par srp.Verifier(bytes_b=...)
+
+
+def compute_challenge(username, salt, vkey, A, options):
+    """
+    Crée le vérificateur SRP et son challenge (exponentiation g^b), dans un processus de la réserve.
+    Le vérificateur n'est pas transférable entre processus : seul son secret éphémère b est renvoyé,
+    pour le reconstruire à l'identique lors de la vérification de la session.
+    :param options: Paramètres hash_alg et ng_type de srp
+    :return: (s, B, b), ou None si A est rejeté par le contrôle de sécurité SRP-6a
+    """
+    svr = srp.Verifier(username, salt, vkey, A, **options)
+    s, B = svr.get_challenge()
+    if s is None or B is None:
+        return None
+    return s, B, svr.get_ephemeral_secret().rjust(EPHEMERAL_SECRET_SIZE, b'\0')
+
+
+def compute_session_proof(username, salt, vkey, A, b, M, options):
+    """
+    Vérifie la preuve M du client (calcul de S = (A * v^u)^b), dans un processus de la réserve.
+    :return: HAMK si la preuve est correcte, None sinon
+    """
+    svr = srp.Verifier(username, salt, vkey, A, bytes_b=b, **options)
+    return svr.verify_session(M)
+
+
+class AsyncSRPServer:
+    def __init__(self, verifiers, workers: int = None, timeout: float = 10.0, options: dict = None):
+        """
+        Serveur SRP asyncio menant de nombreuses poignées de main en parallèle. Les exponentiations modulaires
+        sont confiées à une réserve de processus pour ne jamais bloquer la boucle d'événements.
+        :param verifiers: Base des vérificateurs (VerifierStore)
+        :param workers: Nombre de processus de calcul (par défaut, un par coeur)
+        :param timeout: Durée maximale (s) d'une poignée de main
+        :param options: Paramètres hash_alg et ng_type de srp (par défaut, ceux de la bibliothèque)
+        """
+        self.verifiers = verifiers
+        self.timeout = timeout
+        self.options = options or {}
+        self.pool = ProcessPoolExecutor(workers)
+        self.queue_depth = 0  # Calculs soumis à la réserve et non terminés
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    async def offload(self, func, *args):
+        """
+        Exécute un calcul SRP dans la réserve de processus.
+        """
+        self.queue_depth += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+        finally:
+            self.queue_depth -= 1
+
+    async def handshake(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Déroule une poignée de main SRP (mêmes messages que server.py).
+        :return: True si le client est authentifié
+        """
+        client_data = await read_message(reader)
+        uname = client_data.get('username')
+        A = client_data.get('A')
+        challenge = None
+        if uname is not None and A is not None:
+            # Un utilisateur inconnu reçoit un challenge leurre et échoue à la vérification de M
+            salt, vkey, known = self.verifiers.lookup(uname)
+            A = bytes(A)
+            challenge = await self.offload(compute_challenge, uname, salt, vkey, A, self.options)
+
+        # Si le serveur échoue à créer le challenge, les champs absents font échouer le client
+        if challenge is None:
+            write_message(writer, {})
+            await writer.drain()
+            return False
+        s, B, b = challenge
+        write_message(writer, {'s': s, 'B': B})
+        await writer.drain()
+
+        M = (await read_message(reader)).get('M')
+        HAMK = None
+        if M is not None:
+            HAMK = await self.offload(compute_session_proof, uname, salt, vkey, A, b, bytes(M), self.options)
+        write_message(writer, {'HAMK': HAMK})
+        await writer.drain()
+        return known and HAMK is not None
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.active += 1
+        try:
+            if await asyncio.wait_for(self.handshake(reader, writer), self.timeout):
+                self.completed += 1
+            else:
+                self.failed += 1
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+        except (asyncio.IncompleteReadError, ConnectionError, FramingError):
+            self.failed += 1
+        finally:
+            self.active -= 1
+            writer.close()
+
+    async def report(self, period: float = 1.0):
+        """
+        Affiche périodiquement (tant que des clients sont servis) le débit de poignées de main et la profondeur de la file de calcul.
+        """
+        last_completed, last_time = self.completed, time.perf_counter()
+        while True:
+            await asyncio.sleep(period)
+            now = time.perf_counter()
+            if self.completed == last_completed and not self.active:
+                last_time = now
+                continue
+            rate = (self.completed - last_completed) / (now - last_time)
+            print(f"{rate:.1f} poignées de main/s, file de calcul : {self.queue_depth}, en cours : {self.active}, "
+                  f"total : {self.completed} réussies, {self.failed} échouées, {self.timeouts} expirées")
+            last_completed, last_time = self.completed, now
+
+    async def serve(self, host: str, port: int):
+        tcp_server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        print(f"Server is listening on port {port}...")
+        async with tcp_server:
+            report_task = asyncio.create_task(self.report())
+            try:
+                await tcp_server.serve_forever()
+            finally:
+                report_task.cancel()
+                self.pool.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur SRP asyncio multi-clients")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None, help="Processus de calcul (un par coeur par défaut)")
+    parser.add_argument('--timeout', type=float, default=10.0, help="Durée maximale d'une poignée de main (s)")
+    parser.add_argument('--base', help="Base SQLite des vérificateurs (par défaut, l'utilisateur d'exemple seul)")
+    add_group_arguments(parser)
+    args = parser.parse_args()
+
+    options = library_options(args.groupe, args.hachage)
+    server = AsyncSRPServer(open_verifier_store(args.base, **options), args.workers, args.timeout, options)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,47 @@
 # Importation de la bibliothèque SRP
+import argparse
+import os
+import sys
 import srp
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from srp_groups import add_group_arguments, library_options  # noqa: E402
+
 
 class AuthenticationFailed(Exception):
     """Exception levée en cas d'échec de l'authentification."""
     pass
 
 
-def create_salted_verification_key(username, password):
+def create_salted_verification_key(username, password, **options):
     """
     Crée une clé de vérification salée pour un utilisateur donné.
     La clé de vérification salée doit être stockée sur le serveur.
+    Les options (hash_alg et ng_type de srp) doivent être les mêmes pour le client et le serveur.
     """
     print("Creating salted verification key...")
-    salt, vkey = srp.create_salted_verification_key(username, password)
+    salt, vkey = srp.create_salted_verification_key(username, password, **options)
     print("Salt and verification key created.\n")
     return salt, vkey
 
 
-def start_user_authentication(username, password):
+def start_user_authentication(username, password, **options):
     """
     Démarre le processus d'authentification pour l'utilisateur.
     """
     print("Starting user authentication...")
-    usr = srp.User(username, password)
+    usr = srp.User(username, password, **options)
     uname, A = usr.start_authentication()
     print(f"User authentication started. Username: {uname}, A: {A}\n")
     return usr, uname, A
 
 
-def create_server_verifier(username, salt, vkey, A):
+def create_server_verifier(username, salt, vkey, A, **options):
     """
     Crée un vérificateur de serveur pour l'utilisateur.
     """
     print("Creating server verifier...")
-    svr = srp.Verifier(username, salt, vkey, A)
+    svr = srp.Verifier(username, salt, vkey, A, **options)
     s, B = svr.get_challenge()
     print(f"Server verifier created. Salt: {s}, B: {B}\n")
     return svr, s, B
@@ -70,18 +77,23 @@ def verify_session_on_client(usr, hamk):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Authentification SRP locale")
+    add_group_arguments(parser)
+    args = parser.parse_args()
+    options = library_options(args.groupe, args.hachage)
+
     # Informations utilisateur pour l'exemple
     username = 'testuser'
     password = 'testpassword'
 
     # Création de la clé de vérification avec salage (sur serveur)
-    salt, vkey = create_salted_verification_key(username, password)
+    salt, vkey = create_salted_verification_key(username, password, **options)
 
     # Début de l'authentification utilisateur
-    usr, uname, A = start_user_authentication(username, password)
+    usr, uname, A = start_user_authentication(username, password, **options)
 
     # Envoi du nom d'utilisateur et de A au serveur et création du vérificateur du serveur
-    svr, s, B = create_server_verifier(uname, salt, vkey, A)
+    svr, s, B = create_server_verifier(uname, salt, vkey, A, **options)
 
     # Si le serveur échoue à créer le challenge, l'authentification échoue
     if s is None or B is None:
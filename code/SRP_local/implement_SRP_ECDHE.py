@@ -1,4 +1,7 @@
 # Bibliothèque
+import argparse
+import os
+import sys
 import srp
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives import serialization, hashes
@@ -6,6 +9,9 @@ from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import time
 import psutil
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from srp_groups import add_group_arguments, library_options  # noqa: E402
+
 
 ########################################
 #         Monitoring et Erreur         #
@@ -87,34 +93,35 @@ def derive_shared_key(private_key, peer_public_key):
 ########################################
 #                SRP                   #
 ########################################
-def create_salted_verification_key(username, password):
+def create_salted_verification_key(username, password, **options):
     """
     Crée une clé de vérification + salage pour un utilisateur.
     La clé de vérification + salage et stocké sur le serv.
+    Les options (hash_alg et ng_type de srp) doivent être les mêmes pour le client et le serveur.
     """
     print("Creating salted verification key...")
-    salt, vkey = srp.create_salted_verification_key(username, password)
+    salt, vkey = srp.create_salted_verification_key(username, password, **options)
     print("Salt and verification key created.\n")
     return salt, vkey
 
 
-def start_user_authentication(username, password):
+def start_user_authentication(username, password, **options):
     """
     Démarre le processus d'authentification pour l'utilisateur.
     """
     print("Starting user authentication...")
-    usr = srp.User(username, password)
+    usr = srp.User(username, password, **options)
     uname, A = usr.start_authentication()
     print(f"User authentication started. Username: {uname}, A: {A}\n")
     return usr, uname, A
 
 
-def create_server_verifier(username, salt, vkey, A):
+def create_server_verifier(username, salt, vkey, A, **options):
     """
     Crée un vérificateur de serveur pour l'utilisateur.
     """
     print("Creating server verifier...")
-    svr = srp.Verifier(username, salt, vkey, A)
+    svr = srp.Verifier(username, salt, vkey, A, **options)
     s, B = svr.get_challenge()
     print(f"Server verifier created. Salt: {s}, B: {B}\n")
     return svr, s, B
@@ -150,20 +157,21 @@ def verify_session_on_client(usr, hamk):
 
 
 @measure_performance
-def authentication_process():
+def authentication_process(**options):
     """
     Implémentation complète de SRP avec ECDHE.
+    @param options: Paramètres hash_alg et ng_type de srp.
     """
     # Initialisation de la clé de vérification salée
     username = 'testuser'
     password = 'testpassword'
-    salt, vkey = create_salted_verification_key(username, password)
+    salt, vkey = create_salted_verification_key(username, password, **options)
 
     # Démarrage de l'authentification utilisateur
-    usr, uname, A = start_user_authentication(username, password)
+    usr, uname, A = start_user_authentication(username, password, **options)
 
     # Création du vérificateur du serveur
-    svr, s, B = create_server_verifier(uname, salt, vkey, A)
+    svr, s, B = create_server_verifier(uname, salt, vkey, A, **options)
 
     if s is None or B is None:
         raise AuthenticationFailed()
@@ -210,5 +218,9 @@ def authentication_process():
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Authentification SRP + ECDHE locale")
+    add_group_arguments(parser)
+    args = parser.parse_args()
+
     # Lancer le processus d'authentification
-    authentication_process()
+    authentication_process(**library_options(args.groupe, args.hachage))
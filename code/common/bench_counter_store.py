@@ -0,0 +1,39 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from counter_store import SQLiteCounterStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure du débit du stockage persistant des compteurs")
+    parser.add_argument('--devices', type=int, default=50000)
+    parser.add_argument('--updates', type=int, default=500000)
+    parser.add_argument('--batch-size', type=int, default=4096)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'compteurs.db')
+        counters = [0] * args.devices
+
+        with SQLiteCounterStore(path, batch_size=args.batch_size) as store:
+            start_time = time.perf_counter()
+            for _ in range(args.updates):
+                device_id = random.randrange(args.devices)
+                counters[device_id] += 1
+                store.set(device_id, counters[device_id])
+            store.flush()
+            elapsed = time.perf_counter() - start_time
+        print(f"{args.updates} mises à jour en {elapsed:.2f} s : {args.updates / elapsed:.0f} mises à jour/s")
+
+        start_time = time.perf_counter()
+        with SQLiteCounterStore(path) as store:
+            loaded = store.load_all()
+        elapsed = time.perf_counter() - start_time
+        assert all(loaded.get(device_id, 0) == counter for device_id, counter in enumerate(counters))
+        print(f"{len(loaded)} compteurs rechargés en {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
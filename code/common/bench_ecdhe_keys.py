@@ -0,0 +1,43 @@
+import argparse
+import time
+from ecdhe_keys import ENCODINGS, deserialize_public_key, exchange, generate_key_pair, serialize_public_key
+from framing import encode_message
+
+
+def per_call(func, repetitions: int):
+    """
+    :return: Durée moyenne (s) d'un appel à func
+    """
+    start_time = time.perf_counter()
+    for _ in range(repetitions):
+        func()
+    return (time.perf_counter() - start_time) / repetitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Taille et coût des encodages de clé publique ECDHE")
+    parser.add_argument('--repetitions', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'Encodage':<10} | {'Clé':>5} | {'Trame':>5} | {'Sérialisation':>13} | {'Analyse':>9} | {'ECDHE complet':>13}")
+    for encoding in ENCODINGS:
+        _, public_key = generate_key_pair(encoding)
+        data = serialize_public_key(public_key, encoding)
+        # Trame du premier message du client : clé et encodages proposés
+        frame = encode_message({'client_public_key': data, 'key_encoding': encoding})
+
+        serialize_time = per_call(lambda: serialize_public_key(public_key, encoding), args.repetitions)
+        parse_time = per_call(lambda: deserialize_public_key(data, encoding), args.repetitions)
+
+        def full_exchange():
+            # Ce que fait chaque côté : génération, sérialisation, analyse de la clé du pair, secret partagé
+            own_private_key, own_public_key = generate_key_pair(encoding)
+            serialize_public_key(own_public_key, encoding)
+            exchange(own_private_key, deserialize_public_key(data, encoding))
+        exchange_time = per_call(full_exchange, args.repetitions // 4)
+        print(f"{encoding:<10} | {len(data):>5} | {len(frame):>5} | {serialize_time * 1e6:10.1f} µs | "
+              f"{parse_time * 1e6:6.1f} µs | {exchange_time * 1e6:10.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
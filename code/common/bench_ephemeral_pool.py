@@ -0,0 +1,69 @@
+import argparse
+import secrets
+import statistics
+import time
+from cryptography.hazmat.primitives.asymmetric import ec
+from ecdsa import SECP256k1, SigningKey
+from ephemeral_pool import EphemeralPool
+from fixed_base import fixed_base_table
+from srp_groups import GROUPS
+
+
+def srp_ephemeral_factory(group: int):
+    """
+    :return: Fonction produisant (b, g^b) dans le groupe donné, comme le récepteur sans bibliothèque
+    """
+    N, g = GROUPS[group]
+    table = fixed_base_table(g, N)
+
+    def make():
+        b = secrets.randbits(256)
+        return b, table.pow(b)
+    return make
+
+
+def bursts(take, burst: int, count: int, idle: float):
+    """
+    Salves de burst demandes simultanées séparées de idle secondes d'inactivité.
+    :return: Délais (s) d'obtention de la valeur éphémère de chaque demande, mesurés depuis le début de sa salve
+    """
+    delays = []
+    for _ in range(count):
+        time.sleep(idle)
+        start_time = time.perf_counter()
+        for _ in range(burst):
+            take()
+            delays.append(time.perf_counter() - start_time)
+    return delays
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Délai de première réponse avec et sans réserve de valeurs éphémères")
+    parser.add_argument('--salve', type=int, default=16, help="Demandes simultanées par salve")
+    parser.add_argument('--salves', type=int, default=10)
+    parser.add_argument('--inactivite', type=float, default=0.5, help="Durée (s) entre deux salves")
+    parser.add_argument('--reserve', type=int, default=32)
+    args = parser.parse_args()
+
+    workloads = [
+        ("b, g^b (groupe 2048, table de g)", srp_ephemeral_factory(2048)),
+        ("b, g^b (groupe 4096, table de g)", srp_ephemeral_factory(4096)),
+        ("ECDHE P-256 (cryptography)", lambda: ec.generate_private_key(ec.SECP256R1())),
+        ("ECDHE secp256k1 (ecdsa)", lambda: SigningKey.generate(curve=SECP256k1)),
+    ]
+    for name, factory in workloads:
+        factory()  # Construction des tables hors mesure
+        inline = bursts(factory, args.salve, args.salves, 0.0)
+        with EphemeralPool(factory, args.reserve) as pool:
+            pooled = bursts(pool.take, args.salve, args.salves, args.inactivite)
+            metrics = pool.metrics()
+        print(name)
+        for label, delays in (("  à la demande", inline), ("  réserve", pooled)):
+            print(f"{label:<14}: délai moyen {statistics.mean(delays) * 1000:7.3f} ms, "
+                  f"dernier de la salve {max(delays) * 1000:7.3f} ms")
+        print(f"  réserve : {metrics['hit_rate']:.0%} de succès, {metrics['exhaustions']} épuisements, "
+              f"remplissage {metrics['refill_rate']:.0f} valeurs/s")
+
+
+if __name__ == "__main__":
+    main()
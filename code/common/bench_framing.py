@@ -0,0 +1,144 @@
+import base64
+import json
+import socket
+import statistics
+import threading
+import time
+import srp
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives import serialization
+from framing import FrameReader, encode_message
+
+
+class JsonCodec:
+    """
+    Encodage historique : JSON dont les valeurs binaires sont en base64, lu par un unique recv.
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+
+    def send(self, fields: dict):
+        data = {name: value if isinstance(value, str) else base64.b64encode(value).decode('utf-8')
+                for name, value in fields.items()}
+        payload = json.dumps(data).encode('utf-8')
+        self.sock.sendall(payload)
+        return len(payload)
+
+    def receive(self):
+        data = json.loads(self.sock.recv(4096).decode('utf-8'))
+        return {name: value if name == 'username' else base64.b64decode(value) for name, value in data.items()}
+
+
+class BinaryCodec:
+    """
+    Trames binaires préfixées par leur longueur (framing.py).
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = FrameReader(sock)
+
+    def send(self, fields: dict):
+        frame = encode_message(fields)
+        self.sock.sendall(frame)
+        return len(frame)
+
+    def receive(self):
+        return self.reader.receive_message()
+
+
+def handshake_messages():
+    """
+    Messages d'une poignée de main SRP + ECDHE (mêmes champs que SRP_ECDHE_bi), pour mesurer leur taille.
+    """
+    public_key = ec.generate_private_key(ec.SECP256R1()).public_key()
+    pem = public_key.public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    salt, vkey = srp.create_salted_verification_key('testuser', 'testpassword')
+    usr = srp.User('testuser', 'testpassword')
+    uname, A = usr.start_authentication()
+    svr = srp.Verifier(uname, salt, vkey, A)
+    s, B = svr.get_challenge()
+    M = usr.process_challenge(s, B)
+    HAMK = svr.verify_session(M)
+    shared_key = bytes(32)
+    return [{'client_public_key': pem}, {'server_public_key': pem}, {'shared_key_client': shared_key},
+            {'shared_key_server': shared_key}, {'username': uname, 'A': A}, {'s': s, 'B': B}, {'M': M}, {'HAMK': HAMK}]
+
+
+def srp_handshake(codec_class, salt, vkey):
+    """
+    Poignée de main SRP complète entre deux threads reliés par une paire de sockets.
+    :return: Durée de la poignée de main (s)
+    """
+    client_sock, server_sock = socket.socketpair()
+
+    def server():
+        codec = codec_class(server_sock)
+        client_data = codec.receive()
+        svr = srp.Verifier(client_data['username'], salt, vkey, bytes(client_data['A']))
+        s, B = svr.get_challenge()
+        codec.send({'s': s, 'B': B})
+        HAMK = svr.verify_session(bytes(codec.receive()['M']))
+        codec.send({'HAMK': HAMK})
+
+    thread = threading.Thread(target=server)
+    thread.start()
+    start_time = time.perf_counter()
+    codec = codec_class(client_sock)
+    usr = srp.User('testuser', 'testpassword')
+    uname, A = usr.start_authentication()
+    codec.send({'username': uname, 'A': A})
+    server_data = codec.receive()
+    M = usr.process_challenge(bytes(server_data['s']), bytes(server_data['B']))
+    codec.send({'M': M})
+    usr.verify_session(bytes(codec.receive()['HAMK']))
+    elapsed = time.perf_counter() - start_time
+    thread.join()
+    client_sock.close()
+    server_sock.close()
+    assert usr.authenticated()
+    return elapsed
+
+
+def codec_round_trip(codec_class, messages, repetitions: int):
+    """
+    Temps d'encodage + décodage de tous les messages de la poignée de main, sans calcul SRP.
+    :return: Durée moyenne par poignée de main (s)
+    """
+    client_sock, server_sock = socket.socketpair()
+    sender, receiver = codec_class(client_sock), codec_class(server_sock)
+    start_time = time.perf_counter()
+    for _ in range(repetitions):
+        for message in messages:
+            sender.send(message)
+            receiver.receive()
+    elapsed = time.perf_counter() - start_time
+    client_sock.close()
+    server_sock.close()
+    return elapsed / repetitions
+
+
+def main():
+    messages = handshake_messages()
+    json_sizes = [len(json.dumps({name: value if isinstance(value, str) else base64.b64encode(value).decode('utf-8')
+                                  for name, value in message.items()}).encode('utf-8')) for message in messages]
+    binary_sizes = [len(encode_message(message)) for message in messages]
+    print(f"{'Message':<22} | {'JSON/base64':>11} | {'Binaire':>8}")
+    for message, json_size, binary_size in zip(messages, json_sizes, binary_sizes):
+        print(f"{'+'.join(message):<22} | {json_size:>11} | {binary_size:>8}")
+    print(f"{'Total (octets)':<22} | {sum(json_sizes):>11} | {sum(binary_sizes):>8}")
+
+    print()
+    for name, codec_class in (('JSON/base64', JsonCodec), ('Binaire', BinaryCodec)):
+        codec_time = codec_round_trip(codec_class, messages, 2000)
+        print(f"{name:<12}: encodage + transport + décodage {codec_time * 1e6:8.1f} µs par poignée de main")
+
+    salt, vkey = srp.create_salted_verification_key('testuser', 'testpassword')
+    for name, codec_class in (('JSON/base64', JsonCodec), ('Binaire', BinaryCodec)):
+        durations = [srp_handshake(codec_class, salt, vkey) for _ in range(50)]
+        print(f"{name:<12}: poignée de main SRP complète, médiane {statistics.median(durations) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import socket
+import threading
+import time
+from record_channel import CIPHERS, RecordChannel
+
+
+def transfer(cipher, record_size: int, total_size: int):
+    """
+    Envoie total_size octets sur une paire de sockets, chiffrés par enregistrements de record_size octets
+    (cipher None : socket en clair), et mesure le débit vu par le récepteur.
+    :return: Débit (Mo/s)
+    """
+    sender_sock, receiver_sock = socket.socketpair()
+    session_key = os.urandom(32)
+    data = os.urandom(record_size)
+    count = total_size // record_size
+
+    def send():
+        if cipher is None:
+            for _ in range(count):
+                sender_sock.sendall(data)
+        else:
+            channel = RecordChannel(sender_sock, session_key, 'client', cipher, record_size=record_size)
+            for _ in range(count):
+                channel.send_record(data)
+        sender_sock.shutdown(socket.SHUT_WR)
+
+    thread = threading.Thread(target=send)
+    start_time = time.perf_counter()
+    thread.start()
+    received = 0
+    if cipher is None:
+        buffer = memoryview(bytearray(record_size))
+        while chunk := receiver_sock.recv_into(buffer):
+            received += chunk
+    else:
+        channel = RecordChannel(receiver_sock, session_key, 'server', cipher, record_size=record_size)
+        while (record := channel.receive_record()) is not None:
+            received += len(record)
+    elapsed = time.perf_counter() - start_time
+    thread.join()
+    sender_sock.close()
+    receiver_sock.close()
+    assert received == count * record_size
+    return received / elapsed / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit du canal chiffré sur une connexion")
+    parser.add_argument('--volume', type=int, default=256, help="Volume transféré par mesure (Mio)")
+    parser.add_argument('--tailles', type=int, nargs='+', default=[1024, 16384, 65536, 1 << 20, 1 << 24],
+                        help="Tailles d'enregistrement (octets)")
+    args = parser.parse_args()
+
+    total_size = args.volume << 20
+    columns = [None, *CIPHERS]
+    print(f"{'Enregistrement':>14} | " + " | ".join(f"{name or 'clair':>17}" for name in columns) + "  (Mo/s)")
+    for record_size in args.tailles:
+        rates = [transfer(cipher, record_size, max(total_size, record_size)) for cipher in columns]
+        print(f"{record_size:>14} | " + " | ".join(f"{rate:>17.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import secrets
+import statistics
+import time
+import srp
+from fixed_base import FixedBaseTable
+from srp_groups import GROUPS, library_options
+
+
+def library_handshake(salt: bytes, vkey: bytes, options: dict):
+    """
+    Poignée de main SRP complète avec la bibliothèque srp, sans réseau.
+    :return: Durées (s) côté client et côté serveur
+    """
+    start_time = time.perf_counter()
+    usr = srp.User('testuser', 'testpassword', **options)
+    uname, A = usr.start_authentication()
+    client_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    svr = srp.Verifier(uname, salt, vkey, A, **options)
+    s, B = svr.get_challenge()
+    server_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    M = usr.process_challenge(s, B)
+    client_time += time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    HAMK = svr.verify_session(M)
+    server_time += time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    usr.verify_session(HAMK)
+    client_time += time.perf_counter() - start_time
+    assert usr.authenticated() and svr.authenticated()
+    return client_time, server_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coût d'une poignée de main SRP selon le groupe et le hachage")
+    parser.add_argument('--repetitions', type=int, default=30)
+    parser.add_argument('--hachages', nargs='+', default=['sha1', 'sha256', 'sha512'])
+    args = parser.parse_args()
+
+    print("Bibliothèque srp : médiane par poignée de main (ms)")
+    print(f"{'Groupe':>6} | {'Hachage':<7} | {'Client':>8} | {'Serveur':>8} | {'Total':>8}")
+    for group in GROUPS:
+        for hash_name in args.hachages:
+            options = library_options(group, hash_name)
+            salt, vkey = srp.create_salted_verification_key('testuser', 'testpassword', **options)
+            timings = [library_handshake(salt, vkey, options) for _ in range(args.repetitions)]
+            client = statistics.median(client for client, _ in timings)
+            server = statistics.median(server for _, server in timings)
+            print(f"{group:>6} | {hash_name:<7} | {client * 1000:8.2f} | {server * 1000:8.2f} | "
+                  f"{(client + server) * 1000:8.2f}")
+
+    print()
+    print("Sans bibliothèque : g^e mod N pour un exposant de 256 bits (A = g^a, g^b dans B, v = g^x)")
+    print(f"{'Groupe':>6} | {'pow (µs)':>9} | {'Table (µs)':>10} | {'Gain':>5} | {'Construction':>12} | {'Taille':>8}")
+    for group, (N, g) in GROUPS.items():
+        start_time = time.perf_counter()
+        table = FixedBaseTable(g, N)
+        build_time = time.perf_counter() - start_time
+        exponents = [secrets.randbits(256) for _ in range(10 * args.repetitions)]
+        assert all(table.pow(e) == pow(g, e, N) for e in exponents[:5])
+
+        start_time = time.perf_counter()
+        for e in exponents:
+            pow(g, e, N)
+        pow_time = (time.perf_counter() - start_time) / len(exponents)
+        start_time = time.perf_counter()
+        for e in exponents:
+            table.pow(e)
+        table_time = (time.perf_counter() - start_time) / len(exponents)
+        size = sum(len(row) for row in table.rows) * group / 8 / 2**20
+        print(f"{group:>6} | {pow_time * 1e6:9.0f} | {table_time * 1e6:10.0f} | {pow_time / table_time:4.1f}x | "
+              f"{build_time * 1000:9.0f} ms | {size:4.1f} Mio")
+
+
+if __name__ == "__main__":
+    main()
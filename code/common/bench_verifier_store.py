@@ -0,0 +1,66 @@
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from verifier_store import VerifierStore
+
+
+def synthetic_verifiers(count: int, vkey_size: int = 256):
+    """
+    Vérificateurs factices (sel de 4 octets, clé de la taille d'un groupe de 2048 bits) : le coût d'une
+    recherche ne dépend pas du contenu, et calculer de vrais vérificateurs prendrait plusieurs minutes.
+    """
+    for index in range(count):
+        yield f"user{index}", random.randbytes(4), random.randbytes(vkey_size)
+
+
+def measure_lookups(store: VerifierStore, usernames: list):
+    """
+    :return: Latences (s) de chaque recherche, effectuées à la suite
+    """
+    latencies = []
+    clock = time.perf_counter
+    for username in usernames:
+        start_time = clock()
+        entry = store.get(username)
+        latencies.append(clock() - start_time)
+        assert entry is not None
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure de la base des vérificateurs SRP")
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--lookups', type=int, default=200000)
+    parser.add_argument('--cache-size', type=int, default=65536)
+    parser.add_argument('--hot-users', type=int, default=10000, help="Taille de l'ensemble des utilisateurs actifs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'verificateurs.db')
+        with VerifierStore(path, args.cache_size) as store:
+            start_time = time.perf_counter()
+            imported = store.import_many(synthetic_verifiers(args.users))
+            elapsed = time.perf_counter() - start_time
+        print(f"Import de {imported} vérificateurs en {elapsed:.2f} s : {imported / elapsed:,.0f} vérificateurs/s, "
+              f"base de {os.path.getsize(path) / 2**20:.0f} Mio")
+
+        # Charge uniforme sur toute la base (presque uniquement des défauts de cache), puis charge concentrée
+        # sur un ensemble d'utilisateurs actifs (90 % des connexions), comme des badges utilisés tous les jours
+        uniform = [f"user{random.randrange(args.users)}" for _ in range(args.lookups)]
+        hot = [f"user{random.randrange(args.hot_users)}" if random.random() < 0.9
+               else f"user{random.randrange(args.users)}" for _ in range(args.lookups)]
+        for name, usernames in (('Uniforme', uniform), ('Concentrée', hot)):
+            with VerifierStore(path, args.cache_size) as store:
+                start_time = time.perf_counter()
+                latencies = measure_lookups(store, usernames)
+                elapsed = time.perf_counter() - start_time
+                quantiles = statistics.quantiles(latencies, n=100)
+                print(f"{name:<10}: {len(usernames) / elapsed:,.0f} recherches/s, p50 {quantiles[49] * 1e6:.1f} µs, "
+                      f"p99 {quantiles[98] * 1e6:.1f} µs, cache {store.hits / len(usernames):.0%} de succès")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+
+
+class CounterStore(ABC):
+    """
+    Interface d'un stockage persistant des compteurs de codes roulants, indexés par identifiant d'appareil.
+    Les écritures sont regroupées : set() ne fait que mémoriser la valeur, flush() la rend durable.
+    Un récepteur doit appeler flush() avant d'acquitter un code accepté : un compteur perdu dans un arrêt brutal
+    reviendrait en arrière au redémarrage, et les codes déjà acceptés redeviendraient valides (rejeu).
+    """
+
+    @abstractmethod
+    def load_all(self):
+        """
+        :return: Renvoie tous les compteurs stockés en une seule lecture, sous forme {device_id: compteur}
+        """
+
+    @abstractmethod
+    def set(self, device_id: int, counter: int):
+        """
+        Enregistre le nouveau compteur d'un appareil (rendu durable au prochain flush).
+        :param device_id: Identifiant de l'appareil
+        :param counter:   Nouveau compteur
+        """
+
+    def flush(self):
+        """
+        Ecrit toutes les mises à jour en attente.
+        """
+
+    def close(self):
+        """
+        Ecrit les mises à jour en attente et libère le stockage.
+        """
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class MemoryCounterStore(CounterStore):
+    def __init__(self):
+        """
+        Stockage en mémoire, sans persistance (comportement historique des récepteurs).
+        """
+        self.counters = {}
+
+    def load_all(self):
+        return dict(self.counters)
+
+    def set(self, device_id: int, counter: int):
+        self.counters[device_id] = counter
+
+
+class SQLiteCounterStore(CounterStore):
+    def __init__(self, path: str, batch_size: int = 4096, flush_interval: float = 0.05):
+        """
+        Stockage SQLite en mode WAL avec validation groupée (group commit).
+        Les mises à jour sont fusionnées par appareil puis écrites en une seule transaction, lorsque batch_size
+        appareils sont en attente, que flush_interval secondes se sont écoulées depuis la dernière écriture, ou que
+        le récepteur appelle flush() avant d'acquitter ses codes acceptés. Chaque transaction est synchronisée sur
+        disque (synchronous=FULL) : un compteur écrit par flush() survit à un arrêt brutal ou à une coupure de courant.
+        :param path:           Chemin du fichier de base de données
+        :param batch_size:     Nombre d'appareils en attente déclenchant une écriture
+        :param flush_interval: Délai maximal (s) entre deux écritures lorsque des mises à jour sont en attente
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=FULL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS counters (device_id INTEGER PRIMARY KEY, counter INTEGER NOT NULL)')
+        self.connection.commit()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = {}
+        self.last_flush = time.monotonic()
+
+    def load_all(self):
+        return dict(self.connection.execute('SELECT device_id, counter FROM counters'))
+
+    def set(self, device_id: int, counter: int):
+        self.pending[device_id] = counter
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT INTO counters (device_id, counter) VALUES (?, ?) '
+                    'ON CONFLICT(device_id) DO UPDATE SET counter = excluded.counter',
+                    self.pending.items())
+            self.pending.clear()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
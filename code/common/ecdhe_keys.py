@@ -0,0 +1,124 @@
+import hashlib
+import hmac
+from cryptography.hazmat.primitives.asymmetric import ec, x25519
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+# Encodages de clé publique ECDHE, du plus compact au plus verbeux :
+# - x25519 : clé X25519 brute (32 octets)
+# - compressed : point P-256 compressé X9.62 (33 octets : parité de y puis x)
+# - pem : SubjectPublicKeyInfo P-256 en PEM (178 octets), encodage historique
+ENCODINGS = ('x25519', 'compressed', 'pem')
+DEFAULT_ENCODING = 'pem'  # Encodage supposé lorsque le pair n'en annonce aucun
+
+
+def generate_key_pair(encoding: str = DEFAULT_ENCODING):
+    """
+    Génère une paire de clés éphémère sur la courbe de l'encodage (Curve25519 pour x25519, P-256 sinon).
+    :param encoding: Encodage de clé publique négocié
+    :return: Tuple (clé privée, clé publique)
+    """
+    if encoding == 'x25519':
+        private_key = x25519.X25519PrivateKey.generate()
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    return private_key, private_key.public_key()
+
+
+def serialize_public_key(public_key, encoding: str = DEFAULT_ENCODING):
+    """
+    :param public_key: Clé publique générée pour cet encodage
+    :param encoding: Encodage de clé publique
+    :return: La clé publique encodée
+    """
+    if encoding == 'x25519':
+        return public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    if encoding == 'compressed':
+        return public_key.public_bytes(serialization.Encoding.X962, serialization.PublicFormat.CompressedPoint)
+    return public_key.public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+
+
+def deserialize_public_key(data: bytes, encoding: str = DEFAULT_ENCODING):
+    """
+    Décode une clé publique ; un point compressé est décompressé et vérifié sur la courbe.
+    :param data: Clé publique encodée
+    :param encoding: Encodage de clé publique
+    :return: La clé publique
+    :raise ValueError: Si la clé est malformée, hors de la courbe ou d'un autre type que celui de l'encodage
+    """
+    if encoding == 'x25519':
+        return x25519.X25519PublicKey.from_public_bytes(data)
+    if encoding == 'compressed':
+        return ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256R1(), data)
+    public_key = serialization.load_pem_public_key(data)
+    if not isinstance(public_key, ec.EllipticCurvePublicKey) or not isinstance(public_key.curve, ec.SECP256R1):
+        raise ValueError("La clé publique PEM n'est pas une clé P-256")
+    return public_key
+
+
+def exchange(private_key, peer_public_key):
+    """
+    :return: Le secret ECDH brut (32 octets), avant dérivation de clé
+    """
+    if isinstance(private_key, x25519.X25519PrivateKey):
+        return private_key.exchange(peer_public_key)
+    return private_key.exchange(ec.ECDH(), peer_public_key)
+
+
+def parse_offer(offer: str):
+    """
+    :param offer: Encodages annoncés par le client, par ordre de préférence, séparés par des virgules (None : pem)
+    :return: Liste des encodages annoncés
+    """
+    return offer.split(',') if offer else [DEFAULT_ENCODING]
+
+
+def choose_encoding(offer: list, supported):
+    """
+    :param offer: Encodages annoncés par le client, par ordre de préférence
+    :param supported: Encodages acceptés par le serveur
+    :return: Le premier encodage annoncé accepté par le serveur, ou None
+    """
+    return next((encoding for encoding in offer if encoding in supported), None)
+
+
+def transcript_hash(*messages):
+    """
+    Condensé des valeurs échangées pendant la poignée de main (chaque valeur préfixée par sa longueur).
+    :param messages: Valeurs (bytes ou str) dans l'ordre du protocole
+    :return: SHA-256 du transcript
+    """
+    digest = hashlib.sha256()
+    for message in messages:
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        digest.update(len(message).to_bytes(4, 'big'))
+        digest.update(message)
+    return digest.digest()
+
+
+def bind_session_key(srp_key: bytes, ecdhe_key: bytes, transcript: bytes):
+    """
+    Clé de session liant le secret SRP K, le secret ECDHE et le transcript : un intermédiaire qui substitue ses
+    propres clés ECDHE ne peut pas la calculer sans connaître K, donc sans le mot de passe ou le vérificateur.
+    :param srp_key: Clé de session SRP (K)
+    :param ecdhe_key: Secret ECDHE dérivé
+    :param transcript: Condensé du transcript (transcript_hash)
+    :return: Clé de session de 32 octets
+    """
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=srp_key,
+        info=b'SRP-ECDHE session ' + transcript
+    ).derive(ecdhe_key)
+
+
+def handshake_proof(session_key: bytes, role: str):
+    """
+    Preuve de possession de la clé de session, distincte pour le client et le serveur.
+    :param session_key: Clé de session (bind_session_key)
+    :param role: 'client' ou 'server'
+    :return: HMAC-SHA256 de 32 octets
+    """
+    return hmac.new(session_key, b'finished ' + role.encode(), hashlib.sha256).digest()
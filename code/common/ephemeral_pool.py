@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import deque
+
+
+class EphemeralPool:
+    def __init__(self, factory, pool_size: int = 64, refill_threshold: int = None):
+        """
+        Réserve de valeurs éphémères à usage unique (secret et partie publique d'une poignée de main),
+        précalculées par un thread de fond pendant les temps morts. Chaque valeur n'est remise qu'une seule fois ;
+        si la réserve est vide, la valeur est calculée à la demande et l'épuisement est comptabilisé.
+        :param factory: Fonction sans argument produisant une nouvelle valeur éphémère
+        :param pool_size: Nombre maximal de valeurs en réserve
+        :param refill_threshold: Niveau de la réserve en dessous duquel le remplissage est relancé
+        """
+        self.factory = factory
+        self.pool_size = pool_size
+        self.refill_threshold = pool_size // 2 if refill_threshold is None else refill_threshold
+        self.pool = deque()
+        self.lock = threading.Lock()
+        self.refill_needed = threading.Event()
+        self.closed = False
+
+        # Métriques
+        self.hits = 0
+        self.exhaustions = 0  # Valeurs demandées alors que la réserve était vide
+        self.generated = 0
+        self.refill_time = 0.0
+
+        self.refill_needed.set()
+        self.thread = threading.Thread(target=self.__refill_loop, daemon=True)
+        self.thread.start()
+
+    def __refill_loop(self):
+        """
+        Complète la réserve valeur par valeur, pour que chacune soit disponible dès qu'elle est calculée.
+        """
+        while not self.closed:
+            self.refill_needed.wait()
+            self.refill_needed.clear()
+            while not self.closed and len(self.pool) < self.pool_size:
+                start_time = time.perf_counter()
+                value = self.factory()
+                self.refill_time += time.perf_counter() - start_time
+                self.generated += 1
+                with self.lock:
+                    self.pool.append(value)
+
+    def take(self):
+        """
+        Remet une valeur éphémère, retirée définitivement de la réserve.
+        :return: Valeur produite par factory
+        """
+        with self.lock:
+            value = self.pool.popleft() if self.pool else None
+            remaining = len(self.pool)
+        if remaining < self.refill_threshold:
+            self.refill_needed.set()
+        if value is None:
+            self.exhaustions += 1
+            return self.factory()
+        self.hits += 1
+        return value
+
+    def metrics(self):
+        """
+        :return: Taux de succès, épuisements et débit de remplissage de la réserve
+        """
+        served = self.hits + self.exhaustions
+        return {
+            'hit_rate': self.hits / served if served else 1.0,
+            'hits': self.hits,
+            'exhaustions': self.exhaustions,
+            'pool_level': len(self.pool),
+            'generated': self.generated,
+            'refill_rate': self.generated / self.refill_time if self.refill_time else 0.0,
+        }
+
+    def close(self):
+        """
+        Arrête le thread de remplissage (la valeur en cours de calcul est menée à son terme).
+        """
+        self.closed = True
+        self.refill_needed.set()
+        self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
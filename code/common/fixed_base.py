@@ -0,0 +1,50 @@
+from functools import lru_cache
+
+
+class FixedBaseTable:
+    def __init__(self, base: int, modulus: int, exponent_bits: int = 256, window: int = 8):
+        """
+        Exponentiation modulaire à base fixe par fenêtres précalculées : la ligne i de la table contient
+        base^(d * 2^(window * i)) pour tous les chiffres d de la fenêtre. base^e n'est alors qu'un produit d'une
+        entrée par fenêtre de l'exposant, sans aucune élévation au carré
+        (ceil(exponent_bits / window) multiplications au lieu d'environ 1.2 * exponent_bits pour pow()).
+        :param base: Base fixe (générateur g du groupe)
+        :param modulus: Module N
+        :param exponent_bits: Taille maximale des exposants accélérés (les plus grands passent par pow())
+        :param window: Largeur des fenêtres (bits) ; la table occupe ceil(exponent_bits / window) * 2^window entiers
+        """
+        self.base = base
+        self.modulus = modulus
+        self.exponent_bits = exponent_bits
+        self.window = window
+        self.rows = []
+        power = base % modulus
+        for _ in range(-(-exponent_bits // window)):
+            row = [1, power]
+            for _ in range(2, 1 << window):
+                row.append(row[-1] * power % modulus)
+            self.rows.append(row)
+            power = row[-1] * power % modulus  # power^(2^window), base de la fenêtre suivante
+
+    def pow(self, exponent: int):
+        """
+        :param exponent: Exposant positif
+        :return: base^exponent mod modulus
+        """
+        if exponent < 0 or exponent.bit_length() > self.exponent_bits:
+            return pow(self.base, exponent, self.modulus)
+        modulus = self.modulus
+        mask = (1 << self.window) - 1
+        result = 1
+        for row in self.rows:
+            result = result * row[exponent & mask] % modulus
+            exponent >>= self.window
+        return result
+
+
+@lru_cache(maxsize=None)
+def fixed_base_table(base: int, modulus: int, exponent_bits: int = 256, window: int = 8):
+    """
+    Table partagée pour un couple (g, N) : elle n'est construite qu'une fois par processus.
+    """
+    return FixedBaseTable(base, modulus, exponent_bits, window)
@@ -0,0 +1,174 @@
+import struct
+
+# Trame : longueur de la charge utile (32 bits big-endian) puis une suite de champs typés.
+# Champ : type (1 octet), longueur (16 bits big-endian), valeur brute.
+FRAME_HEADER = struct.Struct('>I')
+FIELD_HEADER = struct.Struct('>BH')
+MAX_FRAME_SIZE = 1 << 20
+
+# Nom du champ -> (identifiant sur le fil, type Python de la valeur)
+FIELDS = {
+    'username': (1, str),
+    'A': (2, bytes),
+    's': (3, bytes),
+    'B': (4, bytes),
+    'M': (5, bytes),
+    'HAMK': (6, bytes),
+    'client_public_key': (7, bytes),
+    'server_public_key': (8, bytes),
+    'shared_key_client': (9, bytes),
+    'shared_key_server': (10, bytes),
+    'key_encoding': (11, str),
+    'client_proof': (12, bytes),
+    'server_proof': (13, bytes),
+    'ticket': (14, bytes),
+    'client_nonce': (15, bytes),
+    'server_nonce': (16, bytes),
+    'cipher': (17, str),
+    'cookie': (18, bytes),
+    'puzzle_solution': (19, bytes),
+}
+FIELD_NAMES = {field_id: (name, kind) for name, (field_id, kind) in FIELDS.items()}
+
+
+class FramingError(Exception):
+    """Exception levée lorsqu'une trame reçue est malformée."""
+    pass
+
+
+def encode_message(fields: dict):
+    """
+    Encode un message en trame binaire. Les champs de valeur None sont omis.
+    :param fields: Dictionnaire {nom de champ: valeur (bytes ou str selon le champ)}
+    :return: La trame à envoyer
+    """
+    payload = bytearray()
+    for name, value in fields.items():
+        if value is None:
+            continue
+        field_id, kind = FIELDS[name]
+        if kind is str:
+            value = value.encode('utf-8')
+        payload += FIELD_HEADER.pack(field_id, len(value))
+        payload += value
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_payload(payload: memoryview):
+    """
+    Décode la charge utile d'une trame sans copie : les valeurs binaires sont des tranches de la charge utile.
+    :param payload: Charge utile de la trame
+    :return: Dictionnaire {nom de champ: valeur (memoryview ou str)}
+    """
+    fields = {}
+    offset = 0
+    while offset < len(payload):
+        if offset + FIELD_HEADER.size > len(payload):
+            raise FramingError("En-tête de champ tronqué")
+        field_id, size = FIELD_HEADER.unpack_from(payload, offset)
+        offset += FIELD_HEADER.size
+        if offset + size > len(payload) or field_id not in FIELD_NAMES:
+            raise FramingError(f"Champ {field_id} invalide")
+        name, kind = FIELD_NAMES[field_id]
+        value = payload[offset:offset + size]
+        if kind is str:
+            try:
+                value = str(value, 'utf-8')
+            except UnicodeDecodeError:
+                raise FramingError(f"Champ {name} : UTF-8 invalide") from None
+        fields[name] = value
+        offset += size
+    return fields
+
+
+async def read_message(reader):
+    """
+    Reçoit le prochain message sur un flux asyncio.
+    :param reader: asyncio.StreamReader
+    :return: Dictionnaire {nom de champ: valeur (memoryview ou str)}
+    """
+    length, = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length > MAX_FRAME_SIZE:
+        raise FramingError(f"Trame de {length} octets trop grande")
+    return decode_payload(memoryview(await reader.readexactly(length)))
+
+
+def write_message(writer, fields: dict):
+    """
+    Place un message dans le tampon d'envoi d'un flux asyncio (à suivre de writer.drain()).
+    :param writer: asyncio.StreamWriter
+    :param fields: Dictionnaire {nom de champ: valeur}
+    """
+    writer.write(encode_message(fields))
+
+
+def send_message(sock, fields: dict):
+    """
+    Envoie un message sur une socket.
+    :param sock: Socket connectée
+    :param fields: Dictionnaire {nom de champ: valeur}
+    """
+    sock.sendall(encode_message(fields))
+
+
+class FrameReader:
+    def __init__(self, sock, buffer_size: int = 4096):
+        """
+        Lecteur de trames sur une socket, qui reçoit directement (recv_into) dans un tampon réutilisé.
+        Les lectures partielles et les trames regroupées dans un même segment sont gérées.
+        :param sock: Socket connectée
+        :param buffer_size: Taille initiale du tampon (agrandi si une trame ne tient pas)
+        """
+        self.sock = sock
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # Début des octets reçus non encore consommés
+        self.end = 0    # Fin des octets reçus
+
+    def __fill(self, size: int):
+        """
+        Reçoit jusqu'à disposer d'au moins size octets non consommés dans le tampon.
+        """
+        if self.end - self.start >= size:
+            return
+        pending = self.end - self.start
+        if not pending:
+            self.start = self.end = 0
+        if self.start + size > len(self.buffer):
+            if size > len(self.buffer):
+                buffer = bytearray(max(size, 2 * len(self.buffer)))
+                buffer[:pending] = self.view[self.start:self.end]
+                self.buffer, self.view = buffer, memoryview(buffer)
+            else:
+                self.buffer[:pending] = self.buffer[self.start:self.end]
+            self.start, self.end = 0, pending
+        while self.end - self.start < size:
+            received = self.sock.recv_into(self.view[self.end:])
+            if not received:
+                raise ConnectionError("Connexion fermée par le pair")
+            self.end += received
+
+    def receive_message(self):
+        """
+        Reçoit le prochain message. Les valeurs binaires renvoyées pointent dans le tampon du lecteur et ne restent
+        valides que jusqu'au message suivant : les convertir avec bytes() pour les conserver.
+        :return: Dictionnaire {nom de champ: valeur (memoryview ou str)}
+        """
+        self.__fill(FRAME_HEADER.size)
+        length, = FRAME_HEADER.unpack_from(self.view, self.start)
+        if length > MAX_FRAME_SIZE:
+            raise FramingError(f"Trame de {length} octets trop grande")
+        self.start += FRAME_HEADER.size
+        self.__fill(length)
+        payload = self.view[self.start:self.start + length]
+        self.start += length
+        return decode_payload(payload)
+
+    def take_buffered(self):
+        """
+        Retire les octets déjà reçus mais non consommés, pour qu'un autre protocole prenne la suite sur la socket.
+        :return: Les octets en attente
+        """
+        pending = bytes(self.view[self.start:self.end])
+        self.start = self.end = 0
+        return pending
@@ -0,0 +1,221 @@
+import hashlib
+import hmac
+import os
+import struct
+import time
+from collections import OrderedDict
+
+# Cookie : horodatage (secondes, 64 bits), difficulté du puzzle (8 bits), nonce aléatoire, HMAC tronqué de ces champs
+# et de la source. Tout ce qui sert à vérifier le cookie est dans le cookie ou dans sa clé ; le serveur ne garde que
+# les cookies déjà acceptés, le temps de leur validité, pour qu'un premier message résolu ne serve qu'une fois.
+COOKIE_HEADER = struct.Struct('>QB8s')
+MAC_SIZE = 16
+COOKIE_SIZE = COOKIE_HEADER.size + MAC_SIZE
+SOLUTION = struct.Struct('>Q')
+COOKIE_FIELDS = ('cookie', 'puzzle_solution')
+
+
+def message_digest(fields: dict):
+    """
+    Empreinte d'un message tramé, indépendante de l'ordre des champs et sans les champs du cookie : le puzzle est lié
+    au contenu du premier message (A, clé publique), qu'on ne peut donc pas changer sans le résoudre à nouveau.
+    :param fields: Dictionnaire {nom de champ: valeur (bytes, memoryview ou str)}
+    :return: 32 octets
+    """
+    digest = hashlib.sha256()
+    for name in sorted(fields):
+        if name in COOKIE_FIELDS:
+            continue
+        value = fields[name]
+        value = value.encode('utf-8') if isinstance(value, str) else bytes(value)
+        digest.update(struct.pack('>BI', len(name), len(value)) + name.encode('utf-8') + value)
+    return digest.digest()
+
+
+def _puzzle_hash(cookie: bytes, data: bytes, solution: bytes):
+    return int.from_bytes(hashlib.sha256(cookie + data + solution).digest()[:8], 'big')
+
+
+def solve_puzzle(cookie: bytes, data: bytes = b''):
+    """
+    Côté client : trouve une solution au puzzle du cookie, soit environ 2^difficulté hachages.
+    :param cookie: Cookie reçu du serveur (il porte la difficulté)
+    :param data: Données auxquelles le puzzle est lié (message_digest du premier message)
+    :return: Solution (SOLUTION.size octets)
+    """
+    cookie = bytes(cookie)
+    _, difficulty, _ = COOKIE_HEADER.unpack_from(cookie)
+    limit = 1 << (64 - difficulty)
+    counter = 0
+    while True:
+        solution = SOLUTION.pack(counter)
+        if _puzzle_hash(cookie, data, solution) < limit:
+            return solution
+        counter += 1
+
+
+def with_cookie(fields: dict, cookie: bytes):
+    """
+    Côté client : premier message à renvoyer au serveur qui a répondu par un cookie.
+    :param fields: Premier message envoyé
+    :param cookie: Cookie reçu
+    :return: Le même message, accompagné du cookie et de la solution de son puzzle
+    """
+    cookie = bytes(cookie)
+    return {**fields, 'cookie': cookie, 'puzzle_solution': solve_puzzle(cookie, message_digest(fields))}
+
+
+class CookieIssuer:
+    def __init__(self, secret: bytes = None, lifetime: float = 30.0, difficulty: int = 0, max_used: int = 100000):
+        """
+        Émission et vérification de cookies de pré-authentification sans état. Un client doit renvoyer son premier
+        message avec un cookie valide (HMAC de sa source et d'un horodatage récent) et, si difficulty > 0, la solution
+        d'un puzzle lié à ce message, avant que le serveur ne calcule quoi que ce soit de coûteux.
+        Un cookie n'est accepté qu'une fois : rejouer un premier message résolu ne déclenche pas de nouveau calcul,
+        chaque tentative coûte donc au client un aller-retour et environ 2^difficulty hachages.
+        :param secret: Clé HMAC (tirée au hasard par défaut : les cookies ne survivent pas à un redémarrage)
+        :param lifetime: Durée de validité (s) d'un cookie
+        :param difficulty: Nombre de bits nuls exigés en tête du hachage du puzzle (0 : pas de puzzle)
+        :param max_used: Nombre maximal de cookies acceptés encore valides ; au-delà, les cookies sont refusés
+        """
+        if not 0 <= difficulty <= 32:
+            raise ValueError(f"Difficulté {difficulty} hors de [0, 32]")
+        self.secret = secret or os.urandom(32)
+        self.lifetime = lifetime
+        self.difficulty = difficulty
+        self.max_used = max_used
+        self.used = OrderedDict()  # Cookie accepté -> fin de sa validité, dans l'ordre d'acceptation
+
+        # Métriques
+        self.issued = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.replayed = 0
+
+    def __mac(self, source: str, header: bytes):
+        return hmac.new(self.secret, header + source.encode('utf-8'), hashlib.sha256).digest()[:MAC_SIZE]
+
+    def issue(self, source: str):
+        """
+        :param source: Adresse du client
+        :return: Cookie de COOKIE_SIZE octets
+        """
+        self.issued += 1
+        header = COOKIE_HEADER.pack(int(time.time()), self.difficulty, os.urandom(8))
+        return header + self.__mac(source, header)
+
+    def check(self, source: str, cookie, solution=None, data: bytes = b''):
+        """
+        Vérifie un cookie renvoyé par le client, puis le marque comme utilisé : quelques microsecondes, et une entrée
+        conservée jusqu'à l'expiration du cookie.
+        :param source: Adresse du client
+        :param cookie: Cookie reçu, ou None
+        :param solution: Solution du puzzle reçue, ou None
+        :param data: Données auxquelles le puzzle est lié (message_digest du premier message)
+        :return: True si le cookie est authentique, récent, pas encore utilisé et, le cas échéant, son puzzle résolu
+        """
+        valid = self.__check(source, cookie, solution, data) and self.__use(bytes(cookie))
+        if valid:
+            self.accepted += 1
+        else:
+            self.rejected += 1
+        return valid
+
+    def __use(self, cookie: bytes):
+        """
+        Marque un cookie valide comme utilisé.
+        :return: False si le cookie a déjà été utilisé, ou si trop de cookies encore valides l'ont été
+        """
+        now = time.time()
+        while self.used and next(iter(self.used.values())) < now:
+            self.used.popitem(last=False)
+        if cookie in self.used:
+            self.replayed += 1
+            return False
+        if len(self.used) >= self.max_used:
+            return False
+        timestamp, _, _ = COOKIE_HEADER.unpack_from(cookie)
+        self.used[cookie] = timestamp + self.lifetime
+        return True
+
+    def __check(self, source, cookie, solution, data):
+        if cookie is None or len(cookie) != COOKIE_SIZE:
+            return False
+        cookie = bytes(cookie)
+        header = cookie[:COOKIE_HEADER.size]
+        timestamp, difficulty, _ = COOKIE_HEADER.unpack(header)
+        if not 0 <= time.time() - timestamp <= self.lifetime:
+            return False
+        if not hmac.compare_digest(cookie[COOKIE_HEADER.size:], self.__mac(source, header)):
+            return False
+        if difficulty:
+            if solution is None or len(solution) != SOLUTION.size:
+                return False
+            return _puzzle_hash(cookie, data, bytes(solution)) < 1 << (64 - difficulty)
+        return True
+
+    def metrics(self):
+        return {'issued': self.issued, 'accepted': self.accepted, 'rejected': self.rejected, 'replayed': self.replayed}
+
+
+class TokenBucket:
+    def __init__(self, rate: float = 5.0, burst: float = 10.0, max_sources: int = 65536):
+        """
+        Limiteur de débit par source : chaque source dispose d'un seau de burst jetons, rempli de rate jetons par
+        seconde ; une connexion consomme un jeton. Les sources les moins récentes sont oubliées au-delà de
+        max_sources (un seau oublié repart plein).
+        :param rate: Connexions par seconde autorisées en régime établi
+        :param burst: Connexions autorisées en rafale
+        :param max_sources: Nombre maximal de sources suivies
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_sources = max_sources
+        self.buckets = OrderedDict()  # source -> (jetons, date de la dernière mise à jour)
+
+        # Métriques
+        self.allowed = 0
+        self.refused = 0
+
+    def allow(self, source: str):
+        """
+        :param source: Adresse du client
+        :return: True si la connexion est acceptée (un jeton est alors consommé)
+        """
+        now = time.monotonic()
+        tokens, last = self.buckets.pop(source, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+            self.allowed += 1
+        else:
+            self.refused += 1
+        self.buckets[source] = (tokens, now)
+        if len(self.buckets) > self.max_sources:
+            self.buckets.popitem(last=False)
+        return allowed
+
+    def metrics(self):
+        return {'allowed': self.allowed, 'refused': self.refused, 'sources': len(self.buckets)}
+
+
+def add_preauth_arguments(parser):
+    """
+    Ajoute à un analyseur argparse les options de pré-authentification (--cookie, --difficulte, --debit, --rafale).
+    """
+    parser.add_argument('--cookie', action='store_true',
+                        help="Exiger un cookie de pré-authentification avant tout calcul coûteux (un aller-retour)")
+    parser.add_argument('--difficulte', type=int, default=0,
+                        help="Difficulté du puzzle lié au cookie (bits nuls exigés, 0 : sans puzzle)")
+    parser.add_argument('--debit', type=float, default=5.0, help="Connexions par seconde et par source (0 : illimité)")
+    parser.add_argument('--rafale', type=float, default=10.0, help="Connexions en rafale par source")
+
+
+def preauth_from_arguments(args):
+    """
+    :return: (CookieIssuer ou None, TokenBucket ou None) selon les options de add_preauth_arguments
+    """
+    cookies = CookieIssuer(difficulty=args.difficulte) if args.cookie else None
+    limiter = TokenBucket(args.debit, args.rafale) if args.debit else None
+    return cookies, limiter
@@ -0,0 +1,137 @@
+import argparse
+import csv
+import json
+import os
+import resource
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import srp
+from srp_groups import add_group_arguments, library_options
+from verifier_store import VerifierStore
+
+
+def read_users(path: str):
+    """
+    Lit les utilisateurs à enrôler au fil de l'eau, sans charger le fichier en mémoire.
+    CSV : colonnes username,password (ligne d'en-tête facultative). JSONL : {"username": ..., "password": ...} par ligne.
+    Les lignes vides sont ignorées ; une ligne CSV de moins de deux colonnes lève ValueError (numéro de ligne inclus).
+    :param path: Chemin du fichier (.csv ou .jsonl)
+    :return: Générateur de tuples (nom d'utilisateur, mot de passe)
+    """
+    with open(path, newline='', encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            for line in file:
+                if line.strip():
+                    user = json.loads(line)
+                    yield user['username'], user['password']
+        else:
+            reader = csv.reader(file)
+            for row in reader:
+                if not row or (reader.line_num == 1 and row[:2] == ['username', 'password']):
+                    continue
+                if len(row) < 2:
+                    raise ValueError(f"{path}, ligne {reader.line_num} : colonnes username,password attendues")
+                yield row[0], row[1]
+
+
+def demo_users(count: int):
+    """
+    :return: Générateur de count utilisateurs de démonstration
+    """
+    for index in range(count):
+        yield f"user{index}", f"password{index}"
+
+
+def compute_chunk(users: list, options: dict):
+    """
+    Calcule les vérificateurs d'un lot d'utilisateurs, dans un processus de la réserve.
+    :param users: Liste de tuples (nom d'utilisateur, mot de passe)
+    :param options: Paramètres hash_alg et ng_type de srp
+    :return: Liste de tuples (nom d'utilisateur, sel, clé de vérification)
+    """
+    return [(username, *srp.create_salted_verification_key(username, password, **options))
+            for username, password in users]
+
+
+def _chunks(users, chunk_size: int):
+    chunk = []
+    for user in users:
+        chunk.append(user)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def peak_memory():
+    """
+    :return: Pic de mémoire résidente (Mio) du processus courant et de ses processus de calcul terminés
+    """
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return own / 1024, children / 1024
+
+
+def provision(users, store: VerifierStore, processes: int = None, chunk_size: int = 256, report_period: float = 5.0,
+              options: dict = None):
+    """
+    Calcule les vérificateurs de tous les utilisateurs et les enregistre dans la base.
+    Au plus 2 lots par processus sont en cours à un instant donné : la mémoire reste bornée quel que soit le
+    nombre d'utilisateurs.
+    :param users:         Itérable de tuples (nom d'utilisateur, mot de passe)
+    :param store:         Base des vérificateurs de destination
+    :param processes:     Nombre de processus de calcul (par défaut, un par coeur)
+    :param chunk_size:    Nombre d'utilisateurs par lot
+    :param report_period: Intervalle (s) entre deux affichages de la progression
+    :param options:       Paramètres hash_alg et ng_type de srp, identiques à ceux des serveurs
+    :return: Nombre d'utilisateurs enrôlés
+    """
+    processes = processes or os.cpu_count()
+    options = options or {}
+    chunks = _chunks(users, chunk_size)
+    total = 0
+    start_time = last_report = time.perf_counter()
+    with ProcessPoolExecutor(processes) as pool:
+        pending = {pool.submit(compute_chunk, chunk, options) for _, chunk in zip(range(2 * processes), chunks)}
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                total += store.import_many(future.result())
+            pending |= {pool.submit(compute_chunk, chunk, options) for _, chunk in zip(range(len(finished)), chunks)}
+            now = time.perf_counter()
+            if now - last_report >= report_period:
+                print(f"{total} utilisateurs, {total / (now - start_time):.0f} utilisateurs/s")
+                last_report = now
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enrôlement en masse d'utilisateurs SRP dans une base de vérificateurs")
+    parser.add_argument('base', help="Base SQLite des vérificateurs (créée ou complétée), à passer aux serveurs via --base")
+    parser.add_argument('--utilisateurs', help="Fichier CSV (username,password) ou JSONL des utilisateurs")
+    parser.add_argument('--demo', type=int, metavar='N', help="Enrôle N utilisateurs de démonstration userI/passwordI")
+    parser.add_argument('--processus', type=int, default=None)
+    parser.add_argument('--taille-lot', type=int, default=256, help="Nombre d'utilisateurs par lot")
+    add_group_arguments(parser)
+    args = parser.parse_args()
+    if not args.utilisateurs and not args.demo:
+        parser.error("--utilisateurs ou --demo est nécessaire")
+
+    users = read_users(args.utilisateurs) if args.utilisateurs else demo_users(args.demo)
+    start_time = time.perf_counter()
+    with VerifierStore(args.base, cache_size=0) as store:
+        try:
+            total = provision(users, store, args.processus, args.taille_lot,
+                              options=library_options(args.groupe, args.hachage))
+        except ValueError as error:
+            # Les lots terminés avant la ligne fautive restent enregistrés ; une relance les remplace (INSERT OR REPLACE)
+            parser.error(str(error))
+    elapsed = time.perf_counter() - start_time
+    own, children = peak_memory()
+    print(f"{total} utilisateurs enrôlés en {elapsed:.2f} s : {total / elapsed:.0f} utilisateurs/s")
+    print(f"Pic de mémoire : {own:.0f} Mio (processus principal), {children:.0f} Mio (plus gros processus de calcul)")
+
+
+if __name__ == "__main__":
+    main()
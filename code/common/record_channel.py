@@ -0,0 +1,170 @@
+import struct
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from framing import FramingError, send_message
+
+# Enregistrement : longueur du texte clair (32 bits big-endian), puis texte chiffré suivi de l'étiquette AEAD.
+# L'en-tête est authentifié comme donnée associée ; le numéro de séquence, implicite, entre dans le nonce.
+RECORD_HEADER = struct.Struct('>I')
+TAG_SIZE = 16
+KEY_SIZE = 32
+IV_SIZE = 12
+MAX_RECORD_SIZE = 1 << 24
+DEFAULT_RECORD_SIZE = 1 << 16
+MAX_SEQUENCE = (1 << 64) - 1
+
+CIPHERS = {
+    'aes-gcm': AESGCM,
+    'chacha20-poly1305': ChaCha20Poly1305,
+}
+DEFAULT_CIPHER = 'aes-gcm'
+
+
+def derive_record_keys(session_key: bytes, cipher: str):
+    """
+    Dérive de la clé de session une clé et un vecteur d'initialisation par sens de transmission.
+    :param session_key: Clé établie par la poignée de main ou la reprise de session
+    :param cipher: Nom de l'algorithme AEAD (clé de CIPHERS), lié à la dérivation
+    :return: ((clé, IV) client -> serveur, (clé, IV) serveur -> client)
+    """
+    material = HKDF(
+        algorithm=hashes.SHA256(),
+        length=2 * (KEY_SIZE + IV_SIZE),
+        salt=None,
+        info=b'record keys ' + cipher.encode('utf-8')
+    ).derive(session_key)
+    client_key, client_iv = material[:KEY_SIZE], material[KEY_SIZE:KEY_SIZE + IV_SIZE]
+    material = material[KEY_SIZE + IV_SIZE:]
+    server_key, server_iv = material[:KEY_SIZE], material[KEY_SIZE:]
+    return (client_key, client_iv), (server_key, server_iv)
+
+
+class RecordChannel:
+    def __init__(self, sock, session_key: bytes, role: str, cipher: str = DEFAULT_CIPHER, buffered: bytes = b'',
+                 record_size: int = DEFAULT_RECORD_SIZE):
+        """
+        Canal d'enregistrements chiffrés et authentifiés sur la socket de la poignée de main.
+        Les contextes AEAD sont créés une fois par sens ; le nonce de chaque enregistrement est l'IV du sens
+        combiné par XOR au numéro de séquence, qui n'est jamais transmis.
+        :param sock: Socket connectée
+        :param session_key: Clé établie par la poignée de main
+        :param role: 'client' ou 'server'
+        :param cipher: Nom de l'algorithme AEAD (clé de CIPHERS)
+        :param buffered: Octets déjà reçus par le lecteur de trames de la poignée de main (FrameReader.take_buffered)
+        :param record_size: Taille maximale du texte clair d'un enregistrement envoyé par send()
+        """
+        if not 0 < record_size <= MAX_RECORD_SIZE:
+            raise ValueError(f"Taille d'enregistrement {record_size} hors de ]0, {MAX_RECORD_SIZE}]")
+        client_keys, server_keys = derive_record_keys(session_key, cipher)
+        (send_key, send_iv), (receive_key, receive_iv) = \
+            (client_keys, server_keys) if role == 'client' else (server_keys, client_keys)
+        self.sock = sock
+        self.cipher = cipher
+        self.record_size = record_size
+        self.send_aead = CIPHERS[cipher](send_key)
+        self.receive_aead = CIPHERS[cipher](receive_key)
+        self.send_iv = int.from_bytes(send_iv, 'big')
+        self.receive_iv = int.from_bytes(receive_iv, 'big')
+        self.send_sequence = 0
+        self.receive_sequence = 0
+        self.pending = memoryview(buffered)
+        self.header = bytearray(RECORD_HEADER.size)
+        self.buffer = bytearray(DEFAULT_RECORD_SIZE + TAG_SIZE)
+
+    @staticmethod
+    def __nonce(iv: int, sequence: int):
+        if sequence > MAX_SEQUENCE:
+            raise FramingError("Numéro de séquence épuisé : une nouvelle session est nécessaire")
+        return (iv ^ sequence).to_bytes(IV_SIZE, 'big')
+
+    def send_record(self, data):
+        """
+        Chiffre et envoie un enregistrement. L'en-tête et le texte chiffré partent en une écriture groupée (sendmsg),
+        sans les concaténer.
+        :param data: Texte clair (bytes-like) d'au plus MAX_RECORD_SIZE octets
+        """
+        if len(data) > MAX_RECORD_SIZE:
+            raise ValueError(f"Enregistrement de {len(data)} octets trop grand")
+        header = RECORD_HEADER.pack(len(data))
+        ciphertext = self.send_aead.encrypt(self.__nonce(self.send_iv, self.send_sequence), data, header)
+        self.send_sequence += 1
+        sent = self.sock.sendmsg((header, ciphertext))
+        if sent < len(header):
+            self.sock.sendall(header[sent:])
+            sent = len(header)
+        if sent < len(header) + len(ciphertext):
+            self.sock.sendall(memoryview(ciphertext)[sent - len(header):])
+
+    def send(self, data):
+        """
+        Envoie des données de taille quelconque, découpées en enregistrements d'au plus record_size octets.
+        :param data: Texte clair (bytes-like)
+        """
+        view = memoryview(data)
+        for offset in range(0, len(view), self.record_size):
+            self.send_record(view[offset:offset + self.record_size])
+
+    def __receive_into(self, view: memoryview):
+        """
+        Remplit entièrement view, d'abord avec les octets hérités de la poignée de main, puis depuis la socket.
+        :return: Nombre d'octets reçus (inférieur à len(view) seulement si le pair ferme avant le premier octet)
+        """
+        filled = min(len(self.pending), len(view))
+        if filled:
+            view[:filled] = self.pending[:filled]
+            self.pending = self.pending[filled:]
+        while filled < len(view):
+            received = self.sock.recv_into(view[filled:])
+            if not received:
+                if not filled:
+                    return 0
+                raise ConnectionError("Connexion fermée au milieu d'un enregistrement")
+            filled += received
+        return filled
+
+    def receive_record(self):
+        """
+        Reçoit, authentifie et déchiffre le prochain enregistrement dans un tampon de réception réutilisé.
+        :return: Texte clair de l'enregistrement, ou None si le pair a fermé la connexion entre deux enregistrements
+        """
+        if not self.__receive_into(memoryview(self.header)):
+            return None
+        length, = RECORD_HEADER.unpack(self.header)
+        if length > MAX_RECORD_SIZE:
+            raise FramingError(f"Enregistrement de {length} octets trop grand")
+        if length + TAG_SIZE > len(self.buffer):
+            self.buffer = bytearray(length + TAG_SIZE)
+        ciphertext = memoryview(self.buffer)[:length + TAG_SIZE]
+        self.__receive_into(ciphertext)
+        try:
+            data = self.receive_aead.decrypt(self.__nonce(self.receive_iv, self.receive_sequence), ciphertext,
+                                             bytes(self.header))
+        except InvalidTag:
+            raise FramingError(f"Enregistrement {self.receive_sequence} non authentifié") from None
+        self.receive_sequence += 1
+        return data
+
+
+def open_channel(conn, reader, session_key: bytes, cipher: str = DEFAULT_CIPHER, **channel_options):
+    """
+    Côté client : annonce l'algorithme choisi puis ouvre le canal sans attendre de réponse (aucun aller-retour).
+    :param reader: FrameReader de la poignée de main
+    :return: RecordChannel
+    """
+    send_message(conn, {'cipher': cipher})
+    return RecordChannel(conn, session_key, 'client', cipher, reader.take_buffered(), **channel_options)
+
+
+def accept_channel(conn, reader, session_key: bytes, accepted=tuple(CIPHERS), **channel_options):
+    """
+    Côté serveur : lit l'algorithme annoncé par le client et ouvre le canal s'il fait partie des algorithmes acceptés.
+    :param reader: FrameReader de la poignée de main
+    :param accepted: Algorithmes acceptés
+    :return: RecordChannel
+    """
+    cipher = reader.receive_message().get('cipher', DEFAULT_CIPHER)
+    if cipher not in accepted:
+        raise FramingError(f"Algorithme {cipher} non accepté")
+    return RecordChannel(conn, session_key, 'server', cipher, reader.take_buffered(), **channel_options)
@@ -0,0 +1,127 @@
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+TICKET_SIZE = 16
+NONCE_SIZE = 16
+
+
+def derive_ticket(session_key: bytes):
+    """
+    Dérive, des deux côtés et sans message supplémentaire, le ticket de reprise et le secret associé à partir de
+    la clé établie par la poignée de main (sortie HKDF de derive_shared_key ou clé de session liée).
+    :param session_key: Clé établie par la poignée de main
+    :return: (ticket public de TICKET_SIZE octets, secret de reprise de 32 octets)
+    """
+    material = HKDF(
+        algorithm=hashes.SHA256(),
+        length=TICKET_SIZE + 32,
+        salt=None,
+        info=b'session resumption'
+    ).derive(session_key)
+    return material[:TICKET_SIZE], material[TICKET_SIZE:]
+
+
+def resumption_client_proof(secret: bytes, ticket: bytes, client_nonce: bytes):
+    """
+    Preuve de possession du secret de reprise, envoyée avec le ticket dans l'unique message du client.
+    """
+    return hmac.new(secret, b'resume client' + ticket + client_nonce, hashlib.sha256).digest()
+
+
+def resumed_session_key(secret: bytes, client_nonce: bytes, server_nonce: bytes):
+    """
+    Clé de la session reprise : fraîche grâce aux deux nonces, sans nouvelle exponentiation.
+    """
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=client_nonce + server_nonce,
+        info=b'resumed session'
+    ).derive(secret)
+
+
+class SessionCache:
+    def __init__(self, max_entries: int = 10000, ttl: float = 3600.0):
+        """
+        Cache serveur des sessions reprenables, indexé par ticket, borné en taille (éviction LRU) et en durée (TTL).
+        Un ticket n'est utilisable qu'une fois : une reprise le retire du cache et en émet un nouveau.
+        :param max_entries: Nombre maximal de sessions conservées
+        :param ttl: Durée de validité (s) d'un ticket
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # ticket -> (échéance, secret de reprise, coût CPU de la poignée de main complète)
+
+        # Métriques
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.cpu_saved = 0.0
+
+    def store(self, session_key: bytes, handshake_cost: float):
+        """
+        Enregistre une session établie.
+        :param session_key: Clé établie par la poignée de main
+        :param handshake_cost: Temps CPU (s) de la poignée de main complète qu'une reprise évitera
+        :return: Le ticket de la session
+        """
+        ticket, secret = derive_ticket(session_key)
+        self.entries[ticket] = (time.monotonic() + self.ttl, secret, handshake_cost)
+        self.entries.move_to_end(ticket)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evicted += 1
+        return ticket
+
+    def take(self, ticket: bytes, client_nonce: bytes, client_proof: bytes):
+        """
+        Retire une session du cache, si le client prouve qu'il détient son secret de reprise. La preuve est vérifiée
+        avant que le ticket ne soit consommé : un tiers qui a vu passer un ticket ne peut pas le griller.
+        :param ticket: Ticket présenté par le client
+        :param client_nonce: Nonce du client
+        :param client_proof: Preuve de possession du secret (resumption_client_proof)
+        :return: (secret de reprise, coût de la poignée de main complète), ou None si le ticket est inconnu, expiré
+                 ou accompagné d'une preuve invalide
+        """
+        entry = self.entries.get(ticket)
+        if entry is None:
+            self.misses += 1
+            return None
+        expiry, secret, handshake_cost = entry
+        if time.monotonic() > expiry:
+            del self.entries[ticket]
+            self.expired += 1
+            self.misses += 1
+            return None
+        if not hmac.compare_digest(client_proof, resumption_client_proof(secret, ticket, client_nonce)):
+            self.misses += 1
+            return None
+        del self.entries[ticket]
+        self.hits += 1
+        return secret, handshake_cost
+
+    def credit(self, seconds: float):
+        """
+        Comptabilise le temps CPU économisé par une reprise.
+        """
+        self.cpu_saved += seconds
+
+    def metrics(self):
+        """
+        :return: Taux de succès, évictions et temps CPU économisé
+        """
+        attempts = self.hits + self.misses
+        return {
+            'hit_rate': self.hits / attempts if attempts else 0.0,
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'evicted': self.evicted,
+            'size': len(self.entries),
+            'cpu_saved': self.cpu_saved,
+        }
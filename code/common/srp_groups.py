@@ -0,0 +1,88 @@
+# Groupes SRP de la RFC 5054 (annexe A) : module premier sûr N et générateur g.
+# Ce module ne dépend d'aucune bibliothèque, pour servir aussi aux implémentations sans bibliothèque SRP.
+GROUPS = {
+    1024: (int("EEAF0AB9ADB38DD69C33F80AFA8FC5E86072618775FF3C0B9EA2314C9C256576"
+               "D674DF7496EA81D3383B4813D692C6E0E0D5D8E250B98BE48E495C1D6089DAD1"
+               "5DC7D7B46154D6B6CE8EF4AD69B15D4982559B297BCF1885C529F566660E57EC"
+               "68EDBC3C05726CC02FD4CBF4976EAA9AFD5138FE8376435B9FC61D2FC0EB06E3", 16), 2),
+    2048: (int("AC6BDB41324A9A9BF166DE5E1389582FAF72B6651987EE07FC3192943DB56050"
+               "A37329CBB4A099ED8193E0757767A13DD52312AB4B03310DCD7F48A9DA04FD50"
+               "E8083969EDB767B0CF6095179A163AB3661A05FBD5FAAAE82918A9962F0B93B8"
+               "55F97993EC975EEAA80D740ADBF4FF747359D041D5C33EA71D281E446B14773B"
+               "CA97B43A23FB801676BD207A436C6481F1D2B9078717461A5B9D32E688F87748"
+               "544523B524B0D57D5EA77A2775D2ECFA032CFBDBF52FB3786160279004E57AE6"
+               "AF874E7303CE53299CCC041C7BC308D82A5698F3A8D0C38271AE35F8E9DBFBB6"
+               "94B5C803D89F7AE435DE236D525F54759B65E372FCD68EF20FA7111F9E4AFF73", 16), 2),
+    4096: (int("FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74"
+               "020BBEA63B139B22514A08798E3404DDEF9519B3CD3A431B302B0A6DF25F1437"
+               "4FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED"
+               "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3DC2007CB8A163BF05"
+               "98DA48361C55D39A69163FA8FD24CF5F83655D23DCA3AD961C62F356208552BB"
+               "9ED529077096966D670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B"
+               "E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF695581718"
+               "3995497CEA956AE515D2261898FA051015728E5A8AAAC42DAD33170D04507A33"
+               "A85521ABDF1CBA64ECFB850458DBEF0A8AEA71575D060C7DB3970F85A6E1E4C7"
+               "ABF5AE8CDB0933D71E8C94E04A25619DCEE3D2261AD2EE6BF12FFA06D98A0864"
+               "D87602733EC86A64521F2B18177B200CBBE117577A615D6C770988C0BAD946E2"
+               "08E24FA074E5AB3143DB5BFCE0FD108E4B82D120A92108011A723C12A787E6D7"
+               "88719A10BDBA5B2699C327186AF4E23C1A946834B6150BDA2583E9CA2AD44CE8"
+               "DBBBC2DB04DE8EF92E8EFC141FBECAA6287C59474E6BC05D99B2964FA090C3A2"
+               "233BA186515BE7ED1F612970CEE2D7AFB81BDD762170481CD0069127D5B05AA9"
+               "93B4EA988D8FDDC186FFB7DC90A6C08F4DF435C934063199FFFFFFFFFFFFFFFF", 16), 5),
+    8192: (int("FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74"
+               "020BBEA63B139B22514A08798E3404DDEF9519B3CD3A431B302B0A6DF25F1437"
+               "4FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED"
+               "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3DC2007CB8A163BF05"
+               "98DA48361C55D39A69163FA8FD24CF5F83655D23DCA3AD961C62F356208552BB"
+               "9ED529077096966D670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B"
+               "E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF695581718"
+               "3995497CEA956AE515D2261898FA051015728E5A8AAAC42DAD33170D04507A33"
+               "A85521ABDF1CBA64ECFB850458DBEF0A8AEA71575D060C7DB3970F85A6E1E4C7"
+               "ABF5AE8CDB0933D71E8C94E04A25619DCEE3D2261AD2EE6BF12FFA06D98A0864"
+               "D87602733EC86A64521F2B18177B200CBBE117577A615D6C770988C0BAD946E2"
+               "08E24FA074E5AB3143DB5BFCE0FD108E4B82D120A92108011A723C12A787E6D7"
+               "88719A10BDBA5B2699C327186AF4E23C1A946834B6150BDA2583E9CA2AD44CE8"
+               "DBBBC2DB04DE8EF92E8EFC141FBECAA6287C59474E6BC05D99B2964FA090C3A2"
+               "233BA186515BE7ED1F612970CEE2D7AFB81BDD762170481CD0069127D5B05AA9"
+               "93B4EA988D8FDDC186FFB7DC90A6C08F4DF435C93402849236C3FAB4D27C7026"
+               "C1D4DCB2602646DEC9751E763DBA37BDF8FF9406AD9E530EE5DB382F413001AE"
+               "B06A53ED9027D831179727B0865A8918DA3EDBEBCF9B14ED44CE6CBACED4BB1B"
+               "DB7F1447E6CC254B332051512BD7AF426FB8F401378CD2BF5983CA01C64B92EC"
+               "F032EA15D1721D03F482D7CE6E74FEF6D55E702F46980C82B5A84031900B1C9E"
+               "59E7C97FBEC7E8F323A97A7E36CC88BE0F1D45B7FF585AC54BD407B22B4154AA"
+               "CC8F6D7EBF48E1D814CC5ED20F8037E0A79715EEF29BE32806A1D58BB7C5DA76"
+               "F550AA3D8A1FBFF0EB19CCB1A313D55CDA56C9EC2EF29632387FE8D76E3C0468"
+               "043E8F663F4860EE12BF2D5B0B7474D6E694F91E6DBE115974A3926F12FEE5E4"
+               "38777CB6A932DF8CD8BEC4D073B931BA3BC832B68D9DD300741FA7BF8AFC47ED"
+               "2576F6936BA424663AAB639C5AE4F5683423B4742BF1C978238F16CBE39D652D"
+               "E3FDB8BEFC848AD922222E04A4037C0713EB57A81A23F0C73473FC646CEA306B"
+               "4BCBC8862F8385DDFA9D4B7FA2C087E879683303ED5BDD3A062B3CF5B3A278A6"
+               "6D2A13F83F44F82DDF310EE074AB6A364597E899A0255DC164F31CC50846851D"
+               "F9AB48195DED7EA1B1D510BD7EE74D73FAF36BC31ECFA268359046F4EB879F92"
+               "4009438B481C6CD7889A002ED5EE382BC9190DA6FC026E479558E4475677E9AA"
+               "9E3050E2765694DFC81F56E880B96E7160C980DD98EDD3DFFFFFFFFFFFFFFFFF", 16), 19),
+}
+
+HASHES = ('sha1', 'sha224', 'sha256', 'sha384', 'sha512')
+
+
+def add_group_arguments(parser, default_hash: str = 'sha1'):
+    """
+    Ajoute à un analyseur argparse le choix du groupe (--groupe) et de la fonction de hachage (--hachage).
+    Le client et le serveur doivent être lancés avec les mêmes valeurs.
+    :param parser: argparse.ArgumentParser
+    :param default_hash: Fonction de hachage par défaut
+    """
+    parser.add_argument('--groupe', type=int, choices=sorted(GROUPS), default=2048, help="Taille du groupe SRP (bits)")
+    parser.add_argument('--hachage', choices=HASHES, default=default_hash, help="Fonction de hachage SRP")
+
+
+def library_options(group: int = 2048, hash_name: str = 'sha1'):
+    """
+    Traduit un groupe et une fonction de hachage en paramètres de la bibliothèque srp.
+    :param group: Taille du groupe (bits)
+    :param hash_name: Nom de la fonction de hachage
+    :return: Dictionnaire {'hash_alg': ..., 'ng_type': ...} à passer aux fonctions et classes de srp
+    """
+    import srp
+    return {'hash_alg': getattr(srp, hash_name.upper()), 'ng_type': getattr(srp, f"NG_{group}")}
@@ -0,0 +1,116 @@
+import hashlib
+import hmac
+import os
+import sqlite3
+from collections import OrderedDict
+
+DECOY_SALT_SIZE = 4  # Taille des sels produits par srp.create_salted_verification_key
+
+
+class VerifierStore:
+    def __init__(self, path: str = ':memory:', cache_size: int = 65536):
+        """
+        Base des vérificateurs SRP (sel, clé de vérification), indexée par nom d'utilisateur.
+        La table SQLite a pour clé primaire le nom d'utilisateur (table WITHOUT ROWID : une seule recherche dans
+        l'index suffit), et les utilisateurs les plus sollicités sont servis par un cache LRU en mémoire.
+        :param path:       Chemin du fichier de base de données (':memory:' pour une base temporaire)
+        :param cache_size: Nombre d'utilisateurs conservés dans le cache LRU (0 pour le désactiver)
+        """
+        # La base peut être ouverte par un thread et interrogée par celui du serveur (SQLite en mode sérialisé)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS verifiers '
+                                '(username TEXT PRIMARY KEY, salt BLOB NOT NULL, vkey BLOB NOT NULL) WITHOUT ROWID')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value BLOB NOT NULL)')
+        # Clé des vérificateurs leurres, conservée dans la base : le faux sel d'un nom reste le même d'un démarrage
+        # à l'autre, comme le sel d'un vrai utilisateur
+        self.connection.execute("INSERT OR IGNORE INTO settings (name, value) VALUES ('decoy_secret', ?)",
+                                (os.urandom(32),))
+        self.decoy_secret = self.connection.execute(
+            "SELECT value FROM settings WHERE name = 'decoy_secret'").fetchone()[0]
+        self.connection.commit()
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, username: str):
+        """
+        Recherche le vérificateur d'un utilisateur.
+        :param username: Nom d'utilisateur
+        :return: Le tuple (sel, clé de vérification), ou None si l'utilisateur est inconnu
+        """
+        entry = self.cache.get(username)
+        if entry is not None:
+            self.hits += 1
+            self.cache.move_to_end(username)
+            return entry
+        self.misses += 1
+        entry = self.connection.execute('SELECT salt, vkey FROM verifiers WHERE username = ?', (username,)).fetchone()
+        # Les utilisateurs inconnus ne sont pas mis en cache : un client ne peut pas le remplir de noms inventés
+        if entry is not None and self.cache_size:
+            self.cache[username] = entry
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return entry
+
+    def lookup(self, username: str):
+        """
+        Recherche le vérificateur d'un utilisateur pour lui envoyer un challenge. Un utilisateur inconnu reçoit un
+        vérificateur leurre : un sel déterministe (HMAC du nom sous une clé du serveur) et une clé de vérification
+        que personne ne connaît. Le serveur envoie alors s et B comme pour un vrai utilisateur et l'authentification
+        échoue à la vérification de M : les réponses ne permettent pas d'énumérer les noms d'utilisateur.
+        :param username: Nom d'utilisateur
+        :return: Le tuple (sel, clé de vérification, True si l'utilisateur existe)
+        """
+        entry = self.get(username)
+        if entry is not None:
+            return (*entry, True)
+        name = username.encode('utf-8')
+        salt = hmac.new(self.decoy_secret, b'salt' + name, hashlib.sha256).digest()[:DECOY_SALT_SIZE]
+        vkey = hmac.new(self.decoy_secret, b'vkey' + name, hashlib.sha512).digest()
+        return salt, vkey, False
+
+    def add(self, username: str, salt: bytes, vkey: bytes):
+        """
+        Enregistre (ou remplace) le vérificateur d'un utilisateur.
+        """
+        self.import_many([(username, salt, vkey)])
+
+    def import_many(self, verifiers, batch_size: int = 50000):
+        """
+        Importe un grand nombre de vérificateurs, par transactions de batch_size lignes.
+        :param verifiers:  Itérable de tuples (nom d'utilisateur, sel, clé de vérification), parcouru une seule fois
+        :param batch_size: Nombre de lignes par transaction
+        :return: Nombre de vérificateurs importés
+        """
+        count = 0
+        batch = []
+        for verifier in verifiers:
+            batch.append(verifier)
+            if len(batch) >= batch_size:
+                count += self.__write(batch)
+                batch = []
+        if batch:
+            count += self.__write(batch)
+        return count
+
+    def __write(self, batch: list):
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO verifiers (username, salt, vkey) VALUES (?, ?, ?)', batch)
+        for username, _, _ in batch:
+            self.cache.pop(username, None)
+        return len(batch)
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM verifiers').fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
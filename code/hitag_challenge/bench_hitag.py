@@ -0,0 +1,32 @@
+import time
+from hitag_car import Hitag3PoolVerifier, Hitag3Receiver
+from hitag_key import Hitag3Transponder
+
+
+def main():
+    key = b'same_shared_secret'
+    transponder = Hitag3Transponder(key)
+    verifications = 50000  # Moins que max_outstanding : aucun challenge n'expire avant sa vérification
+
+    receiver = Hitag3Receiver(key)
+    challenges = [receiver.generate_challenge() for _ in range(verifications)]
+    answers = [transponder.chiffre_challenge(challenge) for challenge in challenges]
+    start_time = time.perf_counter()
+    assert all(receiver.check_answer(challenge, answer) for challenge, answer in zip(challenges, answers))
+    elapsed = time.perf_counter() - start_time
+    print(f"Hitag3Receiver     : {verifications / elapsed:>10,.0f} vérifications/s")
+
+    verifier = Hitag3PoolVerifier(key, pool_size=4096)
+    challenges = [verifier.generate_challenge() for _ in range(verifications)]
+    answers = [transponder.chiffre_challenge(challenge) for challenge in challenges]
+    start_time = time.perf_counter()
+    assert all(verifier.check_answer(challenge, answer) for challenge, answer in zip(challenges, answers))
+    elapsed = time.perf_counter() - start_time
+    assert not verifier.check_answer(challenges[-1], answers[-1])  # Challenge à usage unique
+    print(f"Hitag3PoolVerifier : {verifications / elapsed:>10,.0f} vérifications/s")
+    print(f"Métriques de la réserve : {verifier.metrics()}")
+    verifier.close()
+
+
+if __name__ == "__main__":
+    main()
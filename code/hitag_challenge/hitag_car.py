@@ -1,7 +1,34 @@
+import os
 import socket
+import sys
+import threading
 from Crypto.Cipher import ARC4
 from Crypto.Random import get_random_bytes
 import hashlib
+import hmac
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from ephemeral_pool import EphemeralPool  # noqa: E402
+
+CHALLENGE_SIZE = 8  # Challenge de 8 octets pour imiter Hitag3
+
+
+def generate_random_challenge():
+    """
+    :return: Challenge aléatoire de CHALLENGE_SIZE octets
+    """
+    return get_random_bytes(CHALLENGE_SIZE)
+
+
+def derive_key(key):
+    """
+    Condense une clé partagée en clé RC4 de 128 bits. Elle est calculée une fois par récepteur ou vérificateur et
+    n'est conservée que par lui : aucun cache global ne garde les clés dérivées.
+    :param key: Clé partagée de longueur arbitraire
+    :return: Clé de 128 bits
+    """
+    return hashlib.sha256(key).digest()[:16]
+
 
 class Hitag3Receiver:
     def __init__(self, key):
@@ -9,14 +36,14 @@ class Hitag3Receiver:
         Initialise le récepteur Hitag3 avec une clé spécifiée.
         :param key: Clé utilisée pour le chiffrement (doit être de longueur arbitraire, mais sera condensée)
         """
-        self.key = hashlib.sha256(key).digest()[:16]  # Utiliser une clé de 128 bits
+        self.key = derive_key(key)  # Utiliser une clé de 128 bits
 
     def generate_challenge(self):
         """
         Génère un challenge aléatoire.
         :return: Challenge aléatoire
         """
-        return get_random_bytes(8)  # Utiliser un challenge de 8 octets pour imiter Hitag3
+        return generate_random_challenge()
 
     def check_answer(self, challenge, answer):
         """
@@ -27,12 +54,76 @@ class Hitag3Receiver:
         """
         cipher = ARC4.new(self.key)
         expected_response = cipher.encrypt(challenge)
-        return answer == expected_response
+        return hmac.compare_digest(answer, expected_response)
+
+
+class Hitag3PoolVerifier:
+    def __init__(self, key, pool_size=1024, refill_threshold=None, max_outstanding=65536, challenges=None):
+        """
+        Vérificateur Hitag3 à réserve de challenges précalculés (EphemeralPool, remplie par un thread de fond).
+        Émettre un challenge revient à en prendre un dans la réserve, vérifier une réponse à une recherche dans un
+        dictionnaire suivie d'une comparaison en temps constant. RC4 ré-initialisé avec la même clé produit toujours
+        le même flux : la réponse attendue est le challenge combiné (XOR) au début de ce flux, calculé une seule fois.
+        Les challenges ne dépendent pas de la clé : une même réserve peut servir plusieurs vérificateurs.
+        :param key: Clé partagée (de longueur arbitraire, condensée comme pour Hitag3Receiver)
+        :param pool_size: Nombre maximal de challenges en réserve (si la réserve n'est pas fournie)
+        :param refill_threshold: Niveau de la réserve en dessous duquel le remplissage est relancé
+        :param max_outstanding: Nombre maximal de challenges émis en attente de réponse (les plus anciens expirent)
+        :param challenges: Réserve de challenges partagée (EphemeralPool de generate_random_challenge), ou None pour
+                           une réserve propre au vérificateur
+        """
+        self.key = derive_key(key)
+        self.keystream = int.from_bytes(ARC4.new(self.key).encrypt(bytes(CHALLENGE_SIZE)), 'big')
+        self.max_outstanding = max_outstanding
+        self.owns_pool = challenges is None
+        if self.owns_pool:
+            challenges = EphemeralPool(generate_random_challenge, pool_size, refill_threshold)
+        self.pool = challenges
+        self.outstanding = {}  # Challenge émis -> réponse attendue
+        self.lock = threading.Lock()
+
+    def generate_challenge(self):
+        """
+        Emet un challenge, pris dans la réserve si possible (calculé à la demande sinon).
+        :return: Challenge aléatoire
+        """
+        challenge = self.pool.take()
+        expected_response = (int.from_bytes(challenge, 'big') ^ self.keystream).to_bytes(CHALLENGE_SIZE, 'big')
+        with self.lock:
+            self.outstanding[challenge] = expected_response
+            if len(self.outstanding) > self.max_outstanding:
+                del self.outstanding[next(iter(self.outstanding))]
+        return challenge
+
+    def check_answer(self, challenge, answer):
+        """
+        Vérifie la réponse à un challenge émis par ce vérificateur. Chaque challenge n'est vérifiable qu'une fois.
+        :param challenge: Challenge initial
+        :param answer: Réponse chiffrée à vérifier
+        :return: True si la réponse est correcte, False sinon
+        """
+        with self.lock:
+            expected_response = self.outstanding.pop(challenge, None)
+        return expected_response is not None and hmac.compare_digest(answer, expected_response)
+
+    def metrics(self):
+        """
+        :return: Métriques de la réserve (EphemeralPool.metrics) et nombre de challenges en attente de réponse
+        """
+        return {**self.pool.metrics(), 'outstanding': len(self.outstanding)}
+
+    def close(self):
+        """
+        Arrête le thread de remplissage de la réserve, si elle est propre au vérificateur.
+        """
+        if self.owns_pool:
+            self.pool.close()
+
 
 def main():
     # Génération d'une clé aléatoire partagée
     key = b'same_shared_secret'
-    receiver = Hitag3Receiver(key)
+    receiver = Hitag3PoolVerifier(key)
 
     # Initialisation du serveur
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -63,5 +154,8 @@ def main():
             else:
                 print("Authentication failed")
 
+    print("Métriques de la réserve :", receiver.metrics())
+    receiver.close()
+
 if __name__ == "__main__":
     main()
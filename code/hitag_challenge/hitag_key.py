@@ -1,4 +1,8 @@
+import argparse
+import asyncio
 import socket
+import statistics
+import time
 from Crypto.Cipher import ARC4
 from Crypto.Random import get_random_bytes
 import hashlib
@@ -22,7 +26,60 @@ class Hitag3Transponder:
         encrypted_challenge = cipher.encrypt(challenge)
         return encrypted_challenge
 
+async def simulate_tag(tag_id, transponder, host, port, semaphore, latencies):
+    """
+    Simule l'authentification d'un transpondeur auprès du serveur multi-transpondeurs (hitag_serveur.py).
+    :return: True si le serveur a accepté la réponse
+    """
+    async with semaphore:
+        start_time = time.perf_counter()
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(tag_id.to_bytes(4, 'big'))
+            challenge = await reader.readexactly(8)
+            writer.write(transponder.chiffre_challenge(challenge))
+            verdict = await reader.readexactly(1)
+            latencies.append(time.perf_counter() - start_time)
+            return verdict == b'\x01'
+        finally:
+            writer.close()
+
+
+async def load_generator(tags, host, port, concurrency):
+    """
+    Mode générateur de charge : simule N transpondeurs authentifiés en parallèle contre le serveur local.
+    :param tags: Nombre de transpondeurs simulés
+    :param concurrency: Nombre maximal de connexions simultanées
+    """
+    from hitag_serveur import demo_key_table
+
+    transponders = {tag_id: Hitag3Transponder(key) for tag_id, key in demo_key_table(tags).items()}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    start_time = time.perf_counter()
+    results = await asyncio.gather(*(simulate_tag(tag_id, transponder, host, port, semaphore, latencies)
+                                     for tag_id, transponder in transponders.items()), return_exceptions=True)
+    elapsed = time.perf_counter() - start_time
+
+    accepted = sum(result is True for result in results)
+    errors = sum(isinstance(result, Exception) for result in results)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    print(f"{tags} transpondeurs en {elapsed:.2f} s ({tags / elapsed:.0f} authentifications/s) : "
+          f"{accepted} acceptés, {errors} erreurs")
+    print(f"Latence de bout en bout p50 {quantiles[49] * 1000:.2f} ms, p99 {quantiles[98] * 1000:.2f} ms")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Transpondeur Hitag3")
+    parser.add_argument('--charge', type=int, metavar='N', help="Simule N transpondeurs contre hitag_serveur.py")
+    parser.add_argument('--concurrence', type=int, default=1000, help="Connexions simultanées en mode charge")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=65433)
+    args = parser.parse_args()
+    if args.charge:
+        asyncio.run(load_generator(args.charge, args.host, args.port, args.concurrence))
+        return
+
     # Génération d'une clé aléatoire partagée
     key = b'same_shared_secret'
     transponder = Hitag3Transponder(key)
@@ -0,0 +1,156 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import struct
+import sys
+import time
+from collections import deque
+from hitag_car import CHALLENGE_SIZE, Hitag3PoolVerifier, generate_random_challenge
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from ephemeral_pool import EphemeralPool  # noqa: E402
+
+# Protocole : le transpondeur envoie son identifiant (32 bits big-endian), le serveur répond par un challenge,
+# le transpondeur renvoie le challenge chiffré et le serveur conclut par un octet de verdict.
+TAG_ID = struct.Struct('>I')
+ACCEPT = b'\x01'
+REJECT = b'\x00'
+
+
+def demo_key_table(count: int):
+    """
+    Table de clés de démonstration : une clé distincte par transpondeur.
+    :param count: Nombre de transpondeurs
+    :return: Table {identifiant: clé}
+    """
+    return {tag_id: f"secret_tag_{tag_id}".encode() for tag_id in range(count)}
+
+
+def load_key_table(path: str):
+    """
+    Charge une table de clés depuis un fichier JSON {"identifiant": "clé en hexadécimal"}.
+    :param path: Chemin du fichier
+    :return: Table {identifiant: clé}
+    """
+    with open(path) as file:
+        return {int(tag_id): bytes.fromhex(key) for tag_id, key in json.load(file).items()}
+
+
+class HitagServer:
+    def __init__(self, key_table: dict, timeout: float = 2.0, latency_samples: int = 100000, pool_size: int = 4096,
+                 max_outstanding: int = 16):
+        """
+        Serveur de challenge Hitag3 pour un grand nombre de transpondeurs simultanés.
+        Chaque transpondeur a son Hitag3PoolVerifier (flux RC4 calculé une fois, réponse attendue par XOR) ; tous
+        puisent dans une même réserve de challenges, remplie par un seul thread de fond.
+        :param key_table: Table {identifiant: clé} des transpondeurs autorisés
+        :param timeout: Délai maximal (s) accordé à chaque étape d'une connexion
+        :param latency_samples: Nombre de mesures de latence conservées pour les percentiles
+        :param pool_size: Nombre maximal de challenges en réserve
+        :param max_outstanding: Nombre maximal de challenges en attente de réponse par transpondeur
+        """
+        self.challenges = EphemeralPool(generate_random_challenge, pool_size)
+        self.receivers = {tag_id: Hitag3PoolVerifier(key, max_outstanding=max_outstanding, challenges=self.challenges)
+                          for tag_id, key in key_table.items()}
+        self.timeout = timeout
+        self.latencies = deque(maxlen=latency_samples)
+        self.accepted = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Traite l'authentification d'un transpondeur ; chaque lecture est bornée par le délai de la connexion.
+        """
+        try:
+            tag_id, = TAG_ID.unpack(await asyncio.wait_for(reader.readexactly(TAG_ID.size), self.timeout))
+            receiver = self.receivers.get(tag_id)
+            if receiver is None:
+                self.rejected += 1
+                writer.write(REJECT)
+                return
+
+            challenge = receiver.generate_challenge()
+            writer.write(challenge)
+            start_time = time.perf_counter()
+            response = await asyncio.wait_for(reader.readexactly(CHALLENGE_SIZE), self.timeout)
+            if receiver.check_answer(challenge, response):
+                self.accepted += 1
+                writer.write(ACCEPT)
+            else:
+                self.rejected += 1
+                writer.write(REJECT)
+            self.latencies.append(time.perf_counter() - start_time)
+            await writer.drain()
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def percentiles(self):
+        """
+        :return: Latences p50 et p99 (s) entre l'envoi du challenge et le verdict
+        """
+        if len(self.latencies) < 2:
+            return 0.0, 0.0
+        quantiles = statistics.quantiles(self.latencies, n=100)
+        return quantiles[49], quantiles[98]
+
+    def summary(self):
+        p50, p99 = self.percentiles()
+        metrics = self.challenges.metrics()
+        return (f"{self.accepted} acceptés, {self.rejected} refusés, {self.timeouts} délais dépassés, "
+                f"latence challenge-verdict p50 {p50 * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms, "
+                f"réserve de challenges {metrics['hit_rate']:.1%} de succès")
+
+    def close(self):
+        """
+        Arrête le thread de remplissage de la réserve de challenges.
+        """
+        self.challenges.close()
+
+    async def report(self, period: float = 5.0):
+        """
+        Affiche périodiquement les compteurs et les percentiles de latence.
+        """
+        while True:
+            await asyncio.sleep(period)
+            print(self.summary())
+
+
+async def serve(server: HitagServer, host: str, port: int):
+    tcp_server = await asyncio.start_server(server.handle_connection, host, port, backlog=4096)
+    print(f"Serveur Hitag en écoute sur {host}:{port} ({len(server.receivers)} transpondeurs)...")
+    async with tcp_server:
+        report_task = asyncio.create_task(server.report())
+        try:
+            await tcp_server.serve_forever()
+        finally:
+            report_task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur de challenge Hitag3 multi-transpondeurs")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=65433)
+    parser.add_argument('--cles', help="Table de clés JSON {identifiant: clé hexadécimale}")
+    parser.add_argument('--transpondeurs', type=int, default=10000, help="Taille de la table de démonstration")
+    parser.add_argument('--delai', type=float, default=2.0, help="Délai maximal par étape (s)")
+    args = parser.parse_args()
+
+    key_table = load_key_table(args.cles) if args.cles else demo_key_table(args.transpondeurs)
+    server = HitagServer(key_table, args.delai)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        print(server.summary())
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()